@@ -1,15 +1,22 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import networkx as nx
+import numpy as np
 import html
+import importlib.util
 import json
+import pathlib
 import os
-from datetime import datetime, timedelta
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
+# plotly, networkx and duckdb are imported inside the functions that use them:
+# together they add ~0.4 s to a cold start, and most pages need none of them.
+# scripts/profile_imports.py tracks the startup import cost.
 
+# How often each open session checks refresh_meta.json for a new ETL publish.
 AUTO_REFRESH_SECONDS = 120
 
 # ============================================================================
@@ -23,17 +30,6 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Auto-refresh the app every 2 minutes.
-try:
-    from streamlit_autorefresh import st_autorefresh
-
-    st_autorefresh(interval=AUTO_REFRESH_SECONDS * 1000, key="tas_autorefresh")
-except ModuleNotFoundError:
-    st.caption(
-        "Auto-refresh disabled (missing dependency: streamlit-autorefresh). "
-        "Install it to enable 2-minute refresh."
-    )
-
 # Custom CSS - Toast Audience Studio theme (for a seamless iframe embed)
 st.markdown(
     """
@@ -328,6 +324,29 @@ st.markdown(
       border: 1px solid rgba(255, 106, 0, 0.35);
     }
 
+    /* Content search hits */
+    .content-hit {
+      background: var(--surface);
+      padding: 12px 16px;
+      border-radius: var(--radius-lg);
+      border: 1px solid var(--slate-200);
+      margin-bottom: 10px;
+    }
+
+    .content-hit pre {
+      white-space: pre-wrap;
+      word-break: break-word;
+      margin: 6px 0 0;
+      font-size: 0.85rem;
+    }
+
+    .content-hit mark {
+      background: rgba(255, 106, 0, 0.25);
+      color: inherit;
+      border-radius: 3px;
+      padding: 0 2px;
+    }
+
     /* Progress bars */
     .stProgress > div > div > div {
       background: linear-gradient(90deg, var(--primary) 0%, #ff9e42 100%);
@@ -368,42 +387,475 @@ st.markdown(
 # ============================================================================
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Default partition; reassigned per run when the sidebar picks another
+# workspace/catalog (see etl/partitions.py).
 TABLES_DIR = os.path.join(BASE_DIR, "data", "tables")
+# Per-data-version caches keep this many partitions warm.
+CACHED_PARTITIONS = 4
+
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+from etl.parse_liquid import (  # noqa: E402
+    GHOST_EXEMPT_FIELDS,
+    STALE_DAYS,
+    aggregate_reference_facts,
+    build_reference_facts,
+    CONTENT_INDEX,
+    CONTENT_INDEX_COLUMNS,
+)
+from etl.overview import (  # noqa: E402
+    ACTIVE_DAYS,
+    calculate_governance_score,
+    catalog_capacity,
+    composition_storage_mib,
+    create_asset_timeline,
+    create_field_usage_heatmap,
+    create_top_fields_chart,
+    create_usage_distribution_chart,
+    field_impact_table,
+    generate_governance_insights,
+    overview_metrics,
+    parse_asset_dates,
+    valid_field_counts,
+)
+from etl.partitions import (  # noqa: E402
+    discover_partitions,
+    partition_label,
+    tables_dir as partition_tables_dir,
+)
 
+# Optional SQL backend: when installed, live aggregations run in DuckDB over
+# views of the files in data/tables and only small results reach pandas.
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
 
-@st.cache_data(ttl=AUTO_REFRESH_SECONDS)
-def load_data():
-    """Load all governance data tables."""
+# ============================================================================
+# PROFILING
+# ============================================================================
+# Opt-in with ?profile=1 or TAS_PROFILE=1: sections of the rerun are timed, shown
+# in an expander at the bottom of the page and appended to PROFILE_LOG. Cached
+# loaders and chart builders only record a timing when they actually run (a
+# cache miss), so a warm rerun shows what is left besides the page itself.
+
+PROFILE_LOG = os.path.join(BASE_DIR, "data", "profile_log.jsonl")
+PROFILING = (
+    os.environ.get("TAS_PROFILE") == "1" or st.query_params.get("profile") == "1"
+)
+RUN_STARTED = time.perf_counter()
+# (section, start, end) perf_counter spans recorded during this rerun.
+PROFILE_SPANS = []
+
+
+@contextmanager
+def timed(section):
+    """Record how long the block takes as `section` (no-op unless profiling)."""
+    if not PROFILING:
+        yield
+        return
+    start = time.perf_counter()
     try:
-        catalog = pd.read_csv(os.path.join(TABLES_DIR, "catalog_schema.csv"))
-        assets = pd.read_csv(os.path.join(TABLES_DIR, "asset_inventory.csv"))
-        blocks = pd.read_csv(os.path.join(TABLES_DIR, "content_blocks.csv"))
-        refs = pd.read_csv(os.path.join(TABLES_DIR, "field_references.csv"))
-        deps = pd.read_csv(os.path.join(TABLES_DIR, "dependencies.csv"))
-
-        # Parse dates
-        # Normalize to tz-naive UTC so downstream comparisons/grouping work consistently.
-        for col in ["last_active", "last_sent", "last_entry", "last_edited"]:
-            if col in assets.columns:
-                assets[col] = pd.to_datetime(
-                    assets[col], errors="coerce", utc=True
-                ).dt.tz_convert(None)
-
-        return catalog, assets, blocks, refs, deps
-    except FileNotFoundError as e:
-        st.error(f"⚠️ Data tables not found: {e}")
-        st.info("Please run the ETL script first to generate the required data tables.")
-        return (
-            pd.DataFrame(),
-            pd.DataFrame(),
-            pd.DataFrame(),
-            pd.DataFrame(),
-            pd.DataFrame(),
+        yield
+    finally:
+        PROFILE_SPANS.append((section, start, time.perf_counter()))
+
+
+def profile_breakdown(spans, run_started, run_ended):
+    """Spans as rows of section (indented under the spans that contain it), ms
+    and share of the rerun, in the order they started."""
+    spans = sorted(spans, key=lambda span: (span[1], -span[2]))
+    total = max(run_ended - run_started, 1e-9)
+    rows = []
+    for section, start, end in spans:
+        depth = sum(
+            1
+            for _, outer_start, outer_end in spans
+            if outer_start <= start and end <= outer_end
+        )
+        rows.append(
+            {
+                "section": "\u2003" * (depth - 1) + section,
+                "ms": round((end - start) * 1000, 1),
+                "share": (end - start) / total * 100,
+            }
         )
+    return pd.DataFrame(rows, columns=["section", "ms", "share"])
+
+
+def render_profile(page, period):
+    """Show this rerun's timings and append them to PROFILE_LOG."""
+    run_ended = time.perf_counter()
+    breakdown = profile_breakdown(PROFILE_SPANS, RUN_STARTED, run_ended)
+    total_ms = (run_ended - RUN_STARTED) * 1000
+
+    with st.expander(f"⏱️ Rerun profile: {total_ms:,.0f} ms", expanded=False):
+        st.caption(
+            "Sections run in this rerun; cached loaders and charts only appear "
+            f"on a cache miss. Appended to `{os.path.relpath(PROFILE_LOG, BASE_DIR)}`."
+        )
+        st.dataframe(
+            breakdown,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "section": "Section",
+                "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+                "share": st.column_config.ProgressColumn(
+                    "Share of rerun", format="%.0f%%", min_value=0, max_value=100
+                ),
+            },
+        )
+
+    entry = {
+        "at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "page": page,
+        "period": [str(d) if d is not None else None for d in period],
+        "tables_dir": os.path.relpath(TABLES_DIR, BASE_DIR),
+        "data_version": st.session_state.get("tas_data_version"),
+        "total_ms": round(total_ms, 1),
+        "sections": [
+            [section, round((end - start) * 1000, 1)]
+            for section, start, end in PROFILE_SPANS
+        ],
+    }
+    try:
+        with open(PROFILE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        # Read-only deployments still get the expander.
+        pass
+
+
+# Written by the ETL as data/tables/agg_<name>.csv (see build_governance_aggregates).
+GOVERNANCE_TABLES = [
+    "field_asset_counts",
+    "field_usage_by_asset_type",
+    "ghost_fields",
+    "ghost_assets",
+    "stale_assets",
+]
+
+
+def data_fingerprint():
+    """TABLES_DIR and the name, size and mtime of every file in it (a few stat calls).
+
+    The ETL rewrites refresh_meta.json on every publish, so any refresh changes
+    the fingerprint; loaders are cached on it instead of on a TTL. The directory
+    keeps each partition's cache entries apart.
+    """
+    try:
+        entries = sorted(os.scandir(TABLES_DIR), key=lambda e: e.name)
+    except FileNotFoundError:
+        return TABLES_DIR, ()
+    files = []
+    for entry in entries:
+        if entry.is_file():
+            stat = entry.stat()
+            files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return TABLES_DIR, tuple(files)
+
+
+DATA_TABLES = [
+    "catalog_schema.csv",
+    "asset_inventory.csv",
+    "content_blocks.csv",
+    "field_references.csv",
+    "dependencies.csv",
+]
+
+
+def missing_data_tables(fingerprint):
+    names = {name for name, _, _ in fingerprint[1]}
+    return [table for table in DATA_TABLES if table not in names]
+
+
+# content_blocks columns the views need. liquid_content (the raw Liquid text, by
+# far the largest column) is only read by callers that ask for it explicitly.
+BLOCK_COLUMNS = ["block_id", "asset_id"]
+
+
+# Repeated labels and ids load as categoricals (int codes into one copy of each
+# string) and flags as real bools; unique ids and free text stay as strings.
+TABLE_DTYPES = {
+    "asset_inventory": {
+        "asset_type": "category",
+        "subtype": "category",
+        "status": "category",
+    },
+    "content_blocks": {
+        "asset_id": "category",
+        "step_name": "category",
+        "channel": "category",
+        "location": "category",
+    },
+    "field_references": {
+        "ref_id": "category",
+        "block_id": "category",
+        "field_name": "category",
+        "match_type": "category",
+        "context_snippet": "category",
+        "is_risk": "bool",
+    },
+    "catalog_schema": {"field_type": "category"},
+    "dependencies": {"dependency_type": "category"},
+}
+
+
+@st.cache_data(max_entries=16)
+def load_table(fingerprint, name, columns=None):
+    """Read data/tables/<name>.csv, limited to `columns` (empty frame if missing)."""
+    path = os.path.join(TABLES_DIR, f"{name}.csv")
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+        if columns is not None:
+            columns = [col for col in columns if col in header]
+        dtypes = {
+            col: dtype
+            for col, dtype in TABLE_DTYPES.get(name, {}).items()
+            if col in header and (columns is None or col in columns)
+        }
+        with timed(f"Load {name}.csv"):
+            return pd.read_csv(path, usecols=columns, dtype=dtypes)
+    except FileNotFoundError:
+        # Reported once per run by missing_data_tables(); cached callers stay silent.
+        return pd.DataFrame()
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def load_assets(fingerprint):
+    """Asset inventory with activity dates parsed once per data version."""
+    assets = load_table(fingerprint, "asset_inventory")
+    with timed("Parse asset dates"):
+        return parse_asset_dates(assets)
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def load_activity_index(fingerprint):
+    """Sorted last_active values (NaT dropped) and the asset rows they belong to."""
+    assets = load_assets(fingerprint)
+    if "last_active" not in assets.columns:
+        return np.array([], dtype="datetime64[ns]"), np.array([], dtype=np.intp)
+    active = assets["last_active"].to_numpy()
+    rows = np.flatnonzero(~np.isnat(active))
+    order = np.argsort(active[rows], kind="stable")
+    return active[rows][order], rows[order]
+
+
+def assets_in_period(fingerprint, start_date=None, end_date=None):
+    """Assets last active within [start_date, end_date] (all assets if no start).
+
+    Binary-searches the activity index instead of comparing every row's date;
+    rows keep their inventory order.
+    """
+    assets = load_assets(fingerprint)
+    if start_date is None or "last_active" not in assets.columns:
+        return assets
+    dates, rows = load_activity_index(fingerprint)
+    bounds = pd.to_datetime([start_date, end_date + timedelta(days=1)]).to_numpy()
+    lo, hi = np.searchsorted(dates, bounds)
+    return assets.iloc[np.sort(rows[lo:hi])]
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def load_governance_aggregates(fingerprint):
+    """Load the ETL's pre-aggregated governance tables (None if any is missing)."""
+    aggregates = {}
+    for name in GOVERNANCE_TABLES:
+        path = os.path.join(TABLES_DIR, f"agg_{name}.csv")
+        if not os.path.exists(path):
+            return None
+        with timed(f"Load agg_{name}.csv"):
+            aggregates[name] = pd.read_csv(path)
+
+    stale = aggregates["stale_assets"]
+    stale["last_active"] = pd.to_datetime(
+        stale["last_active"], errors="coerce", utc=True
+    ).dt.tz_convert(None)
+    return aggregates
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def load_reference_facts(fingerprint):
+    """Ref x block x asset fact table, built once per data version."""
+    assets = load_assets(fingerprint)
+    blocks = load_table(fingerprint, "content_blocks", BLOCK_COLUMNS)
+    refs = load_table(fingerprint, "field_references")
+    with timed("Build reference facts"):
+        return build_reference_facts(assets, blocks, refs)
+
+
+DUCKDB_TABLES = ["asset_inventory", "content_blocks", "field_references"]
+# Columns the DuckDB queries read beyond the keys every table has.
+DUCKDB_COLUMNS = {"asset_inventory": ["last_active"]}
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def use_duckdb(fingerprint):
+    """True when DuckDB is installed and every table and column the queries read exists.
+
+    Otherwise the pandas path runs; it treats a missing last_active as "every
+    asset is in the period", which the DuckDB period filter cannot.
+    """
+    if not HAS_DUCKDB:
+        return False
+    names = {os.path.splitext(name)[0] for name, _, _ in fingerprint[1]}
+    if not all(table in names for table in DUCKDB_TABLES):
+        return False
+    for table, columns in DUCKDB_COLUMNS.items():
+        header = pd.read_csv(os.path.join(fingerprint[0], f"{table}.csv"), nrows=0)
+        if not all(col in header.columns for col in columns):
+            return False
+    return True
+
+
+@st.cache_resource(max_entries=CACHED_PARTITIONS)
+def duckdb_connection(fingerprint):
+    """In-memory DuckDB with one view per CSV/Parquet file in data/tables."""
+    import duckdb
+
+    con = duckdb.connect()
+    for entry in sorted(os.scandir(TABLES_DIR), key=lambda e: e.name):
+        name, ext = os.path.splitext(entry.name)
+        reader = {".csv": "read_csv_auto", ".parquet": "read_parquet"}.get(ext)
+        if reader is None or not entry.is_file():
+            continue
+        path = entry.path.replace("'", "''")
+        con.execute(f"CREATE VIEW \"{name}\" AS SELECT * FROM {reader}('{path}')")
+    return con
+
+
+@st.cache_data(max_entries=64)
+def duckdb_query(fingerprint, sql, params=None):
+    """Runs `sql` against duckdb_connection(); results are cached per data version."""
+    cursor = duckdb_connection(fingerprint).cursor()
+    try:
+        with timed("DuckDB query"):
+            return cursor.execute(sql, params).df()
+    finally:
+        cursor.close()
+
+
+# Assets active in the period (? = start date, end date; NULLs for all time).
+DUCKDB_PERIOD_CTES = """
+WITH assets AS (
+    SELECT
+        asset_id,
+        asset_name,
+        asset_type,
+        timezone('UTC', TRY_CAST(last_active AS TIMESTAMPTZ)) AS last_active,
+        row_number() OVER () AS ord
+    FROM asset_inventory
+),
+in_range AS (
+    SELECT * FROM assets
+    WHERE $start IS NULL OR CAST(last_active AS DATE) BETWEEN $start AND $end
+),
+blocks AS (
+    SELECT block_id, first(asset_id) AS asset_id FROM content_blocks GROUP BY block_id
+),
+facts AS (
+    SELECT r.field_name, r.is_risk, r.context_snippet, b.asset_id,
+        row_number() OVER () AS ord
+    FROM field_references r LEFT JOIN blocks b USING (block_id)
+)
+"""
+
+
+def duckdb_governance_aggregates(fingerprint, start_date=None, end_date=None):
+    """aggregate_reference_facts() pushed down to SQL (same tables and order)."""
+
+    def query(sql, **params):
+        params.update(start=start_date, end=end_date)
+        return duckdb_query(fingerprint, DUCKDB_PERIOD_CTES + sql, params)
+
+    field_counts = query(
+        """
+        SELECT
+            f.field_name,
+            f.is_risk,
+            count(*) AS "references",
+            count(DISTINCT a.asset_id) AS assets,
+            arg_min(f.context_snippet, f.ord)
+                FILTER (WHERE f.context_snippet IS NOT NULL) AS context_snippet
+        FROM facts f LEFT JOIN in_range a USING (asset_id)
+        GROUP BY f.field_name, f.is_risk
+        ORDER BY "references" DESC, f.field_name, f.is_risk
+        """
+    )
+    by_type = query(
+        """
+        SELECT
+            f.field_name,
+            f.is_risk,
+            a.asset_type,
+            count(*) AS "references",
+            count(DISTINCT a.asset_id) AS assets
+        FROM facts f JOIN in_range a USING (asset_id)
+        WHERE a.asset_type IS NOT NULL
+        GROUP BY f.field_name, f.is_risk, a.asset_type
+        ORDER BY "references" DESC, f.field_name, f.is_risk, a.asset_type
+        """
+    )
+    ghosts = field_counts[
+        field_counts["is_risk"] & ~field_counts["field_name"].isin(GHOST_EXEMPT_FIELDS)
+    ].rename(columns={"references": "occurrences", "assets": "affected_assets"})
+    ghost_assets = query(
+        """
+        SELECT
+            a.asset_id,
+            a.asset_name,
+            a.asset_type,
+            count(DISTINCT f.field_name) AS ghost_fields,
+            count(*) AS ghost_references
+        FROM facts f JOIN in_range a USING (asset_id)
+        WHERE f.is_risk AND NOT list_contains($exempt, f.field_name)
+        GROUP BY a.asset_id, a.asset_name, a.asset_type
+        ORDER BY ghost_references DESC, a.asset_name
+        """,
+        exempt=GHOST_EXEMPT_FIELDS,
+    )
+    stale = query(
+        f"""
+        SELECT asset_id, asset_name, asset_type, last_active FROM in_range
+        WHERE last_active < now()::TIMESTAMP - INTERVAL {STALE_DAYS} DAY
+        ORDER BY ord
+        """
+    )
+    return {
+        "field_asset_counts": field_counts,
+        "field_usage_by_asset_type": by_type,
+        "ghost_fields": ghosts[
+            ["field_name", "occurrences", "affected_assets", "context_snippet"]
+        ].reset_index(drop=True),
+        "ghost_assets": ghost_assets,
+        "stale_assets": stale,
+    }
 
 
-@st.cache_data(ttl=AUTO_REFRESH_SECONDS)
-def load_catalog_composition_artifacts():
+@st.cache_data(max_entries=8)
+def period_governance_aggregates(fingerprint, start_date=None, end_date=None):
+    """Governance aggregates over assets active in [start_date, end_date].
+
+    Used when the activity period narrows the asset set (or the ETL tables are
+    missing); the unfiltered view renders the precomputed tables directly.
+    """
+    if use_duckdb(fingerprint):
+        return duckdb_governance_aggregates(fingerprint, start_date, end_date)
+    assets = assets_in_period(fingerprint, start_date, end_date)
+    facts = load_reference_facts(fingerprint)
+    with timed("Aggregate period"):
+        return aggregate_reference_facts(facts, assets)
+
+
+def governance_aggregates(fingerprint, start_date=None, end_date=None):
+    """The ETL's aggregates for all time, period_governance_aggregates() otherwise."""
+    if start_date is None:
+        governance = load_governance_aggregates(fingerprint)
+        if governance is not None:
+            return governance
+    return period_governance_aggregates(fingerprint, start_date, end_date)
+
+
+@st.cache_data(max_entries=CACHED_PARTITIONS)
+def load_catalog_composition_artifacts(fingerprint):
     """Load precomputed catalog composition artifacts (small, committed files)."""
     overview_path = os.path.join(TABLES_DIR, "catalog_composition_overview.json")
     fill_path = os.path.join(TABLES_DIR, "catalog_composition_fill_rates.csv")
@@ -415,6 +867,9 @@ def load_catalog_composition_artifacts():
         TABLES_DIR, "catalog_composition_heaviest_strings_15.csv"
     )
     weights_path = os.path.join(TABLES_DIR, "catalog_composition_top_weights_25.csv")
+    changes_path = os.path.join(TABLES_DIR, "catalog_composition_changes.json")
+    field_bytes_path = os.path.join(TABLES_DIR, "catalog_composition_field_bytes.csv")
+    duplicates_path = os.path.join(TABLES_DIR, "catalog_composition_duplicates.csv")
 
     if not os.path.exists(overview_path) or not os.path.exists(fill_path):
         return None
@@ -430,6 +885,17 @@ def load_catalog_composition_artifacts():
     )
     strings_df = pd.read_csv(strings_path) if os.path.exists(strings_path) else None
     weights_df = pd.read_csv(weights_path) if os.path.exists(weights_path) else None
+    field_bytes_df = (
+        pd.read_csv(field_bytes_path) if os.path.exists(field_bytes_path) else None
+    )
+    duplicates_df = (
+        pd.read_csv(duplicates_path) if os.path.exists(duplicates_path) else None
+    )
+
+    changes = None
+    if os.path.exists(changes_path):
+        with open(changes_path, "r", encoding="utf-8") as f:
+            changes = json.load(f)
 
     return {
         "overview": overview,
@@ -438,366 +904,749 @@ def load_catalog_composition_artifacts():
         "most_filled": most_filled_df,
         "strings": strings_df,
         "weights": weights_df,
+        "field_bytes": field_bytes_df,
+        "duplicates": duplicates_df,
+        "changes": changes,
     }
 
 
-# Load data
-catalog_df, assets_df, blocks_df, refs_df, deps_df = load_data()
+def read_refresh_version():
+    """refreshed_at_utc from refresh_meta.json (None if missing or unreadable)."""
+    try:
+        path = os.path.join(TABLES_DIR, "refresh_meta.json")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("refreshed_at_utc")
+    except (OSError, ValueError):
+        return None
+
+
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def poll_refresh_version():
+    """Reruns the app only when the ETL has published new data.
+
+    Runs as a timed fragment, so an idle session costs one small file read per
+    interval instead of a full script rerun.
+    """
+    if read_refresh_version() != st.session_state.get("tas_data_version"):
+        st.rerun()
+
+
+# With several workspaces/catalogs on disk, the sidebar picks whose tables this
+# run reads; a single partition keeps the plain data/tables layout and no picker.
+PARTITIONS = discover_partitions()
+if len(PARTITIONS) > 1:
+    with st.sidebar:
+        partition = st.selectbox(
+            "🗂️ Workspace / Catalog",
+            PARTITIONS,
+            format_func=lambda p: partition_label(*p),
+            key="tas_partition",
+        )
+    TABLES_DIR = partition_tables_dir(*partition)
+
+# Load data: only the asset inventory is needed on every page (period filter and
+# sidebar stats); pages load the rest of what they render. The published version
+# is read first, so a publish landing mid-run still triggers the poll's rerun.
+with timed("Data fingerprint + asset inventory"):
+    st.session_state["tas_data_version"] = read_refresh_version()
+    DATA_FINGERPRINT = data_fingerprint()
+    assets_df = load_assets(DATA_FINGERPRINT)
+if missing_data_tables(DATA_FINGERPRINT):
+    st.error(
+        "⚠️ Data tables not found: " + ", ".join(missing_data_tables(DATA_FINGERPRINT))
+    )
+    st.info("Please run the ETL script first to generate the required data tables.")
+poll_refresh_version()
+
 
 # ============================================================================
-# UTILITY FUNCTIONS
+# SEARCH INDEX
 # ============================================================================
 
+# Fuzzy fallback: share of the query's trigrams an entry must contain.
+FUZZY_MIN_OVERLAP = 0.6
+SEARCH_CORPORA = ["fields", "assets", "snippets"]
+_NO_POSTINGS = np.array([], dtype=np.int32)
 
-def calculate_governance_score(catalog_df, refs_df, assets_df):
-    """Calculate overall governance health score."""
-    if catalog_df.empty or refs_df.empty:
-        return 0, "No Data"
 
-    # Metrics for scoring
-    total_fields = len(catalog_df)
-    used_fields = refs_df[refs_df["is_risk"] == False]["field_name"].nunique()
-    ghost_fields = len(
-        refs_df[
-            (refs_df["is_risk"] == True) & (refs_df["field_name"] != "location_guid")
-        ]
-    )
-    total_assets = len(assets_df)
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
 
-    # Calculate components
-    utilization_score = (used_fields / total_fields * 100) if total_fields > 0 else 0
-    ghost_penalty = min(ghost_fields * 5, 40)  # Max 40 point penalty
 
-    # Final score
-    score = max(0, min(100, utilization_score - ghost_penalty))
+def build_search_index(texts, weights):
+    """Trigram index over `texts` (lowercased) with a ranking weight per entry."""
+    texts = [str(text).lower() for text in texts]
+    grams = {}
+    for position, text in enumerate(texts):
+        for gram in _trigrams(text):
+            grams.setdefault(gram, []).append(position)
+    return {
+        "texts": texts,
+        "weights": np.asarray(weights, dtype=float),
+        "postings": {g: np.array(p, dtype=np.int32) for g, p in grams.items()},
+    }
 
-    if score >= 85:
-        return score, "Excellent"
-    elif score >= 70:
-        return score, "Good"
-    elif score >= 50:
-        return score, "Fair"
-    else:
-        return score, "Critical"
 
+def search_index(index, query):
+    """Positions of entries containing `query` (case-insensitive), highest weight first.
+
+    Candidates come from intersecting the query's trigram postings and are then
+    checked for the exact substring. When nothing matches, entries sharing at
+    least FUZZY_MIN_OVERLAP of the query's trigrams are returned instead, most
+    similar first. Returns (positions, fuzzy).
+    """
+    query = query.strip().lower()
+    texts, weights, postings = index["texts"], index["weights"], index["postings"]
+    grams = _trigrams(query)
+    if grams:
+        lists = sorted((postings.get(g, _NO_POSTINGS) for g in grams), key=len)
+        candidates = lists[0]
+        for positions in lists[1:]:
+            candidates = np.intersect1d(candidates, positions, assume_unique=True)
+    else:
+        # One- and two-character queries have no trigrams; scan every entry.
+        candidates = range(len(texts))
+    hits = np.array([p for p in candidates if query in texts[p]], dtype=np.int32)
+    if len(hits) or not grams:
+        return hits[np.lexsort((hits, -weights[hits]))], False
+
+    shared = np.bincount(
+        np.concatenate([postings.get(g, _NO_POSTINGS) for g in grams]),
+        minlength=len(texts),
+    )
+    hits = np.flatnonzero(shared >= FUZZY_MIN_OVERLAP * len(grams))
+    return hits[np.lexsort((hits, -weights[hits], -shared[hits]))], True
 
-def generate_governance_insights(catalog_df, refs_df, assets_df):
-    """Generate actionable governance insights."""
-    insights = []
 
-    if refs_df.empty:
-        return ["No reference data available for analysis."]
+@st.cache_resource(max_entries=len(SEARCH_CORPORA) * CACHED_PARTITIONS)
+def load_search_index(fingerprint, corpus):
+    """Searchable entries for `corpus` plus their trigram index, per data version.
 
-    # Ghost fields (critical)
-    ghost_fields = refs_df[
-        (refs_df["is_risk"] == True) & (refs_df["field_name"] != "location_guid")
-    ]
-    if len(ghost_fields) > 0:
-        unique_ghosts = ghost_fields["field_name"].nunique()
-        insights.append(
+    fields: catalog, referenced and composition fields, ranked by references.
+    assets: asset names, ranked by field references in the asset's blocks.
+    snippets: distinct (field, Liquid context snippet) pairs, ranked by occurrences.
+    Shared across sessions; callers must not modify the returned frame.
+    """
+    if corpus == "fields":
+        counts = (
+            governance_aggregates(fingerprint)["field_asset_counts"]
+            .groupby("field_name")["references"]
+            .sum()
+        )
+        names = [counts.index.to_series()]
+        catalog = load_table(fingerprint, "catalog_schema")
+        if "field_name" in catalog.columns:
+            names.append(catalog["field_name"])
+        artifacts = load_catalog_composition_artifacts(fingerprint)
+        if artifacts is not None:
+            names.append(artifacts["fill"]["field_name"])
+        names = pd.concat(names).dropna().astype(str).drop_duplicates()
+        entries = pd.DataFrame(
             {
-                "type": "critical",
-                "icon": "🚨",
-                "title": "Ghost Fields Detected",
-                "message": f"{unique_ghosts} fields are referenced but not in catalog. This can cause runtime errors.",
-                "count": unique_ghosts,
+                "field_name": names.values,
+                "references": counts.reindex(names.values).fillna(0).astype(int).values,
             }
         )
-
-    # Catalog saturation
-    if not catalog_df.empty:
-        total_fields = len(catalog_df)
-        used_fields = refs_df[refs_df["is_risk"] == False]["field_name"].nunique()
-        saturation = (used_fields / total_fields * 100) if total_fields > 0 else 0
-
-        if saturation < 30:
-            insights.append(
-                {
-                    "type": "warning",
-                    "icon": "⚠️",
-                    "title": "Low Catalog Utilization",
-                    "message": f"Only {saturation:.0f}% of catalog fields are in use. Consider cleaning unused fields.",
-                    "count": total_fields - used_fields,
-                }
-            )
-        elif saturation > 85:
-            insights.append(
-                {
-                    "type": "success",
-                    "icon": "✅",
-                    "title": "High Catalog Utilization",
-                    "message": f"{saturation:.0f}% of catalog fields are actively used. Great efficiency!",
-                    "count": used_fields,
-                }
+        key = "field_name"
+    elif corpus == "assets":
+        facts = load_reference_facts(fingerprint)
+        counts = facts["asset_id"].value_counts()
+        entries = load_assets(fingerprint).reindex(
+            columns=["asset_id", "asset_name", "asset_type", "status"]
+        )
+        entries = entries.dropna(subset=["asset_name"]).assign(
+            references=lambda df: counts.reindex(df["asset_id"])
+            .fillna(0)
+            .astype(int)
+            .values
+        )
+        key = "asset_name"
+    else:
+        refs = load_table(fingerprint, "field_references")
+        refs = refs.reindex(columns=["field_name", "context_snippet", "is_risk"])
+        entries = (
+            refs.dropna(subset=["context_snippet"])
+            .groupby(
+                ["field_name", "context_snippet", "is_risk"], sort=False, observed=True
             )
+            .size()
+            .reset_index(name="references")
+        )
+        key = "context_snippet"
 
-    # High-impact fields
-    if not refs_df[refs_df["is_risk"] == False].empty:
-        field_usage = refs_df[refs_df["is_risk"] == False]["field_name"].value_counts()
-        if len(field_usage) > 0:
-            top_field = field_usage.index[0]
-            top_count = field_usage.iloc[0]
-            insights.append(
-                {
-                    "type": "info",
-                    "icon": "⭐",
-                    "title": "Critical Dependency",
-                    "message": f"Field '{top_field}' is used in {top_count} locations. Changes require careful review.",
-                    "count": top_count,
-                }
-            )
+    entries = entries.reset_index(drop=True)
+    with timed(f"Build {corpus} search index"):
+        return entries, build_search_index(entries[key], entries["references"])
 
-    # Stale assets
-    if "last_active" in assets_df.columns and not assets_df["last_active"].isna().all():
-        cutoff = pd.Timestamp.now() - pd.Timedelta(days=90)
-        stale = assets_df[assets_df["last_active"] < cutoff]
-        if len(stale) > 0:
-            insights.append(
-                {
-                    "type": "warning",
-                    "icon": "⏰",
-                    "title": "Stale Assets",
-                    "message": f"{len(stale)} assets haven't been active in 90+ days. Review for deprecation.",
-                    "count": len(stale),
-                }
-            )
 
-    return (
-        insights
-        if insights
-        else [
-            {
-                "type": "success",
-                "icon": "✅",
-                "title": "All Systems Operational",
-                "message": "No critical governance issues detected.",
-                "count": 0,
-            }
-        ]
-    )
+def search_entries(fingerprint, corpus, query):
+    """Entries of `corpus` matching `query`, ranked; see search_index()."""
+    entries, index = load_search_index(fingerprint, corpus)
+    positions, fuzzy = search_index(index, query)
+    return entries.iloc[positions], fuzzy
 
 
-def create_field_usage_heatmap(refs_df, assets_df, blocks_df):
-    """Create field usage heatmap by asset type."""
-    if refs_df.empty or assets_df.empty:
-        return None
+CONTENT_SEARCH_LIMIT = 200
+
+
+@st.cache_data(max_entries=64)
+def search_content(fingerprint, query, limit=CONTENT_SEARCH_LIMIT):
+    """Blocks whose Liquid contains `query`, from the ETL's FTS5 content index.
+
+    Returns (total matches, first `limit` hits with block metadata and a snippet
+    whose matches are wrapped in \x02...\x03). The Liquid text itself is never
+    loaded into pandas.
+    """
+    path = os.path.join(TABLES_DIR, CONTENT_INDEX)
+    match = '"' + query.replace('"', '""') + '"'
+    con = sqlite3.connect(f"{pathlib.Path(path).as_uri()}?mode=ro", uri=True)
+    try:
+        total = con.execute(
+            "SELECT count(*) FROM blocks WHERE blocks MATCH ?", (match,)
+        ).fetchone()[0]
+        hits = pd.read_sql_query(
+            f"""
+            SELECT {", ".join(CONTENT_INDEX_COLUMNS)},
+                snippet(blocks, 0, char(2), char(3), '…', 64) AS snippet
+            FROM blocks WHERE blocks MATCH ? LIMIT ?
+            """,
+            con,
+            params=(match, limit),
+        )
+    finally:
+        con.close()
+    return total, hits
+
+
+# ============================================================================
+# DEPENDENCY GRAPH
+# ============================================================================
+
+
+@st.cache_resource(max_entries=CACHED_PARTITIONS)
+def load_dependency_graph(fingerprint):
+    """Field -> block -> asset -> dependent asset graph, built once per data version.
+
+    Nodes are ("field", name), ("block", block_id) and ("asset", asset_id);
+    dependencies.csv rows add source -> target asset edges, so impact flows
+    from the source asset to the assets that depend on it. `impact` maps every
+    node to the frozenset of asset ids reachable from it (its blast radius),
+    precomputed over the condensation so lookups are a dict access.
+    Shared across sessions; callers must not modify it.
+    """
+    import networkx as nx
+
+    graph = nx.DiGraph()
+
+    catalog = load_table(fingerprint, "catalog_schema")
+    if "field_name" in catalog.columns:
+        graph.add_nodes_from(("field", f) for f in catalog["field_name"].dropna())
+
+    refs = load_table(fingerprint, "field_references").reindex(
+        columns=["field_name", "block_id"]
+    )
+    graph.add_edges_from(
+        (("field", f), ("block", b))
+        for f, b in refs.dropna().drop_duplicates().itertuples(index=False, name=None)
+    )
 
-    # Join to get asset types
-    joined = refs_df.merge(
-        blocks_df[["block_id", "asset_id"]], on="block_id", how="left"
+    blocks = load_table(fingerprint, "content_blocks", BLOCK_COLUMNS).reindex(
+        columns=BLOCK_COLUMNS
     )
-    joined = joined.merge(
-        assets_df[["asset_id", "asset_type"]], on="asset_id", how="left"
+    graph.add_edges_from(
+        (("block", b), ("asset", a))
+        for b, a in blocks.dropna().drop_duplicates().itertuples(index=False, name=None)
     )
 
-    # Filter valid usage
-    valid = joined[joined["is_risk"] == False]
+    deps = load_table(fingerprint, "dependencies").reindex(
+        columns=["source_asset_id", "target_asset_id", "dependency_type"]
+    )
+    for source, target, kind in deps.dropna(subset=deps.columns[:2]).itertuples(
+        index=False
+    ):
+        graph.add_edge(("asset", source), ("asset", target), dependency_type=kind)
+
+    # Reachable assets per strongly connected component, leaves first. Sets are
+    # shared where nothing is added (e.g. a block reaches exactly what its asset
+    # reaches), so memory stays close to one set per asset.
+    with timed("Compute blast radii"):
+        condensed = nx.condensation(graph)
+        reach = {}
+        for component in reversed(list(nx.topological_sort(condensed))):
+            members = condensed.nodes[component]["members"]
+            own = {n[1] for n in members if n[0] == "asset"}
+            below = {id(reach[s]): reach[s] for s in condensed.successors(component)}
+            below = list(below.values())
+            if not own and len(below) == 1:
+                reach[component] = below[0]
+            else:
+                reach[component] = frozenset(own.union(*below))
+        mapping = condensed.graph["mapping"]
+        impact = {node: reach[mapping[node]] for node in graph}
 
-    if valid.empty:
-        return None
+    return {"graph": graph, "impact": impact}
 
-    # Aggregate
-    heatmap_data = (
-        valid.groupby(["field_name", "asset_type"]).size().reset_index(name="count")
+
+def field_blast_radius(fingerprint, field_name):
+    """Blocks referencing `field_name` and the assets that break without it.
+
+    Returns (block ids, assets frame with a `via` column: "Direct" for assets
+    whose own Liquid uses the field, "Dependency" for assets reached through
+    dependencies.csv).
+    """
+    dependency_graph = load_dependency_graph(fingerprint)
+    graph, impact = dependency_graph["graph"], dependency_graph["impact"]
+    node = ("field", field_name)
+    if node not in graph:
+        return [], pd.DataFrame(columns=["asset_id", "via"])
+
+    block_nodes = list(graph.successors(node))
+    direct = {a[1] for b in block_nodes for a in graph.successors(b)}
+    affected = pd.DataFrame({"asset_id": sorted(impact[node])})
+    affected["via"] = np.where(
+        affected["asset_id"].isin(direct), "Direct", "Dependency"
     )
+    return [b[1] for b in block_nodes], affected
 
-    # Pivot for heatmap
-    pivot = heatmap_data.pivot(
-        index="field_name", columns="asset_type", values="count"
-    ).fillna(0)
-
-    # Get top 20 fields by total usage
-    pivot["total"] = pivot.sum(axis=1)
-    pivot = pivot.nlargest(20, "total").drop("total", axis=1)
-
-    fig = go.Figure(
-        data=go.Heatmap(
-            z=pivot.values,
-            x=pivot.columns,
-            y=pivot.index,
-            colorscale="Oranges",
-            text=pivot.values,
-            texttemplate="%{text}",
-            textfont={"size": 10},
-            colorbar=dict(title="References"),
+
+# ============================================================================
+# CHARTS
+# ============================================================================
+# Metrics, insights and figure builders live in etl/overview.py, shared with the
+# static bundle the ETL writes for analytics.html.
+
+
+def asset_activity_by_month(fingerprint, start_date=None, end_date=None):
+    """Assets per (month of last activity, asset type) within the period."""
+    if use_duckdb(fingerprint):
+        return duckdb_query(
+            fingerprint,
+            DUCKDB_PERIOD_CTES
+            + """
+            SELECT
+                CAST(date_trunc('month', last_active) AS TIMESTAMP) AS month,
+                asset_type,
+                count(*) AS count
+            FROM in_range
+            WHERE last_active IS NOT NULL AND asset_type IS NOT NULL
+            GROUP BY month, asset_type
+            ORDER BY month, asset_type
+            """,
+            {"start": start_date, "end": end_date},
         )
-    )
 
-    fig.update_layout(
-        title="Field Usage Heatmap (Top 20 Fields)",
-        xaxis_title="Asset Type",
-        yaxis_title="Field Name",
-        height=600,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#0f172a"),
+    assets = assets_in_period(fingerprint, start_date, end_date)
+    if assets.empty or "last_active" not in assets.columns:
+        return pd.DataFrame(columns=["month", "asset_type", "count"])
+    assets_clean = assets.dropna(subset=["last_active"])
+    month = assets_clean["last_active"].dt.to_period("M").dt.to_timestamp()
+    return (
+        assets_clean.groupby([month.rename("month"), "asset_type"], observed=True)
+        .size()
+        .reset_index(name="count")
     )
 
-    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
-    fig.update_yaxes(showgrid=False, zeroline=False)
 
-    return fig
+# Chart name -> (builder, governance table it plots; None for the asset timeline).
+CHART_BUILDERS = {
+    "top_fields": (create_top_fields_chart, "field_asset_counts"),
+    "usage_distribution": (create_usage_distribution_chart, "field_asset_counts"),
+    "field_usage_heatmap": (create_field_usage_heatmap, "field_usage_by_asset_type"),
+    "asset_timeline": (create_asset_timeline, None),
+}
 
 
-def create_usage_distribution_chart(refs_df):
-    """Create distribution chart showing field usage patterns."""
-    if refs_df.empty or refs_df[refs_df["is_risk"] == False].empty:
-        return None
+@st.cache_data(max_entries=32)
+def governance_chart(fingerprint, start_date, end_date, chart, **params):
+    """Figure for `chart` over the period, built once per data version and shared
+    across sessions (auto-refresh ticks and reruns reuse the cached figure)."""
+    builder, table = CHART_BUILDERS[chart]
+    if table is None:
+        data = asset_activity_by_month(fingerprint, start_date, end_date)
+    else:
+        data = governance_aggregates(fingerprint, start_date, end_date)[table]
+    with timed(f"Build chart {chart}"):
+        return builder(data, **params)
 
-    valid_refs = refs_df[refs_df["is_risk"] == False]
-    usage_counts = valid_refs["field_name"].value_counts().reset_index()
-    usage_counts.columns = ["field_name", "count"]
-
-    # Categorize
-    def categorize(count):
-        if count >= 20:
-            return "Critical (20+)"
-        elif count >= 10:
-            return "High (10-19)"
-        elif count >= 5:
-            return "Medium (5-9)"
-        else:
-            return "Low (1-4)"
 
-    usage_counts["category"] = usage_counts["count"].apply(categorize)
+# ============================================================================
+# INTERACTIVE FRAGMENTS
+# ============================================================================
+# Search boxes and filters live in st.fragment blocks, so typing reruns only the
+# table they drive instead of the sidebar, aggregates and charts around it.
 
-    category_counts = usage_counts["category"].value_counts().reset_index()
-    category_counts.columns = ["category", "fields"]
+TABLE_PAGE_SIZE = 100
 
-    # Define order
-    order = ["Critical (20+)", "High (10-19)", "Medium (5-9)", "Low (1-4)"]
-    category_counts["category"] = pd.Categorical(
-        category_counts["category"], categories=order, ordered=True
-    )
-    category_counts = category_counts.sort_values("category")
 
-    color_map = {
-        "Critical (20+)": "#ef4444",
-        "High (10-19)": "#ff6a00",
-        "Medium (5-9)": "#f59e0b",
-        "Low (1-4)": "#10b981",
-    }
+@st.cache_data(max_entries=32)
+def sort_order(fingerprint, key, data_key, rows, sort_by, descending, _column):
+    """Row positions of a paged table sorted by `_column`, once per table and sort.
 
-    fig = px.bar(
-        category_counts,
-        x="category",
-        y="fields",
-        color="category",
-        color_discrete_map=color_map,
-        title="Field Usage Distribution",
-        text="fields",
-    )
+    `_column` is not hashed: (fingerprint, key, data_key, rows) identify it.
+    """
+    with timed(f"Sort table {key}"):
+        order = pd.Series(_column.to_numpy()).sort_values(
+            ascending=not descending, kind="stable", na_position="last"
+        )
+    return order.index.to_numpy()
 
-    fig.update_traces(texttemplate="%{text}", textposition="outside")
-    fig.update_layout(
-        showlegend=False,
-        xaxis_title="Usage Category",
-        yaxis_title="Number of Fields",
-        height=400,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#0f172a"),
+
+@st.fragment
+def paged_dataframe(
+    df, key, sort_columns=(), data_key=None, page_size=TABLE_PAGE_SIZE, **kwargs
+):
+    """st.dataframe that sends one page of `df` to the browser.
+
+    Sorting by one of `sort_columns` and slicing happen here, so reruns ship
+    at most `page_size` rows through Arrow however large `df` is. The sort
+    order is cached per data version, table and `data_key` (whatever else
+    `df` depends on: period, search, selection), so flipping pages, a fragment
+    rerun of only this table, never re-sorts. Remaining keyword arguments go
+    to st.dataframe.
+    """
+    if len(df) <= page_size and not sort_columns:
+        with timed(f"Render table {key}"):
+            st.dataframe(df, **kwargs)
+        return
+
+    pages = max(1, -(-len(df) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_by = None
+    if sort_columns:
+        with col1:
+            sort_by = st.selectbox(
+                "Sort table by", ["(as listed)", *sort_columns], key=f"{key}_sort"
+            )
+        with col2:
+            descending = st.toggle("Descending", key=f"{key}_desc")
+    with col3:
+        page = st.number_input(
+            f"Page (of {pages:,})", min_value=1, max_value=pages, key=page_key
+        )
+
+    start = (page - 1) * page_size
+    rows = slice(start, start + page_size)
+    if sort_by in sort_columns:
+        order = sort_order(
+            DATA_FINGERPRINT, key, data_key, len(df), sort_by, descending, df[sort_by]
+        )
+        rows = order[rows]
+    with timed(f"Render table {key}"):
+        st.dataframe(df.iloc[rows], **kwargs)
+    st.caption(
+        f"Rows {start + 1:,}–{min(start + page_size, len(df)):,} of {len(df):,}"
+        if len(df)
+        else "No rows"
     )
 
-    fig.update_xaxes(showgrid=False, zeroline=False)
-    fig.update_yaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
 
-    return fig
+@st.fragment
+def render_field_matrix(
+    base_analysis, field_counts_df, usage_by_type_df, show_asset_counts
+):
+    """Field search/filter/sort table and details; its widgets rerun only this block."""
+    # Search and filter
+    col1, col2, col3 = st.columns([3, 1, 1])
 
+    with col1:
+        search = st.text_input("🔍 Search fields", placeholder="Type to search...")
 
-def create_top_fields_chart(refs_df, top_n=15):
-    """Create horizontal bar chart of most-used fields."""
-    if refs_df.empty or refs_df[refs_df["is_risk"] == False].empty:
-        return None
+    with col2:
+        risk_filter = st.selectbox("Risk Status", ["All", "Valid", "Ghost"])
+
+    with col3:
+        sort_by = st.selectbox("Sort By", ["Usage", "Name", "Risk"])
+
+    # Apply filters
+    field_analysis = base_analysis
+    if search:
+        matches, fuzzy = search_entries(DATA_FINGERPRINT, "fields", search)
+        field_analysis = field_analysis[
+            field_analysis["field_name"].isin(matches["field_name"])
+        ]
+        if fuzzy:
+            st.caption(f"No fields contain “{search}”; showing closest matches.")
+
+    if risk_filter == "Valid":
+        field_analysis = field_analysis[field_analysis["is_risk"] == False]
+    elif risk_filter == "Ghost":
+        field_analysis = field_analysis[field_analysis["is_risk"] == True]
+
+    # Sort
+    if sort_by == "Usage":
+        field_analysis = field_analysis.sort_values("references", ascending=False)
+    elif sort_by == "Name":
+        field_analysis = field_analysis.sort_values("field_name")
+    elif sort_by == "Risk":
+        field_analysis = field_analysis.sort_values(
+            ["is_risk", "references"], ascending=[False, False]
+        )
+
+    # Display
+    st.markdown("### 📊 Field Usage Matrix")
 
-    valid_refs = refs_df[refs_df["is_risk"] == False]
-    top_fields = valid_refs["field_name"].value_counts().head(top_n).reset_index()
-    top_fields.columns = ["field_name", "references"]
-
-    fig = px.bar(
-        top_fields,
-        y="field_name",
-        x="references",
-        orientation="h",
-        title=f"Top {top_n} Most Referenced Fields",
-        color="references",
-        color_continuous_scale="Oranges",
-        text="references",
+    # Add risk badges
+    def format_risk(row):
+        if row["is_risk"]:
+            return '<span class="status-badge status-critical">GHOST</span>'
+        else:
+            return '<span class="status-badge status-success">VALID</span>'
+
+    display_df = field_analysis.drop(columns=["is_risk"], errors="ignore")
+
+    paged_dataframe(
+        display_df,
+        "field_matrix",
+        use_container_width=True,
+        column_config={
+            "field_name": "Field Name",
+            "references": st.column_config.ProgressColumn(
+                "References",
+                format="%d",
+                min_value=0,
+                max_value=int(field_analysis["references"].max())
+                if not field_analysis.empty
+                else 100,
+            ),
+            "in_catalog": st.column_config.CheckboxColumn("In Catalog"),
+        },
+        hide_index=True,
+        height=600,
     )
 
-    fig.update_traces(texttemplate="%{text}", textposition="outside")
-    fig.update_layout(
-        yaxis={"categoryorder": "total ascending"},
-        xaxis_title="Number of References",
-        yaxis_title="",
-        height=500,
-        showlegend=False,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#0f172a"),
+    # Field details section
+    st.markdown("---")
+    st.markdown("### 🔬 Field Details")
+
+    selected_field = st.selectbox(
+        "Select a field to analyze:", options=field_analysis["field_name"].unique()
     )
 
-    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
-    fig.update_yaxes(showgrid=False, zeroline=False)
+    if selected_field:
+        field_row = field_counts_df[
+            field_counts_df["field_name"] == selected_field
+        ].iloc[0]
 
-    return fig
+        col1, col2, col3, col4 = st.columns(4)
 
+        col1.metric("Total References", int(field_row["references"]))
+        col2.metric("Is Ghost", "Yes" if field_row["is_risk"] else "No")
 
-def create_asset_timeline(assets_df):
-    """Create timeline of asset activity."""
-    if assets_df.empty or "last_active" not in assets_df.columns:
-        return None
+        # Asset counts
+        if show_asset_counts:
+            col3.metric("Assets Using", int(field_row["assets"]))
 
-    assets_clean = assets_df.dropna(subset=["last_active"]).copy()
+            # References by asset type
+            type_refs = usage_by_type_df[
+                usage_by_type_df["field_name"] == selected_field
+            ].set_index("asset_type")["references"]
+            campaign_count = int(type_refs.get("Campaign", 0))
+            canvas_count = int(type_refs.get("Canvas", 0))
+            col4.metric("Campaigns/Canvases", f"{campaign_count}/{canvas_count}")
 
-    if assets_clean.empty:
-        return None
 
-    assets_clean["month"] = (
-        assets_clean["last_active"].dt.to_period("M").dt.to_timestamp()
+@st.fragment
+def render_catalog_field_search(fields_df):
+    """Catalog field list with a search box that reruns only this block."""
+    search = st.text_input(
+        "Search catalog fields",
+        placeholder="Type to filter fields...",
     )
-    timeline = (
-        assets_clean.groupby(["month", "asset_type"]).size().reset_index(name="count")
+
+    if search:
+        # Ranked by references, so the most-used matches come first.
+        matches, fuzzy = search_entries(DATA_FINGERPRINT, "fields", search)
+        fields_df = pd.DataFrame(
+            {
+                "Field": matches["field_name"][
+                    matches["field_name"].isin(fields_df["Field"])
+                ]
+            }
+        )
+        if fuzzy:
+            st.caption(f"No fields contain “{search}”; showing closest matches.")
+
+    st.caption(f"{len(fields_df):,} fields")
+    paged_dataframe(
+        fields_df,
+        "catalog_fields",
+        use_container_width=True,
+        hide_index=True,
     )
 
-    fig = px.line(
-        timeline,
-        x="month",
-        y="count",
-        color="asset_type",
-        title="Asset Activity Over Time",
-        markers=True,
-        color_discrete_map={"Campaign": "#ff6a00", "Canvas": "#1e293b"},
+
+@st.fragment
+def render_fill_rate_table(fill_df):
+    """Per-field fill rates with a search box that reruns only this block."""
+    q = st.text_input("Search fields", placeholder="Filter by field name...")
+    df = fill_df
+    if q:
+        matches, fuzzy = search_entries(DATA_FINGERPRINT, "fields", q)
+        df = df[df["field_name"].astype(str).isin(matches["field_name"])]
+        if fuzzy:
+            st.caption(f"No fields contain “{q}”; showing closest matches.")
+
+    paged_dataframe(
+        df.sort_values(["fill_rate_pct", "field_name"], ascending=[True, True]),
+        "fill_rates",
+        sort_columns=("field_name", "fill_rate_pct", "non_empty_count"),
+        data_key=q,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "field_name": "Field",
+            "fill_rate_pct": st.column_config.ProgressColumn(
+                "Fill Rate %",
+                format="%.0f",
+                min_value=0.0,
+                max_value=100.0,
+            ),
+            "non_empty_count": st.column_config.NumberColumn("Non-Empty", format="%d"),
+            "empty_count": st.column_config.NumberColumn("Empty", format="%d"),
+            "fill_rate_ci_pct": st.column_config.NumberColumn("± CI", format="%.2f"),
+        },
+        height=520,
     )
 
-    fig.update_layout(
-        xaxis_title="Month",
-        yaxis_title="Active Assets",
-        hovermode="x unified",
+
+@st.fragment
+def render_asset_snippet_search():
+    """Search over asset names and Liquid context snippets, ranked by references."""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input(
+            "Search assets or snippets", placeholder="Asset name or Liquid text..."
+        )
+    with col2:
+        corpus = st.selectbox("Search In", ["Assets", "Snippets"])
+
+    if not query:
+        return
+
+    matches, fuzzy = search_entries(DATA_FINGERPRINT, corpus.lower(), query)
+    if fuzzy:
+        st.caption(f"Nothing contains “{query}”; showing closest matches.")
+    st.caption(f"{len(matches):,} matches")
+    paged_dataframe(
+        matches.drop(columns=["asset_id"], errors="ignore"),
+        "asset_snippet_search",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "asset_name": "Asset",
+            "asset_type": "Type",
+            "status": "Status",
+            "field_name": "Field",
+            "context_snippet": "Snippet",
+            "is_risk": st.column_config.CheckboxColumn("Ghost"),
+            "references": st.column_config.NumberColumn("References", format="%d"),
+        },
         height=400,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="#0f172a"),
-        legend=dict(title="Asset Type"),
     )
 
-    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
-    fig.update_yaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
 
-    return fig
+@st.fragment
+def render_content_search():
+    """Full-text search over every Liquid block, with highlighted snippets."""
+    query = st.text_input(
+        "Search Liquid content",
+        placeholder="Field name, variable or any text (3+ characters)...",
+    ).strip()
+    if not query:
+        st.caption("Matches any substring of the extracted Liquid bodies.")
+        return
+    if len(query) < 3:
+        st.info("Enter at least 3 characters.")
+        return
+
+    total, hits = search_content(DATA_FINGERPRINT, query)
+    caption = f"{total:,} matching blocks"
+    if total > len(hits):
+        caption += f" (showing first {len(hits):,})"
+    st.caption(caption)
+
+    cards = []
+    for hit in hits.itertuples(index=False):
+        snippet = (
+            html.escape(hit.snippet or "")
+            .replace("\x02", "<mark>")
+            .replace("\x03", "</mark>")
+        )
+        where = " · ".join(
+            html.escape(str(v))
+            for v in [hit.asset_type, hit.step_name, hit.channel, hit.location]
+            if pd.notna(v)
+        )
+        cards.append(
+            f'<div class="content-hit"><strong>'
+            f"{html.escape(str(hit.asset_name if pd.notna(hit.asset_name) else hit.asset_id))}</strong>"
+            f"<br><small>{where}</small><pre>{snippet}</pre></div>"
+        )
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+
+@st.fragment
+def render_blast_radius(fields):
+    """Pick a field and list the blocks and assets that break if it is dropped."""
+    field = st.selectbox("Field to drop", fields)
+    if field is None:
+        return
+
+    block_ids, affected = field_blast_radius(DATA_FINGERPRINT, field)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Content Blocks", len(block_ids))
+    col2.metric("Direct Assets", int((affected["via"] == "Direct").sum()))
+    col3.metric("Via Dependencies", int((affected["via"] == "Dependency").sum()))
+
+    if affected.empty:
+        st.success(f"No assets reference `{field}`; it can be dropped safely.")
+        return
+
+    assets = load_assets(DATA_FINGERPRINT).reindex(
+        columns=["asset_id", "asset_name", "asset_type", "status", "last_active"]
+    )
+    paged_dataframe(
+        affected.merge(assets, on="asset_id", how="left")[
+            ["asset_name", "asset_type", "status", "last_active", "via", "asset_id"]
+        ].sort_values(["via", "asset_name"], kind="mergesort"),
+        "blast_radius",
+        sort_columns=("asset_name", "asset_type", "last_active"),
+        data_key=field,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "asset_name": "Asset",
+            "asset_type": "Type",
+            "status": "Status",
+            "last_active": st.column_config.DatetimeColumn(
+                "Last Active", format="YYYY-MM-DD"
+            ),
+            "via": "Impact",
+            "asset_id": "Asset ID",
+        },
+        height=420,
+    )
 
 
 # ============================================================================
 # SIDEBAR
 # ============================================================================
 
-with st.sidebar:
+period_filtered = False
+start_date = end_date = None
+
+with st.sidebar, timed("Sidebar filters"):
     # Date Filter
     st.markdown("### 📅 Activity Period")
 
-    if "last_active" in assets_df.columns and not assets_df["last_active"].isna().all():
-        min_date = assets_df["last_active"].min()
-        max_date = assets_df["last_active"].max()
+    activity_dates, _ = load_activity_index(DATA_FINGERPRINT)
+    if len(activity_dates):
+        min_date = activity_dates[0]
+        max_date = activity_dates[-1]
 
         if pd.notnull(min_date) and pd.notnull(max_date):
             period_options = [
@@ -853,11 +1702,9 @@ with st.sidebar:
 
             start_date = start_ts.date()
             end_date = end_ts.date()
+            period_filtered = selected_period != "All Time"
 
-            assets_df = assets_df[
-                (assets_df["last_active"].dt.date >= start_date)
-                & (assets_df["last_active"].dt.date <= end_date)
-            ]
+            assets_df = assets_in_period(DATA_FINGERPRINT, start_date, end_date)
 
             st.caption(f"{start_date:%Y/%m/%d} - {end_date:%Y/%m/%d}")
             st.success(f"✓ {len(assets_df)} assets in range")
@@ -866,19 +1713,22 @@ with st.sidebar:
     else:
         st.warning("Run ETL to enable filtering")
 
+    # (None, None) for "All Time", so the unfiltered view shares one cache entry.
+    period = (start_date, end_date) if period_filtered else (None, None)
+    governance = governance_aggregates(DATA_FINGERPRINT, *period)
+    field_counts_df = governance["field_asset_counts"]
+    usage_by_type_df = governance["field_usage_by_asset_type"]
+    ghost_fields_df = governance["ghost_fields"]
+    stale_assets_df = governance["stale_assets"]
+
     st.markdown("---")
 
     # Quick Stats
     st.markdown("### ⚡ Quick Stats")
     st.metric("Total Assets", len(assets_df), help="Campaigns + Canvases")
 
-    if not refs_df.empty:
-        ghost_count = len(
-            refs_df[
-                (refs_df["is_risk"] == True)
-                & (refs_df["field_name"] != "location_guid")
-            ]
-        )
+    if not field_counts_df.empty:
+        ghost_count = int(ghost_fields_df["occurrences"].sum())
         st.metric(
             "Ghost References",
             ghost_count,
@@ -896,9 +1746,11 @@ with st.sidebar:
 PAGES = [
     "🏠 Overview",
     "🔍 Field Intelligence",
+    "🔎 Content Search",
     "👨‍🍳 Catalog Fields",
     "⚖️ Catalog Composition",
     "🚨 Risk Center",
+    "🕸️ Dependencies",
 ]
 current_page = st.session_state.get("tas_page", PAGES[0])
 if current_page not in PAGES:
@@ -916,95 +1768,54 @@ page = st.pills(
 if page is None:
     page = current_page
 
+# The page body is timed as one span (it is an if/elif chain, not a block).
+PAGE_STARTED = time.perf_counter()
+
 # --- PAGE 1: OVERVIEW ---
 if page == "🏠 Overview":
-    # Calculate governance score (used for internal context; not shown as a card)
-    score, status = calculate_governance_score(catalog_df, refs_df, assets_df)
+    catalog_df = load_table(DATA_FINGERPRINT, "catalog_schema")
 
-    active_days = 30
-    active_cutoff = pd.Timestamp.now(tz="UTC").tz_localize(None) - pd.Timedelta(
-        days=active_days
+    # Calculate governance score (used for internal context; not shown as a card)
+    score, status = calculate_governance_score(
+        catalog_df, field_counts_df, ghost_fields_df
     )
 
+    artifacts = load_catalog_composition_artifacts(DATA_FINGERPRINT)
+    metrics = overview_metrics(catalog_df, assets_df, field_counts_df, artifacts)
+
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        campaigns_df = (
-            assets_df[assets_df["asset_type"] == "Campaign"]
-            if (not assets_df.empty and "asset_type" in assets_df.columns)
-            else pd.DataFrame()
-        )
-        if not campaigns_df.empty and "status" in campaigns_df.columns:
-            campaigns_df = campaigns_df[campaigns_df["status"] != "Archived"]
-        if not campaigns_df.empty and "last_sent" in campaigns_df.columns:
-            last_sent_dt = pd.to_datetime(
-                campaigns_df["last_sent"], errors="coerce", utc=True
-            ).dt.tz_convert(None)
-            active_campaigns = campaigns_df[
-                last_sent_dt.notna() & (last_sent_dt >= active_cutoff)
-            ]
-        elif not campaigns_df.empty and "last_active" in campaigns_df.columns:
-            last_active_dt = pd.to_datetime(
-                campaigns_df["last_active"], errors="coerce", utc=True
-            ).dt.tz_convert(None)
-            active_campaigns = campaigns_df[
-                last_active_dt.notna() & (last_active_dt >= active_cutoff)
-            ]
-        else:
-            active_campaigns = pd.DataFrame()
-
         st.metric(
             "Active Campaigns",
-            len(active_campaigns),
-            help=f"Active = last_sent within {active_days} days",
+            metrics["active_campaigns"],
+            help=f"Active = last_sent within {ACTIVE_DAYS} days",
         )
 
     with col2:
-        canvases_df = (
-            assets_df[assets_df["asset_type"] == "Canvas"]
-            if (not assets_df.empty and "asset_type" in assets_df.columns)
-            else pd.DataFrame()
-        )
-        if not canvases_df.empty and "status" in canvases_df.columns:
-            canvases_df = canvases_df[canvases_df["status"] != "Archived"]
-        if not canvases_df.empty and "last_entry" in canvases_df.columns:
-            last_entry_dt = pd.to_datetime(
-                canvases_df["last_entry"], errors="coerce", utc=True
-            ).dt.tz_convert(None)
-            active_canvases = canvases_df[
-                last_entry_dt.notna() & (last_entry_dt >= active_cutoff)
-            ]
-        elif not canvases_df.empty and "last_active" in canvases_df.columns:
-            last_active_dt = pd.to_datetime(
-                canvases_df["last_active"], errors="coerce", utc=True
-            ).dt.tz_convert(None)
-            active_canvases = canvases_df[
-                last_active_dt.notna() & (last_active_dt >= active_cutoff)
-            ]
-        else:
-            active_canvases = pd.DataFrame()
-
         st.metric(
             "Active Canvases",
-            len(active_canvases),
-            help=f"Active = last_entry within {active_days} days",
+            metrics["active_canvases"],
+            help=f"Active = last_entry within {ACTIVE_DAYS} days",
         )
 
     with col3:
-        if not catalog_df.empty and not refs_df.empty:
-            used_fields = refs_df[refs_df["is_risk"] == False]["field_name"].nunique()
-            saturation = (
-                (used_fields / len(catalog_df) * 100) if len(catalog_df) > 0 else 0
+        if metrics["utilization_pct"] is not None:
+            st.metric(
+                "Utilization",
+                f"{metrics['utilization_pct']:.0f}%",
+                help="Catalog utilization",
             )
-            st.metric("Utilization", f"{saturation:.0f}%", help="Catalog utilization")
         else:
             st.metric("Utilization", "N/A")
 
     with col4:
-        st.metric("Catalog Fields", len(catalog_df), help="Total defined fields")
+        st.metric(
+            "Catalog Fields", metrics["catalog_fields"], help="Total defined fields"
+        )
 
     st.caption(
-        f"Active = activity in last {active_days} days (Campaigns: last_sent; Canvases: last_entry)"
+        f"Active = activity in last {ACTIVE_DAYS} days (Campaigns: last_sent; Canvases: last_entry)"
     )
 
     # Additional overview cards
@@ -1046,23 +1857,8 @@ if page == "🏠 Overview":
             unsafe_allow_html=True,
         )
 
-    artifacts = load_catalog_composition_artifacts()
-    if artifacts is not None:
-        overview = artifacts["overview"]
-
-        total_fields = float(overview.get("columns", 0) or 0)
-        field_capacity_pct = (
-            round((total_fields / 1000.0) * 100.0) if total_fields else 0
-        )
-
-        braze_mib_est = float(overview.get("est_braze_mib_method_a", 0) or 0)
-        storage_capacity_pct = (
-            round((braze_mib_est / (2.0 * 1024.0)) * 100.0) if braze_mib_est else 0
-        )
-    else:
-        overview = None
-        field_capacity_pct = None
-        storage_capacity_pct = None
+    field_capacity_pct = metrics["field_capacity_pct"]
+    storage_capacity_pct = metrics["storage_capacity_pct"]
 
     with col5:
         st.metric(
@@ -1077,54 +1873,30 @@ if page == "🏠 Overview":
             f"{storage_capacity_pct:.0f}%"
             if storage_capacity_pct is not None
             else "N/A",
-            help="Braze catalog limit: 2 GB. Percent = Braze Size (est.) / 2 GB.",
+            help="Braze catalog limit: 2 GB. Percent = Braze Size / 2 GB."
+            + (
+                " Size is measured from JSON-serialized items."
+                if metrics["storage_measured"]
+                else " Size is estimated."
+            ),
         )
 
     with col7:
-        most_ref_field = "N/A"
-        most_ref_count = None
-        if (
-            not refs_df.empty
-            and "field_name" in refs_df.columns
-            and "is_risk" in refs_df.columns
-        ):
-            valid_refs = refs_df[refs_df["is_risk"] == False]
-            if not valid_refs.empty:
-                counts = valid_refs["field_name"].value_counts()
-                if not counts.empty:
-                    most_ref_field = str(counts.index[0])
-                    most_ref_count = int(counts.iloc[0])
-
+        most_ref_count = metrics["most_referenced_count"]
         render_overview_text_card(
             "Most Referenced",
-            most_ref_field,
+            metrics["most_referenced_field"] or "N/A",
             delta=f"{most_ref_count:,} refs" if most_ref_count is not None else None,
             help_text="Most referenced catalog field across campaigns and canvases.",
         )
 
     with col8:
-        heaviest_field = "N/A"
-        heaviest_mib = None
-        if artifacts is not None and artifacts.get("weights") is not None:
-            weights_df = artifacts["weights"]
-            if (
-                weights_df is not None
-                and not weights_df.empty
-                and "field_name" in weights_df.columns
-            ):
-                df = weights_df.copy()
-                if "est_mib" in df.columns:
-                    df["est_mib"] = pd.to_numeric(df["est_mib"], errors="coerce")
-                    df = df.sort_values("est_mib", ascending=False)
-                row = df.iloc[0]
-                heaviest_field = str(row.get("field_name") or "N/A")
-                if "est_mib" in df.columns and pd.notna(row.get("est_mib")):
-                    heaviest_mib = float(row.get("est_mib"))
-
+        heaviest_mib = metrics["heaviest_mib"]
+        heaviest_note = "" if metrics["heaviest_measured"] else " (est.)"
         render_overview_text_card(
             "Heaviest Field",
-            heaviest_field,
-            delta=f"{heaviest_mib:.1f} MiB (est.)"
+            metrics["heaviest_field"] or "N/A",
+            delta=f"{heaviest_mib:.1f} MiB{heaviest_note}"
             if heaviest_mib is not None
             else None,
             help_text="Largest field by estimated total storage in the catalog.",
@@ -1135,7 +1907,9 @@ if page == "🏠 Overview":
     # Key Insights
     st.header("💡 Governance Insights")
 
-    insights = generate_governance_insights(catalog_df, refs_df, assets_df)
+    insights = generate_governance_insights(
+        catalog_df, field_counts_df, ghost_fields_df, stale_assets_df
+    )
 
     cols = st.columns(len(insights))
     for idx, insight in enumerate(insights):
@@ -1159,41 +1933,19 @@ if page == "🏠 Overview":
     tab1, tab2 = st.tabs(["🔥 Top Fields", "📈 Distribution"])
 
     with tab1:
-        top_chart = create_top_fields_chart(refs_df, top_n=15)
+        top_chart = governance_chart(DATA_FINGERPRINT, *period, "top_fields", top_n=15)
         if top_chart:
-            st.plotly_chart(top_chart, use_container_width=True)
+            with timed("Render chart top_fields"):
+                st.plotly_chart(top_chart, use_container_width=True)
         else:
             st.info("No field usage data available")
 
         st.markdown("### 📋 Field Impact Analysis")
 
-        if not refs_df.empty and not blocks_df.empty and not assets_df.empty:
-            # Join to get asset types
-            joined = refs_df[refs_df["is_risk"] == False].merge(
-                blocks_df[["block_id", "asset_id"]], on="block_id", how="left"
-            )
-            joined = joined.merge(
-                assets_df[["asset_id", "asset_type"]], on="asset_id", how="left"
-            )
-
-            # Aggregate by field and asset type
-            agg = (
-                joined.groupby(["field_name", "asset_type"])["asset_id"]
-                .nunique()
-                .unstack(fill_value=0)
-            )
-
-            # Ensure columns exist
-            for col in ["Campaign", "Canvas"]:
-                if col not in agg.columns:
-                    agg[col] = 0
-
-            agg = agg.reset_index()
-            agg["Total"] = agg["Campaign"] + agg["Canvas"]
-            agg = agg.sort_values("Total", ascending=False).head(15)
-
+        agg = field_impact_table(usage_by_type_df, top_n=15)
+        if not agg.empty:
             st.dataframe(
-                agg[["field_name", "Campaign", "Canvas", "Total"]],
+                agg,
                 use_container_width=True,
                 column_config={
                     "field_name": "Field",
@@ -1213,131 +1965,52 @@ if page == "🏠 Overview":
             st.info("No data available for impact analysis")
 
     with tab2:
-        heatmap = create_field_usage_heatmap(refs_df, assets_df, blocks_df)
+        heatmap = governance_chart(DATA_FINGERPRINT, *period, "field_usage_heatmap")
         if heatmap:
-            st.plotly_chart(heatmap, use_container_width=True)
+            with timed("Render chart field_usage_heatmap"):
+                st.plotly_chart(heatmap, use_container_width=True)
         else:
             st.info("No heatmap data available")
 
 # --- PAGE 2: FIELD INTELLIGENCE ---
 elif page == "🔍 Field Intelligence":
-    if refs_df.empty or catalog_df.empty:
+    catalog_df = load_table(DATA_FINGERPRINT, "catalog_schema")
+    if field_counts_df.empty or catalog_df.empty:
         st.warning(
             "No reference data available. Run ETL to populate field intelligence."
         )
     else:
-        # Search and filter
-        col1, col2, col3 = st.columns([3, 1, 1])
-
-        with col1:
-            search = st.text_input("🔍 Search fields", placeholder="Type to search...")
-
-        with col2:
-            risk_filter = st.selectbox("Risk Status", ["All", "Valid", "Ghost"])
-
-        with col3:
-            sort_by = st.selectbox("Sort By", ["Usage", "Name", "Risk"])
-
         # Process data
-        field_analysis = (
-            refs_df.groupby(["field_name", "is_risk"])
-            .size()
-            .reset_index(name="references")
-        )
+        field_analysis = field_counts_df[["field_name", "is_risk", "references"]].copy()
 
         # Merge with catalog
         field_analysis["in_catalog"] = field_analysis["field_name"].isin(
             catalog_df["field_name"] if "field_name" in catalog_df.columns else []
         )
 
-        # Apply filters
-        if search:
-            field_analysis = field_analysis[
-                field_analysis["field_name"].str.contains(search, case=False, na=False)
-            ]
-
-        if risk_filter == "Valid":
-            field_analysis = field_analysis[field_analysis["is_risk"] == False]
-        elif risk_filter == "Ghost":
-            field_analysis = field_analysis[field_analysis["is_risk"] == True]
-
-        # Sort
-        if sort_by == "Usage":
-            field_analysis = field_analysis.sort_values("references", ascending=False)
-        elif sort_by == "Name":
-            field_analysis = field_analysis.sort_values("field_name")
-        elif sort_by == "Risk":
-            field_analysis = field_analysis.sort_values(
-                ["is_risk", "references"], ascending=[False, False]
-            )
-
-        # Display
-        st.markdown("### 📊 Field Usage Matrix")
-
-        # Add risk badges
-        def format_risk(row):
-            if row["is_risk"]:
-                return '<span class="status-badge status-critical">GHOST</span>'
-            else:
-                return '<span class="status-badge status-success">VALID</span>'
-
-        display_df = field_analysis.drop(columns=["is_risk"], errors="ignore")
-
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            column_config={
-                "field_name": "Field Name",
-                "references": st.column_config.ProgressColumn(
-                    "References",
-                    format="%d",
-                    min_value=0,
-                    max_value=int(field_analysis["references"].max())
-                    if not field_analysis.empty
-                    else 100,
-                ),
-                "in_catalog": st.column_config.CheckboxColumn("In Catalog"),
-            },
-            hide_index=True,
-            height=600,
+        render_field_matrix(
+            field_analysis,
+            field_counts_df,
+            usage_by_type_df,
+            show_asset_counts=not assets_df.empty,
         )
 
-        # Field details section
         st.markdown("---")
-        st.markdown("### 🔬 Field Details")
+        st.markdown("### 🧭 Asset & Snippet Search")
+        render_asset_snippet_search()
 
-        selected_field = st.selectbox(
-            "Select a field to analyze:", options=field_analysis["field_name"].unique()
+# --- PAGE 3: CONTENT SEARCH ---
+elif page == "🔎 Content Search":
+    if not os.path.exists(os.path.join(TABLES_DIR, CONTENT_INDEX)):
+        st.warning(
+            "Content index not found. Run the ETL to build data/tables/content_index.sqlite."
         )
+    else:
+        render_content_search()
 
-        if selected_field:
-            field_refs = refs_df[refs_df["field_name"] == selected_field]
-
-            col1, col2, col3, col4 = st.columns(4)
-
-            col1.metric("Total References", len(field_refs))
-            col2.metric("Is Ghost", "Yes" if field_refs["is_risk"].iloc[0] else "No")
-
-            # Get asset count
-            if not blocks_df.empty and not assets_df.empty:
-                field_blocks = field_refs.merge(
-                    blocks_df[["block_id", "asset_id"]], on="block_id"
-                )
-                asset_count = field_blocks["asset_id"].nunique()
-                col3.metric("Assets Using", asset_count)
-
-                # Get asset types
-                field_assets = field_blocks.merge(
-                    assets_df[["asset_id", "asset_type"]], on="asset_id"
-                )
-                campaign_count = len(
-                    field_assets[field_assets["asset_type"] == "Campaign"]
-                )
-                canvas_count = len(field_assets[field_assets["asset_type"] == "Canvas"])
-                col4.metric("Campaigns/Canvases", f"{campaign_count}/{canvas_count}")
-
-# --- PAGE 3: CATALOG FIELDS ---
+# --- PAGE 4: CATALOG FIELDS ---
 elif page == "👨‍🍳 Catalog Fields":
+    catalog_df = load_table(DATA_FINGERPRINT, "catalog_schema")
     if catalog_df.empty or "field_name" not in catalog_df.columns:
         st.warning("No catalog schema available. Run ETL to populate catalog fields.")
     else:
@@ -1349,46 +2022,28 @@ elif page == "👨‍🍳 Catalog Fields":
         )
         fields_df = pd.DataFrame({"Field": fields.values})
 
-        search = st.text_input(
-            "Search catalog fields",
-            placeholder="Type to filter fields...",
-        )
-
-        if search:
-            fields_df = fields_df[
-                fields_df["Field"].str.contains(search, case=False, na=False)
-            ]
-
-        st.caption(f"{len(fields_df):,} fields")
-        st.dataframe(
-            fields_df,
-            use_container_width=True,
-            hide_index=True,
-        )
+        render_catalog_field_search(fields_df)
 
-# --- PAGE 4: CATALOG COMPOSITION ---
+# --- PAGE 5: CATALOG COMPOSITION ---
 elif page == "⚖️ Catalog Composition":
-    artifacts = load_catalog_composition_artifacts()
+    import plotly.express as px
+
+    artifacts = load_catalog_composition_artifacts(DATA_FINGERPRINT)
     if artifacts is None:
         st.warning(
             "Catalog composition artifacts not found. Run the local builder to generate them."
         )
-        st.code(
-            "python scripts/build_catalog_composition.py",
-            language="bash",
-        )
+        build_command = "python scripts/build_catalog_composition.py"
+        if len(PARTITIONS) > 1:
+            build_command += " --partition " + "/".join(partition)
+        st.code(build_command, language="bash")
     else:
         overview = artifacts["overview"]
         fill_df = artifacts["fill"]
 
-        total_fields = float(overview.get("columns", 0) or 0)
-        field_capacity_pct = (
-            round((total_fields / 1000.0) * 100.0) if total_fields else 0
-        )
-
-        braze_mib_est = float(overview.get("est_braze_mib_method_a", 0) or 0)
-        storage_capacity_pct = (
-            round((braze_mib_est / (2.0 * 1024.0)) * 100.0) if braze_mib_est else 0
+        braze_mib, _ = composition_storage_mib(overview)
+        field_capacity_pct, storage_capacity_pct, storage_measured = catalog_capacity(
+            overview
         )
 
         cols = st.columns(5)
@@ -1403,16 +2058,89 @@ elif page == "⚖️ Catalog Composition":
         cols[4].metric(
             "Storage Capacity",
             f"{storage_capacity_pct:.0f}%",
-            help="Braze catalog limit: 2 GB. Percent = Braze Size (est.) / 2 GB.",
+            help="Braze catalog limit: 2 GB. Percent = Braze Size / 2 GB.",
         )
 
-        st.caption(
-            "Compliance limits: 2 GB max catalog size and 1,000 columns max. "
-            "Storage Capacity uses Braze Size (est.) with a fixed calibration of 2.72 KiB/item and is directional, not exact."
-        )
+        if storage_measured:
+            st.caption(
+                "Compliance limits: 2 GB max catalog size and 1,000 columns max. "
+                f"Storage Capacity uses the measured Braze Size of {braze_mib:,.1f} MiB: every item serialized as JSON "
+                f"(field names plus typed values, empty fields as null), "
+                f"avg {overview.get('braze_item_bytes_avg', 0):,.0f} B/item, max {overview.get('braze_item_bytes_max', 0):,} B."
+            )
+        else:
+            st.caption(
+                "Compliance limits: 2 GB max catalog size and 1,000 columns max. "
+                "Storage Capacity uses Braze Size (est.) with a fixed calibration of 2.72 KiB/item and is directional, not exact."
+            )
+
+        if overview.get("estimated"):
+            st.info(
+                f"Preview estimated from {overview.get('sample_rows', 0):,} sampled rows "
+                f"({overview.get('ci_level', 0.95):.0%} CI): filled % "
+                f"±{overview.get('overall_filled_pct_ci', 0):.2f}, "
+                f"Braze Size ±{overview.get('braze_serialized_mib_ci', 0):,.1f} MiB. "
+                "Run a full build for exact figures."
+            )
+
+        changes = artifacts.get("changes")
+        if changes is not None and changes.get("previous_input_file"):
+            st.caption(
+                f"Since {changes['previous_input_file']}: "
+                f"+{changes.get('rows_added', 0):,} added, "
+                f"-{changes.get('rows_removed', 0):,} removed, "
+                f"{changes.get('rows_changed', 0):,} changed items."
+            )
+            moves_df = pd.DataFrame(changes.get("fill_rate_moves") or [])
+            if not moves_df.empty:
+                with st.expander(f"Fill-Rate Changes ({len(moves_df)} fields)"):
+                    st.dataframe(
+                        moves_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "field_name": "Field",
+                            "previous_fill_rate_pct": st.column_config.NumberColumn(
+                                "Previous %", format="%.2f"
+                            ),
+                            "fill_rate_pct": st.column_config.NumberColumn(
+                                "Fill Rate %", format="%.2f"
+                            ),
+                            "delta_pct": st.column_config.NumberColumn(
+                                "Change (pts)", format="%+.2f"
+                            ),
+                        },
+                    )
 
-        tab_a, tab_b, tab_c = st.tabs(
-            ["Completeness", "Weight (Proxy)", "Heaviest Strings"]
+        dup_items = overview.get("duplicate_items_near")
+        if dup_items:
+            st.caption(
+                f"Duplicates: {overview.get('duplicate_items_exact', 0):,} exact copies, "
+                f"{dup_items:,} including near-duplicates (differing only in "
+                "whitespace/case, ids ignored), wasting "
+                f"{overview.get('duplicate_wasted_bytes_near', 0) / 1024 / 1024:,.2f} MiB."
+            )
+            dups_df = artifacts.get("duplicates")
+            if dups_df is not None and not dups_df.empty:
+                with st.expander(f"Duplicate Groups ({len(dups_df)} largest)"):
+                    st.dataframe(
+                        dups_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "match": "Match",
+                            "items": st.column_config.NumberColumn(
+                                "Items", format="%d"
+                            ),
+                            "wasted_bytes": st.column_config.NumberColumn(
+                                "Wasted Bytes", format="%d"
+                            ),
+                            "sample_ids": "Sample IDs",
+                        },
+                    )
+
+        tab_a, tab_b, tab_c, tab_d = st.tabs(
+            ["Completeness", "Weight (Proxy)", "Heaviest Strings", "Storage (Measured)"]
         )
 
         with tab_a:
@@ -1437,32 +2165,7 @@ elif page == "⚖️ Catalog Composition":
                     )
 
             st.markdown("---")
-            q = st.text_input("Search fields", placeholder="Filter by field name...")
-            df = fill_df
-            if q:
-                df = df[
-                    df["field_name"].astype(str).str.contains(q, case=False, na=False)
-                ]
-
-            st.dataframe(
-                df.sort_values(["fill_rate_pct", "field_name"], ascending=[True, True]),
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "field_name": "Field",
-                    "fill_rate_pct": st.column_config.ProgressColumn(
-                        "Fill Rate %",
-                        format="%.0f",
-                        min_value=0.0,
-                        max_value=100.0,
-                    ),
-                    "non_empty_count": st.column_config.NumberColumn(
-                        "Non-Empty", format="%d"
-                    ),
-                    "empty_count": st.column_config.NumberColumn("Empty", format="%d"),
-                },
-                height=520,
-            )
+            render_fill_rate_table(fill_df)
 
             with st.expander("Input Details"):
                 st.write(
@@ -1513,6 +2216,9 @@ elif page == "⚖️ Catalog Composition":
                         "est_mib": st.column_config.NumberColumn(
                             "Est MiB", format="%.2f"
                         ),
+                        "est_mib_ci": st.column_config.NumberColumn(
+                            "± CI", format="%.2f"
+                        ),
                         "pct_total": st.column_config.NumberColumn(
                             "% Total", format="%.0f"
                         ),
@@ -1551,20 +2257,73 @@ elif page == "⚖️ Catalog Composition":
                     },
                 )
 
-# --- PAGE 5: RISK CENTER ---
+        with tab_d:
+            field_bytes = artifacts.get("field_bytes")
+            if field_bytes is None or field_bytes.empty:
+                st.info(
+                    "No measured storage artifacts available. Re-run the composition builder."
+                )
+            else:
+                fig = px.bar(
+                    field_bytes.head(25).sort_values("serialized_mib", ascending=True),
+                    x="serialized_mib",
+                    y="field_name",
+                    orientation="h",
+                    title="Top Columns by Serialized Size",
+                    color="serialized_mib",
+                    color_continuous_scale="Oranges",
+                )
+                fig.update_layout(
+                    height=600,
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    font=dict(color="#0f172a"),
+                    xaxis_title="MiB",
+                    yaxis_title="",
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+                st.dataframe(
+                    field_bytes,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "field_name": "Field",
+                        "serialized_mib": st.column_config.NumberColumn(
+                            "MiB", format="%.3f"
+                        ),
+                        "serialized_mib_ci": st.column_config.NumberColumn(
+                            "± CI", format="%.3f"
+                        ),
+                        "pct_total": st.column_config.NumberColumn(
+                            "% Total", format="%.1f"
+                        ),
+                        "avg_bytes_per_item": st.column_config.NumberColumn(
+                            "Avg Bytes/Item", format="%.1f"
+                        ),
+                        "non_empty_count": st.column_config.NumberColumn(
+                            "Non-Empty", format="%d"
+                        ),
+                    },
+                )
+                st.caption(
+                    "Per-field bytes include the quoted field name and the JSON value; "
+                    "item braces and separators are counted in the total only."
+                )
+
+# --- PAGE 6: RISK CENTER ---
 elif page == "🚨 Risk Center":
+    catalog_df = load_table(DATA_FINGERPRINT, "catalog_schema")
+
     # Risk Overview
     st.header("⚠️ Active Risks")
 
-    if refs_df.empty:
+    if field_counts_df.empty:
         st.info("No risk data available. Run ETL to populate risk center.")
     else:
         # Calculate risks
-        ghost_fields = refs_df[
-            (refs_df["is_risk"] == True) & (refs_df["field_name"] != "location_guid")
-        ]
-        unique_ghosts = ghost_fields["field_name"].nunique()
-        total_ghost_refs = len(ghost_fields)
+        unique_ghosts = len(ghost_fields_df)
+        total_ghost_refs = int(ghost_fields_df["occurrences"].sum())
 
         # Risk metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -1589,13 +2348,7 @@ elif page == "🚨 Risk Center":
 
         with col3:
             if not assets_df.empty:
-                affected_assets = (
-                    ghost_fields.merge(
-                        blocks_df[["block_id", "asset_id"]], on="block_id"
-                    )["asset_id"].nunique()
-                    if not blocks_df.empty
-                    else 0
-                )
+                affected_assets = len(governance["ghost_assets"])
                 st.metric(
                     "Affected Assets",
                     affected_assets,
@@ -1631,38 +2384,15 @@ elif page == "🚨 Risk Center":
                 unsafe_allow_html=True,
             )
 
-            # Aggregate ghost field data
-            ghost_agg = (
-                ghost_fields.groupby("field_name")
-                .agg({"field_name": "size", "context_snippet": "first"})
-                .rename(columns={"field_name": "occurrences"})
-                .reset_index()
-            )
+            ghost_agg = ghost_fields_df
 
-            # Get affected assets per ghost field
-            if not blocks_df.empty and not assets_df.empty:
-                ghost_assets = ghost_fields.merge(
-                    blocks_df[["block_id", "asset_id"]], on="block_id"
-                )
-                ghost_assets = ghost_assets.merge(
-                    assets_df[["asset_id", "asset_name", "asset_type"]], on="asset_id"
-                )
-
-                asset_counts = (
-                    ghost_assets.groupby("field_name")["asset_id"]
-                    .nunique()
-                    .reset_index()
-                )
-                asset_counts.columns = ["field_name", "affected_assets"]
-
-                ghost_agg = ghost_agg.merge(asset_counts, on="field_name")
-
-            ghost_agg = ghost_agg.sort_values("occurrences", ascending=False)
-
-            st.dataframe(
+            paged_dataframe(
                 ghost_agg[
                     ["field_name", "occurrences", "affected_assets", "context_snippet"]
                 ],
+                "ghost_fields",
+                sort_columns=("occurrences", "affected_assets", "field_name"),
+                data_key=period,
                 use_container_width=True,
                 column_config={
                     "field_name": st.column_config.TextColumn(
@@ -1741,13 +2471,15 @@ elif page == "🚨 Risk Center":
                 "last_active" in assets_df.columns
                 and not assets_df["last_active"].isna().all()
             ):
-                cutoff = pd.Timestamp.now() - pd.Timedelta(days=90)
-                stale = assets_df[assets_df["last_active"] < cutoff]
+                stale = stale_assets_df
 
                 if not stale.empty:
                     st.warning(f"Found {len(stale)} assets inactive for 90+ days")
-                    st.dataframe(
-                        stale[["asset_name", "asset_type", "last_active"]].head(20),
+                    paged_dataframe(
+                        stale[["asset_name", "asset_type", "last_active"]],
+                        "stale_assets",
+                        sort_columns=("last_active", "asset_name", "asset_type"),
+                        data_key=period,
                         use_container_width=True,
                         hide_index=True,
                     )
@@ -1757,10 +2489,8 @@ elif page == "🚨 Risk Center":
                 st.info("No activity data available")
 
         with tab2:
-            if not catalog_df.empty and not refs_df.empty:
-                used_fields = set(
-                    refs_df[refs_df["is_risk"] == False]["field_name"].unique()
-                )
+            if not catalog_df.empty and not field_counts_df.empty:
+                used_fields = set(valid_field_counts(field_counts_df)["field_name"])
                 all_fields = set(
                     catalog_df["field_name"].unique()
                     if "field_name" in catalog_df.columns
@@ -1770,25 +2500,26 @@ elif page == "🚨 Risk Center":
 
                 if unused:
                     st.warning(f"{len(unused)} catalog fields are not being used")
-                    unused_df = pd.DataFrame({"field_name": list(unused)})
-                    st.dataframe(unused_df, use_container_width=True, hide_index=True)
+                    unused_df = pd.DataFrame({"field_name": sorted(unused)})
+                    paged_dataframe(
+                        unused_df,
+                        "unused_fields",
+                        use_container_width=True,
+                        hide_index=True,
+                    )
                 else:
                     st.success("All catalog fields are in use")
             else:
                 st.info("No catalog data available")
 
         with tab3:
-            if not refs_df.empty:
-                high_usage = (
-                    refs_df[refs_df["is_risk"] == False]["field_name"]
-                    .value_counts()
-                    .head(10)
-                )
+            if not field_counts_df.empty:
+                coupling_df = valid_field_counts(field_counts_df)[
+                    ["field_name", "references"]
+                ].head(10)
 
-                if not high_usage.empty:
+                if not coupling_df.empty:
                     st.info("Fields with highest coupling (most references)")
-                    coupling_df = high_usage.reset_index()
-                    coupling_df.columns = ["field_name", "references"]
 
                     st.dataframe(
                         coupling_df,
@@ -1808,6 +2539,59 @@ elif page == "🚨 Risk Center":
                         "⚠️ High coupling means changes to these fields require extensive testing"
                     )
 
+# --- PAGE 7: DEPENDENCIES ---
+elif page == "🕸️ Dependencies":
+    dependency_graph = load_dependency_graph(DATA_FINGERPRINT)
+    graph, impact = dependency_graph["graph"], dependency_graph["impact"]
+    fields = [node[1] for node in graph if node[0] == "field"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Fields", len(fields))
+    col2.metric("Content Blocks", sum(1 for node in graph if node[0] == "block"))
+    col3.metric("Assets", sum(1 for node in graph if node[0] == "asset"))
+    col4.metric("Edges", graph.number_of_edges())
+
+    if not fields:
+        st.warning("No fields found. Run ETL to populate the dependency graph.")
+    else:
+        ranked = pd.DataFrame(
+            {
+                "field_name": fields,
+                "blocks": [graph.out_degree(("field", f)) for f in fields],
+                "assets": [len(impact[("field", f)]) for f in fields],
+            }
+        ).sort_values(
+            ["assets", "blocks", "field_name"], ascending=[False, False, True]
+        )
+
+        st.header("💥 Blast Radius")
+        st.caption(
+            "Assets that reference the field directly, plus every asset downstream "
+            "of them in dependencies.csv."
+        )
+        render_blast_radius(ranked["field_name"].tolist())
+
+        st.markdown("---")
+        st.markdown("### 🔗 Highest-Impact Fields")
+        st.dataframe(
+            ranked.head(15),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "field_name": "Field",
+                "blocks": st.column_config.NumberColumn("Blocks", format="%d"),
+                "assets": st.column_config.ProgressColumn(
+                    "Assets Affected",
+                    format="%d",
+                    min_value=0,
+                    max_value=max(int(ranked["assets"].max()), 1),
+                ),
+            },
+        )
+
+if PROFILING:
+    PROFILE_SPANS.append((f"Page {page}", PAGE_STARTED, time.perf_counter()))
+
 st.markdown("---")
 st.markdown(
     """
@@ -1818,3 +2602,6 @@ st.markdown(
 """,
     unsafe_allow_html=True,
 )
+
+if PROFILING:
+    render_profile(page, period)
@@ -1,10 +1,12 @@
 """Fetch raw data from Braze REST API and save JSON exports to data/raw_snapshots.
 
 Usage:
-  python etl/extract_braze.py
+  python etl/extract_braze.py [--workspace NAME]
 
 This script reads BRAZE_API_KEY and optional BRAZE_REST_ENDPOINT from environment.
 For local development, you can put them in a project-local .env file.
+With a workspaces.toml (see etl/partitions.py) every configured workspace is
+fetched, each with its own key variable and endpoint.
 """
 
 import argparse
@@ -17,12 +19,14 @@ import tomllib
 import requests
 from dotenv import load_dotenv
 
+from partitions import load_workspaces, raw_dir, rest_endpoint
+
 # Project path configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_OUT_DIR = os.path.join(BASE_DIR, "data", "raw_snapshots")
 
 
-def _load_env(env_file: str | None) -> None:
+def _load_env(env_file: str | None, api_key_envs=("BRAZE_API_KEY",)) -> None:
     if env_file and os.path.exists(env_file):
         load_dotenv(env_file)
         print(f"Loaded environment variables from {env_file}")
@@ -42,7 +46,7 @@ def _load_env(env_file: str | None) -> None:
         try:
             with open(secrets_path, "rb") as f:
                 secrets = tomllib.load(f)
-            for key in ("BRAZE_API_KEY", "BRAZE_REST_ENDPOINT"):
+            for key in (*api_key_envs, "BRAZE_REST_ENDPOINT"):
                 if key not in os.environ and key in secrets:
                     os.environ[key] = str(secrets[key])
             print(f"Loaded secrets from {secrets_path}")
@@ -137,47 +141,27 @@ def fetch_details_concurrent(
     return results, failures
 
 
-def main() -> int:
-    p = argparse.ArgumentParser()
-    p.add_argument(
-        "--env-file",
-        default=None,
-        help="Path to a .env file (defaults to <project>/.env if present)",
-    )
-    p.add_argument(
-        "--out-dir", default=DEFAULT_OUT_DIR, help="output directory for raw files"
-    )
-    p.add_argument(
-        "--date", default=None, help="date suffix (YYYYMMDD). Defaults to today"
-    )
-    p.add_argument(
-        "--concurrency",
-        default=8,
-        type=int,
-        help="concurrent workers for details fetch",
-    )
-    args = p.parse_args()
-
-    _load_env(args.env_file)
+def _save_json(data, path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
 
-    api_key = os.environ.get("BRAZE_API_KEY")
-    if not api_key:
-        print("Error: BRAZE_API_KEY environment variable is not set.")
-        print(
-            "Please set it in your environment or creates a .env file (if using python-dotenv)."
-        )
-        return 1
 
-    rest_ep = os.environ.get("BRAZE_REST_ENDPOINT", "https://rest.iad-05.braze.com")
+def extract_workspace(ws, out_root, date_suffix, concurrency) -> dict:
+    """Fetch one workspace's campaigns, canvases and catalogs into its raw dir.
 
-    date_suffix = args.date or datetime.utcnow().strftime("%Y%m%d")
-    out_dir = os.path.abspath(args.out_dir)
+    Returns the workspace's manifest (also written next to the snapshots).
+    """
+    name = ws["name"]
+    api_key = os.environ.get(ws["api_key_env"])
+    rest_ep = rest_endpoint(ws)
+    out_dir = raw_dir(name, root=out_root)
     os.makedirs(out_dir, exist_ok=True)
 
     session = requests.Session()
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
     manifest = {
+        "workspace": name,
         "date": date_suffix,
         "fetched_at": datetime.utcnow().isoformat(),
         "counts": {},
@@ -185,16 +169,15 @@ def main() -> int:
     }
 
     # campaigns list
-    print("Listing campaigns...")
+    print(f"[{name}] Listing campaigns...")
     campaigns = fetch_campaigns_list(session, rest_ep, headers)
     campaigns_file = os.path.join(out_dir, f"campaigns_list_{date_suffix}.json")
-    with open(campaigns_file, "w", encoding="utf-8") as f:
-        json.dump(campaigns, f, indent=2)
+    _save_json(campaigns, campaigns_file)
     manifest["counts"]["campaigns_list"] = len(campaigns)
-    print(f"Saved {len(campaigns)} campaigns to {campaigns_file}")
+    print(f"[{name}] Saved {len(campaigns)} campaigns to {campaigns_file}")
 
     # campaign details
-    print("Fetching campaign details (concurrent)...")
+    print(f"[{name}] Fetching campaign details (concurrent)...")
     campaign_ids = [c.get("id") for c in campaigns if c.get("id")]
     camp_details, camp_failures = fetch_details_concurrent(
         session,
@@ -203,28 +186,27 @@ def main() -> int:
         campaign_ids,
         "/campaigns/details",
         "campaign_id",
-        max_workers=args.concurrency,
+        max_workers=concurrency,
     )
     camp_details_file = os.path.join(out_dir, f"campaign_details_{date_suffix}.json")
-    with open(camp_details_file, "w", encoding="utf-8") as f:
-        json.dump(camp_details, f, indent=2)
+    _save_json(camp_details, camp_details_file)
     manifest["counts"]["campaign_details"] = len(camp_details)
     manifest["failures"].extend(camp_failures)
     print(
-        f"Saved campaign details: {camp_details_file} (failures: {len(camp_failures)})"
+        f"[{name}] Saved campaign details: {camp_details_file} "
+        f"(failures: {len(camp_failures)})"
     )
 
     # canvases list
-    print("Listing canvases...")
+    print(f"[{name}] Listing canvases...")
     canvases = fetch_canvases_list(session, rest_ep, headers)
     canvases_file = os.path.join(out_dir, f"canvases_list_{date_suffix}.json")
-    with open(canvases_file, "w", encoding="utf-8") as f:
-        json.dump(canvases, f, indent=2)
+    _save_json(canvases, canvases_file)
     manifest["counts"]["canvases_list"] = len(canvases)
-    print(f"Saved {len(canvases)} canvases to {canvases_file}")
+    print(f"[{name}] Saved {len(canvases)} canvases to {canvases_file}")
 
     # canvas details
-    print("Fetching canvas details (concurrent)...")
+    print(f"[{name}] Fetching canvas details (concurrent)...")
     canvas_ids = [c.get("id") for c in canvases if c.get("id")]
     canvas_details, canvas_failures = fetch_details_concurrent(
         session,
@@ -233,43 +215,109 @@ def main() -> int:
         canvas_ids,
         "/canvas/details",
         "canvas_id",
-        max_workers=args.concurrency,
+        max_workers=concurrency,
     )
     canvas_details_file = os.path.join(out_dir, f"canvas_details_{date_suffix}.json")
-    with open(canvas_details_file, "w", encoding="utf-8") as f:
-        json.dump(canvas_details, f, indent=2)
+    _save_json(canvas_details, canvas_details_file)
     manifest["counts"]["canvas_details"] = len(canvas_details)
     manifest["failures"].extend(canvas_failures)
     print(
-        f"Saved canvas details: {canvas_details_file} (failures: {len(canvas_failures)})"
+        f"[{name}] Saved canvas details: {canvas_details_file} "
+        f"(failures: {len(canvas_failures)})"
     )
 
-    # Catalog Items (Primary_Locations_Catalog)
-    print("Fetching catalog items for Primary_Locations_Catalog...")
-    # endpoint: /catalogs/{catalog_name}/items
-    catalog_name = "Primary_Locations_Catalog"
-    url = f"{rest_ep.rstrip('/')}/catalogs/{catalog_name}/items"
-
-    try:
-        cat_data = _request_with_backoff(session, url, headers=headers)
-        if isinstance(cat_data, dict):
-            cat_file = os.path.join(out_dir, f"catalog_items_{date_suffix}.json")
-            with open(cat_file, "w", encoding="utf-8") as f:
-                json.dump(cat_data, f, indent=2)
-            item_count = len(cat_data.get("items", []))
-            manifest["counts"]["catalog_items"] = item_count
-            print(f"Saved {item_count} items from catalog {catalog_name}")
-        else:
-            print(f"Warning: Unexpected response format for catalog {catalog_name}")
-    except Exception as e:
-        print(f"Failed to fetch catalog {catalog_name}: {e}")
-        manifest["failures"].append({"id": catalog_name, "error": str(e)})
+    # Catalog items, one file per configured catalog
+    for catalog_name in ws["catalogs"]:
+        print(f"[{name}] Fetching catalog items for {catalog_name}...")
+        # endpoint: /catalogs/{catalog_name}/items
+        url = f"{rest_ep.rstrip('/')}/catalogs/{catalog_name}/items"
+        try:
+            cat_data = _request_with_backoff(session, url, headers=headers)
+            if isinstance(cat_data, dict):
+                cat_file = os.path.join(
+                    out_dir, f"catalog_items_{catalog_name}_{date_suffix}.json"
+                )
+                _save_json(cat_data, cat_file)
+                item_count = len(cat_data.get("items", []))
+                manifest["counts"][f"catalog_items:{catalog_name}"] = item_count
+                print(f"[{name}] Saved {item_count} items from catalog {catalog_name}")
+            else:
+                print(
+                    f"[{name}] Warning: Unexpected response format for catalog "
+                    f"{catalog_name}"
+                )
+        except Exception as e:
+            print(f"[{name}] Failed to fetch catalog {catalog_name}: {e}")
+            manifest["failures"].append({"id": catalog_name, "error": str(e)})
 
     # manifest
     manifest_file = os.path.join(out_dir, f"manifest_{date_suffix}.json")
-    with open(manifest_file, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
-    print(f"Wrote manifest to {manifest_file}")
+    _save_json(manifest, manifest_file)
+    print(f"[{name}] Wrote manifest to {manifest_file}")
+    return manifest
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--env-file",
+        default=None,
+        help="Path to a .env file (defaults to <project>/.env if present)",
+    )
+    p.add_argument(
+        "--out-dir",
+        default=DEFAULT_OUT_DIR,
+        help="output directory for raw files (non-default workspaces use subdirs)",
+    )
+    p.add_argument(
+        "--date", default=None, help="date suffix (YYYYMMDD). Defaults to today"
+    )
+    p.add_argument(
+        "--concurrency",
+        default=8,
+        type=int,
+        help="concurrent workers for details fetch",
+    )
+    p.add_argument(
+        "--workspace",
+        action="append",
+        default=None,
+        help="only extract this workspace from workspaces.toml (repeatable)",
+    )
+    args = p.parse_args()
+
+    workspaces = load_workspaces()
+    if args.workspace:
+        unknown = set(args.workspace) - {ws["name"] for ws in workspaces}
+        if unknown:
+            print(f"Error: unknown workspace(s): {', '.join(sorted(unknown))}")
+            return 1
+        workspaces = [ws for ws in workspaces if ws["name"] in args.workspace]
+
+    _load_env(args.env_file, [ws["api_key_env"] for ws in workspaces])
+
+    missing = [
+        ws["api_key_env"] for ws in workspaces if not os.environ.get(ws["api_key_env"])
+    ]
+    if missing:
+        for key in missing:
+            print(f"Error: {key} environment variable is not set.")
+        print(
+            "Please set it in your environment or creates a .env file (if using python-dotenv)."
+        )
+        return 1
+
+    date_suffix = args.date or datetime.utcnow().strftime("%Y%m%d")
+    out_root = os.path.abspath(args.out_dir)
+
+    # Workspaces have separate keys and rate limits, so fetch them side by side.
+    with ThreadPoolExecutor(max_workers=len(workspaces)) as ex:
+        futures = [
+            ex.submit(extract_workspace, ws, out_root, date_suffix, args.concurrency)
+            for ws in workspaces
+        ]
+        for fut in futures:
+            fut.result()
 
     return 0
 
@@ -0,0 +1,629 @@
+"""Overview metrics, insights and charts, shared by the dashboard and the ETL.
+
+The dashboard's Overview page renders these live; write_static_bundle() runs the
+same functions once per refresh and writes the results to data/tables/static/
+so analytics.html can show the Overview without a Streamlit session.
+
+Usage:
+  python etl/overview.py   # rewrite the static bundle from data/tables
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABLES_DIR = os.path.join(BASE_DIR, "data", "tables")
+BUNDLE_DIR = os.path.join(TABLES_DIR, "static")
+
+ASSET_DATE_COLUMNS = ["last_active", "last_sent", "last_entry", "last_edited"]
+
+# Active = activity within ACTIVE_DAYS, on the asset type's own column (falling
+# back to last_active when the export lacks it).
+ACTIVE_DAYS = 30
+ACTIVE_DATE_COLUMNS = {"Campaign": "last_sent", "Canvas": "last_entry"}
+
+# Braze catalog limits.
+CATALOG_FIELD_LIMIT = 1000
+CATALOG_STORAGE_LIMIT_MIB = 2.0 * 1024.0
+
+# The all-time governance aggregates the ETL writes as agg_<name>.csv.
+BUNDLE_AGGREGATES = [
+    "field_asset_counts",
+    "field_usage_by_asset_type",
+    "ghost_fields",
+    "stale_assets",
+]
+
+
+def parse_asset_dates(assets):
+    """Parse the asset inventory's activity dates in place, as tz-naive UTC."""
+    # Normalize to tz-naive UTC so downstream comparisons/grouping work consistently.
+    for col in ASSET_DATE_COLUMNS:
+        if col in assets.columns:
+            assets[col] = pd.to_datetime(
+                assets[col], errors="coerce", utc=True
+            ).dt.tz_convert(None)
+    return assets
+
+
+def composition_storage_mib(overview):
+    """Braze catalog size in MiB and whether it was measured (vs. estimated)."""
+    measured = overview.get("braze_serialized_mib")
+    if measured is not None:
+        return float(measured or 0), True
+    return float(overview.get("est_braze_mib_method_a", 0) or 0), False
+
+
+def valid_field_counts(field_counts_df):
+    """Per-field counts of catalog-defined (non-ghost) fields, most referenced first."""
+    return field_counts_df[field_counts_df["is_risk"] == False]
+
+
+def calculate_governance_score(catalog_df, field_counts_df, ghost_fields_df):
+    """Calculate overall governance health score."""
+    if catalog_df.empty or field_counts_df.empty:
+        return 0, "No Data"
+
+    # Metrics for scoring
+    total_fields = len(catalog_df)
+    used_fields = len(valid_field_counts(field_counts_df))
+    ghost_fields = int(ghost_fields_df["occurrences"].sum())
+
+    # Calculate components
+    utilization_score = (used_fields / total_fields * 100) if total_fields > 0 else 0
+    ghost_penalty = min(ghost_fields * 5, 40)  # Max 40 point penalty
+
+    # Final score
+    score = max(0, min(100, utilization_score - ghost_penalty))
+
+    if score >= 85:
+        return score, "Excellent"
+    elif score >= 70:
+        return score, "Good"
+    elif score >= 50:
+        return score, "Fair"
+    else:
+        return score, "Critical"
+
+
+def generate_governance_insights(
+    catalog_df, field_counts_df, ghost_fields_df, stale_assets_df
+):
+    """Generate actionable governance insights."""
+    insights = []
+
+    if field_counts_df.empty:
+        return [
+            {
+                "type": "info",
+                "icon": "ℹ️",
+                "title": "No Reference Data",
+                "message": "No reference data available for analysis.",
+                "count": 0,
+            }
+        ]
+
+    # Ghost fields (critical)
+    if len(ghost_fields_df) > 0:
+        unique_ghosts = len(ghost_fields_df)
+        insights.append(
+            {
+                "type": "critical",
+                "icon": "🚨",
+                "title": "Ghost Fields Detected",
+                "message": f"{unique_ghosts} fields are referenced but not in catalog. This can cause runtime errors.",
+                "count": unique_ghosts,
+            }
+        )
+
+    # Catalog saturation
+    if not catalog_df.empty:
+        total_fields = len(catalog_df)
+        used_fields = len(valid_field_counts(field_counts_df))
+        saturation = (used_fields / total_fields * 100) if total_fields > 0 else 0
+
+        if saturation < 30:
+            insights.append(
+                {
+                    "type": "warning",
+                    "icon": "⚠️",
+                    "title": "Low Catalog Utilization",
+                    "message": f"Only {saturation:.0f}% of catalog fields are in use. Consider cleaning unused fields.",
+                    "count": total_fields - used_fields,
+                }
+            )
+        elif saturation > 85:
+            insights.append(
+                {
+                    "type": "success",
+                    "icon": "✅",
+                    "title": "High Catalog Utilization",
+                    "message": f"{saturation:.0f}% of catalog fields are actively used. Great efficiency!",
+                    "count": used_fields,
+                }
+            )
+
+    # High-impact fields
+    field_usage = valid_field_counts(field_counts_df)
+    if not field_usage.empty:
+        top_field = field_usage["field_name"].iloc[0]
+        top_count = int(field_usage["references"].iloc[0])
+        insights.append(
+            {
+                "type": "info",
+                "icon": "⭐",
+                "title": "Critical Dependency",
+                "message": f"Field '{top_field}' is used in {top_count} locations. Changes require careful review.",
+                "count": top_count,
+            }
+        )
+
+    # Stale assets
+    if len(stale_assets_df) > 0:
+        insights.append(
+            {
+                "type": "warning",
+                "icon": "⏰",
+                "title": "Stale Assets",
+                "message": f"{len(stale_assets_df)} assets haven't been active in 90+ days. Review for deprecation.",
+                "count": len(stale_assets_df),
+            }
+        )
+
+    return (
+        insights
+        if insights
+        else [
+            {
+                "type": "success",
+                "icon": "✅",
+                "title": "All Systems Operational",
+                "message": "No critical governance issues detected.",
+                "count": 0,
+            }
+        ]
+    )
+
+
+def create_field_usage_heatmap(usage_by_type_df):
+    """Create field usage heatmap by asset type."""
+    # Filter valid usage
+    valid = usage_by_type_df[usage_by_type_df["is_risk"] == False]
+
+    if valid.empty:
+        return None
+
+    # Pivot for heatmap
+    pivot = valid.pivot(
+        index="field_name", columns="asset_type", values="references"
+    ).fillna(0)
+
+    # Get top 20 fields by total usage
+    pivot["total"] = pivot.sum(axis=1)
+    pivot = pivot.nlargest(20, "total").drop("total", axis=1)
+
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=pivot.values,
+            x=pivot.columns,
+            y=pivot.index,
+            colorscale="Oranges",
+            text=pivot.values,
+            texttemplate="%{text}",
+            textfont={"size": 10},
+            colorbar=dict(title="References"),
+        )
+    )
+
+    fig.update_layout(
+        title="Field Usage Heatmap (Top 20 Fields)",
+        xaxis_title="Asset Type",
+        yaxis_title="Field Name",
+        height=600,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#0f172a"),
+    )
+
+    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
+    fig.update_yaxes(showgrid=False, zeroline=False)
+
+    return fig
+
+
+def create_usage_distribution_chart(field_counts_df):
+    """Create distribution chart showing field usage patterns."""
+    valid_fields = valid_field_counts(field_counts_df)
+    if valid_fields.empty:
+        return None
+
+    usage_counts = valid_fields[["field_name", "references"]].rename(
+        columns={"references": "count"}
+    )
+
+    # Categorize
+    def categorize(count):
+        if count >= 20:
+            return "Critical (20+)"
+        elif count >= 10:
+            return "High (10-19)"
+        elif count >= 5:
+            return "Medium (5-9)"
+        else:
+            return "Low (1-4)"
+
+    usage_counts["category"] = usage_counts["count"].apply(categorize)
+
+    category_counts = usage_counts["category"].value_counts().reset_index()
+    category_counts.columns = ["category", "fields"]
+
+    # Define order
+    order = ["Critical (20+)", "High (10-19)", "Medium (5-9)", "Low (1-4)"]
+    category_counts["category"] = pd.Categorical(
+        category_counts["category"], categories=order, ordered=True
+    )
+    category_counts = category_counts.sort_values("category")
+
+    color_map = {
+        "Critical (20+)": "#ef4444",
+        "High (10-19)": "#ff6a00",
+        "Medium (5-9)": "#f59e0b",
+        "Low (1-4)": "#10b981",
+    }
+
+    import plotly.express as px
+
+    fig = px.bar(
+        category_counts,
+        x="category",
+        y="fields",
+        color="category",
+        color_discrete_map=color_map,
+        title="Field Usage Distribution",
+        text="fields",
+    )
+
+    fig.update_traces(texttemplate="%{text}", textposition="outside")
+    fig.update_layout(
+        showlegend=False,
+        xaxis_title="Usage Category",
+        yaxis_title="Number of Fields",
+        height=400,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#0f172a"),
+    )
+
+    fig.update_xaxes(showgrid=False, zeroline=False)
+    fig.update_yaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
+
+    return fig
+
+
+def create_top_fields_chart(field_counts_df, top_n=15):
+    """Create horizontal bar chart of most-used fields."""
+    valid_fields = valid_field_counts(field_counts_df)
+    if valid_fields.empty:
+        return None
+
+    top_fields = valid_fields[["field_name", "references"]].head(top_n)
+
+    import plotly.express as px
+
+    fig = px.bar(
+        top_fields,
+        y="field_name",
+        x="references",
+        orientation="h",
+        title=f"Top {top_n} Most Referenced Fields",
+        color="references",
+        color_continuous_scale="Oranges",
+        text="references",
+    )
+
+    fig.update_traces(texttemplate="%{text}", textposition="outside")
+    fig.update_layout(
+        yaxis={"categoryorder": "total ascending"},
+        xaxis_title="Number of References",
+        yaxis_title="",
+        height=500,
+        showlegend=False,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#0f172a"),
+    )
+
+    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
+    fig.update_yaxes(showgrid=False, zeroline=False)
+
+    return fig
+
+
+def create_asset_timeline(timeline):
+    """Create timeline of asset activity from asset_activity_by_month()."""
+    if timeline.empty:
+        return None
+
+    import plotly.express as px
+
+    fig = px.line(
+        timeline,
+        x="month",
+        y="count",
+        color="asset_type",
+        title="Asset Activity Over Time",
+        markers=True,
+        color_discrete_map={"Campaign": "#ff6a00", "Canvas": "#1e293b"},
+    )
+
+    fig.update_layout(
+        xaxis_title="Month",
+        yaxis_title="Active Assets",
+        hovermode="x unified",
+        height=400,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#0f172a"),
+        legend=dict(title="Asset Type"),
+    )
+
+    fig.update_xaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
+    fig.update_yaxes(showgrid=True, gridcolor="#e2e8f0", zeroline=False)
+
+    return fig
+
+
+def count_active_assets(assets_df, asset_type, cutoff):
+    """Non-archived assets of `asset_type` active on or after `cutoff`."""
+    if assets_df.empty or "asset_type" not in assets_df.columns:
+        return 0
+    assets = assets_df[assets_df["asset_type"] == asset_type]
+    if "status" in assets.columns:
+        assets = assets[assets["status"] != "Archived"]
+    for col in [ACTIVE_DATE_COLUMNS[asset_type], "last_active"]:
+        if col in assets.columns:
+            # Dates are parsed by parse_asset_dates(); NaT never passes the cutoff.
+            return int((assets[col] >= cutoff).sum())
+    return 0
+
+
+def catalog_capacity(overview):
+    """Field and storage use as % of the Braze limits, and whether storage was measured."""
+    total_fields = float(overview.get("columns", 0) or 0)
+    field_pct = (
+        round((total_fields / CATALOG_FIELD_LIMIT) * 100.0) if total_fields else 0
+    )
+    braze_mib, measured = composition_storage_mib(overview)
+    storage_pct = (
+        round((braze_mib / CATALOG_STORAGE_LIMIT_MIB) * 100.0) if braze_mib else 0
+    )
+    return field_pct, storage_pct, measured
+
+
+def heaviest_field(composition):
+    """(field, MiB, measured) of the largest catalog field by storage.
+
+    Uses measured per-field bytes when the composition build produced them, the
+    estimated top weights otherwise; (None, None, False) without either.
+    """
+    field_bytes_df = composition.get("field_bytes")
+    if field_bytes_df is not None and not field_bytes_df.empty:
+        row = field_bytes_df.sort_values("serialized_mib", ascending=False).iloc[0]
+        return row.get("field_name") or None, float(row.get("serialized_mib")), True
+
+    weights_df = composition.get("weights")
+    if weights_df is None or weights_df.empty or "field_name" not in weights_df:
+        return None, None, False
+    df = weights_df.copy()
+    if "est_mib" in df.columns:
+        df["est_mib"] = pd.to_numeric(df["est_mib"], errors="coerce")
+        df = df.sort_values("est_mib", ascending=False)
+    row = df.iloc[0]
+    mib = None
+    if "est_mib" in df.columns and pd.notna(row.get("est_mib")):
+        mib = float(row.get("est_mib"))
+    return row.get("field_name") or None, mib, False
+
+
+def overview_metrics(
+    catalog_df, assets_df, field_counts_df, composition=None, now=None
+):
+    """The Overview page's headline numbers (None where the data is missing).
+
+    `composition` is the catalog composition artifacts dict (overview, weights,
+    field_bytes) or None; `now` (tz-naive UTC) defaults to the current time.
+    """
+    if now is None:
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    cutoff = now - pd.Timedelta(days=ACTIVE_DAYS)
+
+    metrics = {
+        "active_campaigns": count_active_assets(assets_df, "Campaign", cutoff),
+        "active_canvases": count_active_assets(assets_df, "Canvas", cutoff),
+        "utilization_pct": None,
+        "catalog_fields": len(catalog_df),
+        "field_capacity_pct": None,
+        "storage_capacity_pct": None,
+        "storage_measured": False,
+        "most_referenced_field": None,
+        "most_referenced_count": None,
+        "heaviest_field": None,
+        "heaviest_mib": None,
+        "heaviest_measured": False,
+    }
+
+    if not catalog_df.empty and not field_counts_df.empty:
+        used_fields = len(valid_field_counts(field_counts_df))
+        metrics["utilization_pct"] = used_fields / len(catalog_df) * 100
+
+    valid_fields = valid_field_counts(field_counts_df)
+    if not valid_fields.empty:
+        metrics["most_referenced_field"] = str(valid_fields["field_name"].iloc[0])
+        metrics["most_referenced_count"] = int(valid_fields["references"].iloc[0])
+
+    if composition is not None:
+        (
+            metrics["field_capacity_pct"],
+            metrics["storage_capacity_pct"],
+            metrics["storage_measured"],
+        ) = catalog_capacity(composition["overview"])
+        (
+            metrics["heaviest_field"],
+            metrics["heaviest_mib"],
+            metrics["heaviest_measured"],
+        ) = heaviest_field(composition)
+        if metrics["heaviest_field"] is not None:
+            metrics["heaviest_field"] = str(metrics["heaviest_field"])
+    return metrics
+
+
+def field_impact_table(usage_by_type_df, top_n=15):
+    """Distinct Campaigns/Canvases per catalog field, the `top_n` most used."""
+    valid_usage = usage_by_type_df[usage_by_type_df["is_risk"] == False]
+    if valid_usage.empty:
+        return pd.DataFrame(columns=["field_name", "Campaign", "Canvas", "Total"])
+
+    agg = (
+        valid_usage.pivot(index="field_name", columns="asset_type", values="assets")
+        .fillna(0)
+        .astype(int)
+    )
+    # Ensure columns exist
+    for col in ["Campaign", "Canvas"]:
+        if col not in agg.columns:
+            agg[col] = 0
+
+    agg = agg.reset_index()
+    agg["Total"] = agg["Campaign"] + agg["Canvas"]
+    agg = agg.sort_values("Total", ascending=False).head(top_n)
+    return agg[["field_name", "Campaign", "Canvas", "Total"]]
+
+
+# ============================================================================
+# STATIC BUNDLE
+# ============================================================================
+
+
+def load_composition(tables_dir=TABLES_DIR):
+    """The composition artifacts the Overview uses (None if not built yet)."""
+    overview_path = os.path.join(tables_dir, "catalog_composition_overview.json")
+    fill_path = os.path.join(tables_dir, "catalog_composition_fill_rates.csv")
+    if not os.path.exists(overview_path) or not os.path.exists(fill_path):
+        return None
+
+    with open(overview_path, "r", encoding="utf-8") as f:
+        composition = {"overview": json.load(f)}
+    for key, name in [
+        ("weights", "catalog_composition_top_weights_25.csv"),
+        ("field_bytes", "catalog_composition_field_bytes.csv"),
+    ]:
+        path = os.path.join(tables_dir, name)
+        composition[key] = pd.read_csv(path) if os.path.exists(path) else None
+    return composition
+
+
+def _write_json(path, payload, **kwargs):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(payload, f, ensure_ascii=True, **kwargs)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def write_static_bundle(tables_dir=TABLES_DIR, bundle_dir=BUNDLE_DIR):
+    """Write the all-time Overview to `bundle_dir` for analytics.html.
+
+    overview.json holds the metrics, insights and field impact rows;
+    figures.json the Plotly figures as JSON (for Plotly.newPlot). Both carry
+    refreshed_at_utc from refresh_meta.json so the page can tell which data
+    version it shows. Returns the overview payload, or None when the ETL
+    tables are missing.
+    """
+    aggregates = {}
+    for name in BUNDLE_AGGREGATES:
+        path = os.path.join(tables_dir, f"agg_{name}.csv")
+        if not os.path.exists(path):
+            print(f"Static bundle skipped: {path} not found (run the parse step).")
+            return None
+        aggregates[name] = pd.read_csv(path)
+
+    def read_table(name):
+        path = os.path.join(tables_dir, f"{name}.csv")
+        return pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+
+    catalog_df = read_table("catalog_schema")
+    assets_df = parse_asset_dates(read_table("asset_inventory"))
+    field_counts_df = aggregates["field_asset_counts"]
+    ghost_fields_df = aggregates["ghost_fields"]
+
+    refreshed_at_utc = None
+    try:
+        with open(os.path.join(tables_dir, "refresh_meta.json"), encoding="utf-8") as f:
+            refreshed_at_utc = json.load(f).get("refreshed_at_utc")
+    except (OSError, ValueError):
+        pass
+    generated_at_utc = (
+        datetime.now(timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+    metrics = overview_metrics(
+        catalog_df, assets_df, field_counts_df, load_composition(tables_dir)
+    )
+    metrics["total_assets"] = len(assets_df)
+    metrics["ghost_references"] = (
+        int(ghost_fields_df["occurrences"].sum()) if not field_counts_df.empty else None
+    )
+    impact = field_impact_table(aggregates["field_usage_by_asset_type"])
+    overview = {
+        "refreshed_at_utc": refreshed_at_utc,
+        "generated_at_utc": generated_at_utc,
+        "active_days": ACTIVE_DAYS,
+        "metrics": metrics,
+        "insights": generate_governance_insights(
+            catalog_df, field_counts_df, ghost_fields_df, aggregates["stale_assets"]
+        ),
+        "field_impact": json.loads(impact.to_json(orient="records")),
+    }
+
+    figures = {
+        "top_fields": create_top_fields_chart(field_counts_df, top_n=15),
+        "field_usage_heatmap": create_field_usage_heatmap(
+            aggregates["field_usage_by_asset_type"]
+        ),
+    }
+    figures = {
+        "refreshed_at_utc": refreshed_at_utc,
+        "figures": {
+            name: json.loads(fig.to_json()) if fig is not None else None
+            for name, fig in figures.items()
+        },
+    }
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    _write_json(
+        os.path.join(bundle_dir, "overview.json"), overview, sort_keys=True, indent=2
+    )
+    _write_json(
+        os.path.join(bundle_dir, "figures.json"), figures, separators=(",", ":")
+    )
+    return overview
+
+
+if __name__ == "__main__":
+    from partitions import configured_partitions, partition_label, tables_dir
+
+    # One bundle per partition, in <its tables dir>/static.
+    for workspace, catalog in configured_partitions():
+        partition_tables = tables_dir(workspace, catalog)
+        partition_bundle = os.path.join(partition_tables, "static")
+        if write_static_bundle(partition_tables, partition_bundle) is not None:
+            label = partition_label(workspace, catalog)
+            print(f"Static bundle for {label} written to {partition_bundle}")
@@ -3,14 +3,18 @@ import csv
 import os
 import re
 import hashlib
+import sqlite3
+import numpy as np
 import pandas as pd
 from datetime import datetime, timezone
 import glob
 
 # --- CONFIG ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Default partition; etl/partitions.py maps other workspaces/catalogs to subdirs.
 RAW_DIR = os.path.join(BASE_DIR, "data", "raw_snapshots")
 TABLES_DIR = os.path.join(BASE_DIR, "data", "tables")
+DEFAULT_CATALOG = "Primary_Locations_Catalog"
 
 # --- REGEX PATTERNS ---
 # 1. Direct Catalog Access: catalog_items['CatalogName'][index].fieldName
@@ -32,24 +36,42 @@ REGEX_ASSIGN_ITEMS = r"{%\s*assign\s+([a-zA-Z0-9_]+)\s*=\s*items"
 # 5. Variable Usage: var.field
 REGEX_VAR_ACCESS = r"\b([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)\b"
 
+# --- GOVERNANCE AGGREGATES ---
+# Referenced-but-undefined fields that are expected (not counted as ghosts).
+GHOST_EXEMPT_FIELDS = ["location_guid"]
+STALE_DAYS = 90
+
+# --- CONTENT SEARCH ---
+# SQLite FTS5 index over content_blocks.liquid_content (see write_content_index).
+CONTENT_INDEX = "content_index.sqlite"
+CONTENT_INDEX_COLUMNS = [
+    "block_id",
+    "asset_id",
+    "asset_name",
+    "asset_type",
+    "step_name",
+    "channel",
+    "location",
+]
+
 
 def get_hash(text):
     return hashlib.md5(str(text).encode("utf-8")).hexdigest()
 
 
-def ensure_tables_dir():
-    if not os.path.exists(TABLES_DIR):
-        os.makedirs(TABLES_DIR)
+def ensure_tables_dir(tables_dir=TABLES_DIR):
+    if not os.path.exists(tables_dir):
+        os.makedirs(tables_dir)
 
 
-def write_refresh_meta():
+def write_refresh_meta(tables_dir=TABLES_DIR):
     """Write a small metadata file used by the embedded HTML dashboard.
 
     This file is committed alongside the CSV tables so the dashboard can display
     the last refresh timestamp directly from the GitHub data source.
     """
 
-    ensure_tables_dir()
+    ensure_tables_dir(tables_dir)
     refreshed_at_utc = (
         datetime.now(timezone.utc)
         .replace(microsecond=0)
@@ -57,7 +79,7 @@ def write_refresh_meta():
         .replace("+00:00", "Z")
     )
 
-    path = os.path.join(TABLES_DIR, "refresh_meta.json")
+    path = os.path.join(tables_dir, "refresh_meta.json")
     tmp = path + ".tmp"
     with open(tmp, "w", encoding="utf-8", newline="\n") as f:
         json.dump(
@@ -71,26 +93,263 @@ def write_refresh_meta():
     os.replace(tmp, path)
 
 
-def get_latest_file(pattern):
-    files = glob.glob(os.path.join(RAW_DIR, pattern))
+def get_latest_file(pattern, raw_dir=RAW_DIR):
+    files = glob.glob(os.path.join(raw_dir, pattern))
     if not files:
         return None
     return max(files, key=os.path.getctime)
 
 
-def parse_catalog_schema():
-    """Reads local catalog JSON (items) and infers schema from keys"""
-    # Look for catalog_items_*.json (produced by fetch_braze.py)
-    schema_path = get_latest_file("catalog_items_*.json")
-
-    # Fallback to sample if no real data found
-    if not schema_path:
-        schema_path = os.path.join(RAW_DIR, "sample_catalogs.json")
-        if not os.path.exists(schema_path):
-            print(
-                "No catalog data found (checked catalog_items_*.json and sample_catalogs.json)."
+def _surrogate_keys(*columns):
+    """Shared int32 codes for id columns (-1 where missing), plus the id for each code."""
+    ids = pd.Index(
+        pd.concat([pd.Series(col, dtype=object) for col in columns]).dropna().unique()
+    )
+    return ids, [ids.get_indexer(col).astype(np.int32) for col in columns]
+
+
+def build_reference_facts(assets_df, blocks_df, refs_df):
+    """One row per field reference, joined to its block's asset and asset type.
+
+    Repeated strings are stored as categoricals, so the table stays compact and
+    views can filter it instead of re-joining refs -> blocks -> assets. The
+    joins themselves run on int32 surrogate keys (array lookups, no hashing of
+    32-character ids); the keys become the categorical codes of the output.
+    """
+    refs = refs_df.reindex(
+        columns=["block_id", "field_name", "is_risk", "context_snippet"]
+    )
+    blocks = blocks_df.reindex(columns=["block_id", "asset_id"]).drop_duplicates(
+        "block_id"
+    )
+    assets = assets_df.reindex(columns=["asset_id", "asset_type"]).drop_duplicates(
+        "asset_id"
+    )
+
+    block_ids, (ref_block, block_key) = _surrogate_keys(
+        refs["block_id"], blocks["block_id"]
+    )
+    asset_ids, (block_asset, asset_key) = _surrogate_keys(
+        blocks["asset_id"], assets["asset_id"]
+    )
+    asset_types = pd.Categorical(assets["asset_type"])
+
+    # Lookup arrays indexed by surrogate key (-1 = no block/asset/type).
+    asset_of_block = np.full(len(block_ids) + 1, -1, dtype=np.int32)
+    asset_of_block[block_key] = block_asset
+    type_of_asset = np.full(len(asset_ids) + 1, -1, dtype=np.int32)
+    type_of_asset[asset_key] = asset_types.codes
+    # Index -1 lands on the trailing sentinel, so missing keys stay -1.
+    asset_of_block[-1] = type_of_asset[-1] = -1
+    ref_asset = asset_of_block[ref_block]
+
+    return pd.DataFrame(
+        {
+            "block_id": pd.Categorical.from_codes(ref_block, block_ids),
+            "field_name": refs["field_name"].astype("category").values,
+            "is_risk": refs["is_risk"].astype(bool).values,
+            "context_snippet": refs["context_snippet"].astype("category").values,
+            "asset_id": pd.Categorical.from_codes(ref_asset, asset_ids),
+            "asset_type": pd.Categorical.from_codes(
+                type_of_asset[ref_asset], asset_types.categories
+            ),
+        }
+    )
+
+
+def _decategorize(df):
+    return df.astype({c: object for c in df.select_dtypes("category").columns})
+
+
+def aggregate_reference_facts(facts, assets_df, as_of=None):
+    """Pre-aggregates a build_reference_facts() table into small render-ready tables.
+
+    Asset-level counts only include assets in `assets_df`. Returns a dict of DataFrames:
+      field_asset_counts: references + distinct assets per field
+      field_usage_by_asset_type: references + distinct assets per field/asset type
+      ghost_fields: ghost fields (minus GHOST_EXEMPT_FIELDS) with affected assets
+      ghost_assets: assets referencing those ghost fields
+      stale_assets: assets with no activity in STALE_DAYS days as of `as_of`
+    """
+    if as_of is None:
+        as_of = pd.Timestamp.now()
+
+    assets = assets_df.reindex(
+        columns=["asset_id", "asset_name", "asset_type", "last_active"]
+    ).astype({"asset_id": object})
+    in_assets = facts[facts["asset_id"].isin(assets["asset_id"])]
+
+    field_counts = (
+        facts.groupby(["field_name", "is_risk"], observed=True)
+        .agg(
+            references=("block_id", "size"),
+            context_snippet=("context_snippet", "first"),
+        )
+        .join(
+            in_assets.groupby(["field_name", "is_risk"], observed=True)[
+                "asset_id"
+            ].nunique()
+        )
+        .rename(columns={"asset_id": "assets"})
+        .reset_index()
+    )
+    field_counts["assets"] = field_counts["assets"].fillna(0).astype(int)
+    field_counts = _decategorize(field_counts).sort_values(
+        ["references", "field_name"], ascending=[False, True], kind="mergesort"
+    )[["field_name", "is_risk", "references", "assets", "context_snippet"]]
+
+    by_type = _decategorize(
+        in_assets.groupby(["field_name", "is_risk", "asset_type"], observed=True)
+        .agg(references=("block_id", "size"), assets=("asset_id", "nunique"))
+        .reset_index()
+    ).sort_values(
+        ["references", "field_name"], ascending=[False, True], kind="mergesort"
+    )
+
+    ghosts = field_counts[
+        field_counts["is_risk"] & ~field_counts["field_name"].isin(GHOST_EXEMPT_FIELDS)
+    ].rename(columns={"references": "occurrences", "assets": "affected_assets"})
+    ghosts = ghosts[["field_name", "occurrences", "affected_assets", "context_snippet"]]
+
+    ghost_assets = (
+        _decategorize(
+            in_assets[in_assets["field_name"].isin(ghosts["field_name"])]
+            .groupby("asset_id", observed=True)
+            .agg(
+                ghost_fields=("field_name", "nunique"),
+                ghost_references=("field_name", "size"),
             )
-            return set()
+            .reset_index()
+        )
+        .merge(assets[["asset_id", "asset_name", "asset_type"]], on="asset_id")
+        .sort_values(["ghost_references", "asset_name"], ascending=[False, True])
+    )[["asset_id", "asset_name", "asset_type", "ghost_fields", "ghost_references"]]
+
+    last_active = pd.to_datetime(
+        assets["last_active"], errors="coerce", utc=True
+    ).dt.tz_convert(None)
+    stale = assets[last_active < as_of - pd.Timedelta(days=STALE_DAYS)][
+        ["asset_id", "asset_name", "asset_type", "last_active"]
+    ]
+
+    return {
+        "field_asset_counts": field_counts.reset_index(drop=True),
+        "field_usage_by_asset_type": by_type.reset_index(drop=True),
+        "ghost_fields": ghosts.reset_index(drop=True),
+        "ghost_assets": ghost_assets.reset_index(drop=True),
+        "stale_assets": stale.reset_index(drop=True),
+    }
+
+
+def build_governance_aggregates(assets_df, blocks_df, refs_df, as_of=None):
+    """Pre-aggregates field references so the dashboard only renders small tables."""
+    facts = build_reference_facts(assets_df, blocks_df, refs_df)
+    return aggregate_reference_facts(facts, assets_df, as_of=as_of)
+
+
+def write_governance_aggregates(assets_df, blocks_df, refs_df, tables_dir=TABLES_DIR):
+    """Writes build_governance_aggregates() as <tables_dir>/agg_<name>.csv."""
+    ensure_tables_dir(tables_dir)
+    aggregates = build_governance_aggregates(assets_df, blocks_df, refs_df)
+    for name, df in aggregates.items():
+        df.to_csv(os.path.join(tables_dir, f"agg_{name}.csv"), index=False)
+    return aggregates
+
+
+def write_content_index(assets_df, blocks_df, tables_dir=TABLES_DIR):
+    """Writes <tables_dir>/content_index.sqlite, a full-text index of Liquid bodies.
+
+    One FTS5 row per block with its asset and step metadata (stored, not
+    indexed). The trigram tokenizer makes any 3+ character substring
+    searchable, so field names match inside `items[0].field` like a grep would.
+    """
+    ensure_tables_dir(tables_dir)
+    # Missing tables come in as empty frames; keep join keys as strings.
+    blocks = (
+        blocks_df.reindex(
+            columns=[
+                "liquid_content",
+                "block_id",
+                "asset_id",
+                "step_name",
+                "channel",
+                "location",
+            ]
+        )
+        .astype({"asset_id": object})
+        .dropna(subset=["liquid_content"])
+        .drop_duplicates("block_id")
+    )
+    assets = (
+        assets_df.reindex(columns=["asset_id", "asset_name", "asset_type"])
+        .astype({"asset_id": object})
+        .drop_duplicates("asset_id")
+    )
+    rows = blocks.merge(assets, on="asset_id", how="left")
+    rows = rows[["liquid_content"] + CONTENT_INDEX_COLUMNS].astype(object)
+    rows = rows.where(rows.notna(), None)
+
+    path = os.path.join(tables_dir, CONTENT_INDEX)
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp)
+    try:
+        unindexed = ", ".join(f"{col} UNINDEXED" for col in CONTENT_INDEX_COLUMNS)
+        con.execute(
+            f"CREATE VIRTUAL TABLE blocks USING fts5("
+            f"liquid_content, {unindexed}, tokenize='trigram')"
+        )
+        placeholders = ", ".join("?" * len(rows.columns))
+        con.executemany(
+            f"INSERT INTO blocks VALUES ({placeholders})",
+            rows.itertuples(index=False, name=None),
+        )
+        con.execute("INSERT INTO blocks(blocks) VALUES ('optimize')")
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def catalog_items_file(catalog=DEFAULT_CATALOG, raw_dir=RAW_DIR):
+    """Newest catalog items extract for `catalog` (sample_catalogs.json if none)."""
+    # Look for catalog_items_<catalog>_<date>.json (produced by extract_braze.py);
+    # older extracts of the default catalog are catalog_items_<date>.json. The
+    # digit keeps "Menu" from matching catalog_items_Menu_Items_<date>.json.
+    path = get_latest_file(f"catalog_items_{glob.escape(catalog)}_[0-9]*.json", raw_dir)
+    if not path and catalog == DEFAULT_CATALOG:
+        path = get_latest_file("catalog_items_[0-9]*.json", raw_dir)
+    return path or os.path.join(raw_dir, "sample_catalogs.json")
+
+
+def campaigns_file(raw_dir=RAW_DIR):
+    """Newest campaign details extract (sample_campaigns.json if none)."""
+    path = get_latest_file("campaign_details_*.json", raw_dir)
+    return path or os.path.join(raw_dir, "sample_campaigns.json")
+
+
+def raw_inputs(catalog=DEFAULT_CATALOG, raw_dir=RAW_DIR):
+    """The raw files parsing `catalog` reads (existing ones only)."""
+    paths = [
+        catalog_items_file(catalog, raw_dir),
+        campaigns_file(raw_dir),
+        get_latest_file("canvas_details_*.json", raw_dir),
+    ]
+    return [p for p in paths if p and os.path.exists(p)]
+
+
+def parse_catalog_schema(
+    catalog=DEFAULT_CATALOG, raw_dir=RAW_DIR, tables_dir=TABLES_DIR
+):
+    """Reads local catalog JSON (items) and infers schema from keys"""
+    schema_path = catalog_items_file(catalog, raw_dir)
+    if not os.path.exists(schema_path):
+        print(
+            "No catalog data found (checked catalog_items_*.json and sample_catalogs.json)."
+        )
+        return set()
 
     print(f"Reading catalog data from: {os.path.basename(schema_path)}")
 
@@ -120,21 +379,33 @@ def parse_catalog_schema():
         )
 
     df = pd.DataFrame(rows)
-    df.to_csv(os.path.join(TABLES_DIR, "catalog_schema.csv"), index=False)
+    df.to_csv(os.path.join(tables_dir, "catalog_schema.csv"), index=False)
     print(f"Parsed {len(df)} catalog fields.")
     return known_fields
 
 
-def parse_assets(known_fields):
-    """Parses campaigns/canvases for liquid and references"""
+def parse_assets(
+    known_fields,
+    catalog=DEFAULT_CATALOG,
+    raw_dir=RAW_DIR,
+    tables_dir=TABLES_DIR,
+    scope_where_lookups=False,
+    write_derived=True,
+):
+    """Parses campaigns/canvases for liquid and references to `catalog`.
+
+    `where:` lookups name no catalog; with scope_where_lookups (the workspace
+    has several catalogs) they only count in blocks that mention `catalog`.
+    Returns (assets_df, blocks_df, refs_df), or None when there is nothing to
+    parse. write_derived=False leaves the agg_*.csv tables and the content
+    index to the caller (etl/pipeline.py builds them as their own stage).
+    """
 
     # 1. Campaigns
-    camp_path = get_latest_file("campaign_details_*.json")
-    if not camp_path:
-        camp_path = os.path.join(RAW_DIR, "sample_campaigns.json")
+    camp_path = campaigns_file(raw_dir)
 
     # 2. Canvases
-    canvas_path = get_latest_file("canvas_details_*.json")
+    canvas_path = get_latest_file("canvas_details_*.json", raw_dir)
     # If sample_campaigns contains mixed data (as in my mock), we handled it.
     # But usually real exports are separate.
 
@@ -162,7 +433,7 @@ def parse_assets(known_fields):
 
     if not assets_to_process:
         print("No assets found to process.")
-        return
+        return None
 
     asset_rows = []
     block_rows = []
@@ -234,14 +505,14 @@ def parse_assets(known_fields):
 
             # Strategy: Linear Scan for Context
             # We track which variable maps to which catalog within this block
-            # Map: { "items": "Primary_Locations_Catalog", "my_item": "Primary_Locations_Catalog" }
+            # Map: { "items": catalog, "my_item": catalog }
             var_catalog_map = {}
 
             # Identify catalog blocks first (naive scope: assuming one main catalog per block for now, or last seen)
             # Find all catalog declarations
             for match in re.finditer(REGEX_CATALOG_BLOCK, text):
                 cat_name = match.group(1)
-                if cat_name == "Primary_Locations_Catalog":
+                if cat_name == catalog:
                     var_catalog_map["items"] = cat_name  # 'items' is the default
 
             # Find assignments (aliases)
@@ -255,7 +526,7 @@ def parse_assets(known_fields):
             # Check A: Direct Access (Old Regex)
             for match in re.finditer(REGEX_DIRECT_ACCESS, text):
                 catalog_name, field_name = match.groups()
-                if catalog_name == "Primary_Locations_Catalog":
+                if catalog_name == catalog:
                     ref_rows.append(
                         {
                             "ref_id": get_hash(f"{block_id}_{field_name}"),
@@ -268,7 +539,12 @@ def parse_assets(known_fields):
                     )
 
             # Check B: 'Where' Lookups
-            for match in re.finditer(REGEX_WHERE_LOOKUP, text):
+            where_matches = (
+                re.finditer(REGEX_WHERE_LOOKUP, text)
+                if not scope_where_lookups or catalog in text
+                else ()
+            )
+            for match in where_matches:
                 field_name = match.group(1)
                 ref_rows.append(
                     {
@@ -350,31 +626,60 @@ def parse_assets(known_fields):
                                     )
 
     # Write Outputs
-    pd.DataFrame(asset_rows).to_csv(
-        os.path.join(TABLES_DIR, "asset_inventory.csv"), index=False
-    )
-    pd.DataFrame(block_rows).to_csv(
-        os.path.join(TABLES_DIR, "content_blocks.csv"), index=False
-    )
-    pd.DataFrame(ref_rows).to_csv(
-        os.path.join(TABLES_DIR, "field_references.csv"), index=False
-    )
+    assets_df = pd.DataFrame(asset_rows)
+    blocks_df = pd.DataFrame(block_rows)
+    refs_df = pd.DataFrame(ref_rows)
+    assets_df.to_csv(os.path.join(tables_dir, "asset_inventory.csv"), index=False)
+    blocks_df.to_csv(os.path.join(tables_dir, "content_blocks.csv"), index=False)
+    refs_df.to_csv(os.path.join(tables_dir, "field_references.csv"), index=False)
+    if write_derived:
+        write_governance_aggregates(assets_df, blocks_df, refs_df, tables_dir)
+        write_content_index(assets_df, blocks_df, tables_dir)
 
     # Create empty dependencies if not exists
-    if not os.path.exists(os.path.join(TABLES_DIR, "dependencies.csv")):
+    if not os.path.exists(os.path.join(tables_dir, "dependencies.csv")):
         pd.DataFrame(
             {"source_asset_id": [], "target_asset_id": [], "dependency_type": []}
-        ).to_csv(os.path.join(TABLES_DIR, "dependencies.csv"), index=False)
+        ).to_csv(os.path.join(tables_dir, "dependencies.csv"), index=False)
 
     print(f"Processed {len(assets_to_process)} assets.")
     print(f"Extracted {len(block_rows)} liquid blocks.")
     print(f"Found {len(ref_rows)} field references.")
+    return assets_df, blocks_df, refs_df
+
+
+def parse_partition(workspace, catalog, raw_dir, tables_dir, scope_where_lookups):
+    """Parse one workspace/catalog partition into its tables directory."""
+    ensure_tables_dir(tables_dir)
+    fields = parse_catalog_schema(catalog, raw_dir, tables_dir)
+    parse_assets(fields, catalog, raw_dir, tables_dir, scope_where_lookups)
+    write_refresh_meta(tables_dir)
+    return workspace, catalog
 
 
 if __name__ == "__main__":
-    ensure_tables_dir()
+    from concurrent.futures import ProcessPoolExecutor
+
+    from partitions import load_workspaces, raw_dir, tables_dir
+
     print("Starting Local ETL...")
-    fields = parse_catalog_schema()
-    parse_assets(fields)
-    write_refresh_meta()
+    workspaces = load_workspaces()
+    jobs = [
+        (
+            ws["name"],
+            catalog,
+            raw_dir(ws["name"]),
+            tables_dir(ws["name"], catalog),
+            len(ws["catalogs"]) > 1,
+        )
+        for ws in workspaces
+        for catalog in ws["catalogs"]
+    ]
+    if len(jobs) == 1:
+        parse_partition(*jobs[0])
+    else:
+        # Partitions are independent (own tables dir); parse them in parallel.
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+            for workspace, catalog in ex.map(parse_partition, *zip(*jobs)):
+                print(f"Parsed partition {workspace} / {catalog}")
     print("Done.")
@@ -0,0 +1,146 @@
+"""Workspace/catalog partitions of the pipeline.
+
+A partition is one catalog in one Braze workspace (API key + REST endpoint).
+Partitions are configured in workspaces.toml at the project root:
+
+    [workspaces.us]
+    api_key_env = "BRAZE_API_KEY_US"    # env var holding the workspace's key
+    rest_endpoint = "https://rest.iad-05.braze.com"
+    catalogs = ["Primary_Locations_Catalog", "Menu_Items"]
+
+Without that file there is one partition: the "default" workspace
+(BRAZE_API_KEY / BRAZE_REST_ENDPOINT) with Primary_Locations_Catalog.
+
+The default partition keeps the flat data/raw_snapshots, data/tables and
+data/latest_catalog layout, so single-catalog setups and the committed tables
+keep working. Every other partition gets its own directories:
+data/raw_snapshots/<workspace>/ (snapshots are per workspace) and
+data/tables/<workspace>/<catalog>/, data/latest_catalog/<workspace>/<catalog>/.
+"""
+
+import os
+import tomllib
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKSPACES_FILE = os.path.join(BASE_DIR, "workspaces.toml")
+RAW_ROOT = os.path.join(BASE_DIR, "data", "raw_snapshots")
+TABLES_ROOT = os.path.join(BASE_DIR, "data", "tables")
+LATEST_CATALOG_ROOT = os.path.join(BASE_DIR, "data", "latest_catalog")
+
+DEFAULT_WORKSPACE = "default"
+DEFAULT_CATALOG = "Primary_Locations_Catalog"
+DEFAULT_REST_ENDPOINT = "https://rest.iad-05.braze.com"
+
+# Subdirectories of data/tables that are not workspaces: the static Overview
+# bundle and catalog composition --sample previews.
+RESERVED_NAMES = {"static", "preview"}
+
+# A data/tables directory holds a partition when it has one of these.
+PARTITION_MARKERS = ["catalog_schema.csv", "asset_inventory.csv"]
+
+
+def load_workspaces(path=WORKSPACES_FILE):
+    """Configured workspaces as dicts (name, api_key_env, rest_endpoint, catalogs)."""
+    if not os.path.exists(path):
+        return [
+            {
+                "name": DEFAULT_WORKSPACE,
+                "api_key_env": "BRAZE_API_KEY",
+                "rest_endpoint": None,
+                "catalogs": [DEFAULT_CATALOG],
+            }
+        ]
+
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    workspaces = []
+    for name, ws in config.get("workspaces", {}).items():
+        if os.sep in name or "/" in name:
+            raise ValueError(f"{path}: workspace name {name!r} must not contain '/'")
+        if name in RESERVED_NAMES:
+            raise ValueError(f"{path}: workspace name {name!r} is reserved")
+        catalogs = list(ws.get("catalogs", [DEFAULT_CATALOG]))
+        for catalog in catalogs:
+            if os.sep in catalog or "/" in catalog:
+                raise ValueError(
+                    f"{path}: catalog name {catalog!r} must not contain '/'"
+                )
+        workspaces.append(
+            {
+                "name": name,
+                "api_key_env": ws.get("api_key_env", "BRAZE_API_KEY"),
+                "rest_endpoint": ws.get("rest_endpoint"),
+                "catalogs": catalogs,
+            }
+        )
+    if not workspaces:
+        raise ValueError(f"{path} defines no [workspaces.<name>] tables")
+    return workspaces
+
+
+def rest_endpoint(workspace):
+    """The workspace's REST endpoint (BRAZE_REST_ENDPOINT or the default if unset)."""
+    return workspace["rest_endpoint"] or os.environ.get(
+        "BRAZE_REST_ENDPOINT", DEFAULT_REST_ENDPOINT
+    )
+
+
+def configured_partitions(workspaces=None):
+    """(workspace, catalog) pairs in configuration order."""
+    if workspaces is None:
+        workspaces = load_workspaces()
+    return [(ws["name"], catalog) for ws in workspaces for catalog in ws["catalogs"]]
+
+
+def is_default(workspace, catalog=DEFAULT_CATALOG):
+    return workspace == DEFAULT_WORKSPACE and catalog == DEFAULT_CATALOG
+
+
+def raw_dir(workspace, root=RAW_ROOT):
+    """Raw snapshot directory of a workspace (shared by its catalogs)."""
+    return root if workspace == DEFAULT_WORKSPACE else os.path.join(root, workspace)
+
+
+def tables_dir(workspace, catalog, root=TABLES_ROOT):
+    """data/tables directory of a partition."""
+    if is_default(workspace, catalog):
+        return root
+    return os.path.join(root, workspace, catalog)
+
+
+def latest_catalog_dir(workspace, catalog, root=LATEST_CATALOG_ROOT):
+    """Where the partition's catalog CSV exports are cached for composition."""
+    if is_default(workspace, catalog):
+        return root
+    return os.path.join(root, workspace, catalog)
+
+
+def partition_label(workspace, catalog):
+    return f"{workspace} / {catalog}"
+
+
+def discover_partitions(root=TABLES_ROOT):
+    """(workspace, catalog) pairs with tables on disk, default partition first.
+
+    Only looks at directory names and marker files, so it is cheap enough to
+    run on every dashboard rerun.
+    """
+
+    def has_tables(path):
+        return any(os.path.isfile(os.path.join(path, m)) for m in PARTITION_MARKERS)
+
+    found = []
+    if has_tables(root):
+        found.append((DEFAULT_WORKSPACE, DEFAULT_CATALOG))
+    try:
+        workspaces = [e for e in os.scandir(root) if e.is_dir()]
+    except FileNotFoundError:
+        return found
+    for ws in sorted(workspaces, key=lambda e: e.name):
+        if ws.name in RESERVED_NAMES:
+            continue
+        catalogs = [e for e in os.scandir(ws.path) if e.is_dir()]
+        for cat in sorted(catalogs, key=lambda e: e.name):
+            if has_tables(cat.path) and (ws.name, cat.name) not in found:
+                found.append((ws.name, cat.name))
+    return found
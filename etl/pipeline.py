@@ -0,0 +1,440 @@
+"""In-process ETL pipeline: a DAG of stages run in one interpreter.
+
+Per workspace/catalog partition (see partitions.py):
+
+    extract (per workspace) -> parse -> aggregates -> publish
+    composition --------------------------------------^
+
+Stages whose dependencies are done run concurrently on a thread pool, so
+composition overlaps extract and parse, and partitions overlap each other.
+Parsed frames are handed to the aggregates stage in memory.
+
+Every stage records the SHA-256 of its input files and of the files it wrote in
+data/.pipeline_state.json. A later run skips a stage whose inputs are unchanged
+and whose outputs are still on disk as written; the stage's own source file
+counts as an input, so editing the code reruns it. Extract has no file inputs
+and always runs (unless disabled); a failed extract falls back to the existing
+raw snapshots, as run_etl.py always did.
+
+Publish writes refresh_meta.json and the static Overview bundle last, so the
+dashboard's refresh poll only fires once every table of a partition is in place
+and not at all when nothing changed.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import pandas as pd
+
+import overview
+import parse_liquid
+import partitions
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_FILE = os.path.join(BASE_DIR, "data", ".pipeline_state.json")
+STATE_VERSION = 1
+SCRIPTS_DIR = os.path.join(BASE_DIR, "scripts")
+COMPOSITION_SCRIPT = os.path.join(SCRIPTS_DIR, "build_catalog_composition.py")
+
+# Tables the parse stage writes (aggregates reads the first three back when
+# parse was skipped).
+PARSED_TABLES = [
+    "asset_inventory.csv",
+    "content_blocks.csv",
+    "field_references.csv",
+    "catalog_schema.csv",
+    "dependencies.csv",
+]
+
+
+def _rel(path):
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, "/")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    if state.get("version") != STATE_VERSION:
+        state = {"version": STATE_VERSION, "stages": {}, "digests": {}}
+    return state
+
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+_DIGEST_LOCK = threading.Lock()
+
+
+def file_digest(path, cache):
+    """SHA-256 of `path` (None if missing), reused while size and mtime match.
+
+    `cache` maps project-relative paths to [size, mtime_ns, sha256]; it lives
+    in the state file so unchanged files are not re-read on the next run.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = _rel(path)
+    with _DIGEST_LOCK:
+        cached = cache.get(key)
+    if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return cached[2]
+    digest = _sha256(path)
+    with _DIGEST_LOCK:
+        cache[key] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+def file_digests(paths, cache):
+    return {_rel(p): file_digest(p, cache) for p in sorted(set(paths))}
+
+
+# --- STAGES ---
+# A stage is a dict: name, deps (stage names), inputs (callable taking its
+# deps' values and returning file paths, or None to always run), run (callable
+# taking the same values, returning (output paths, value)) and optional
+# (downstream stages run even if it fails).
+
+
+def _extract_stage(ws, date_suffix, concurrency, required):
+    def run(values):
+        from extract_braze import extract_workspace
+
+        key = ws["api_key_env"]
+        if not os.environ.get(key):
+            raise RuntimeError(f"{key} is not set")
+        manifest = extract_workspace(ws, partitions.RAW_ROOT, date_suffix, concurrency)
+        out_dir = partitions.raw_dir(ws["name"])
+        return glob.glob(os.path.join(out_dir, f"*_{date_suffix}.json")), manifest
+
+    return {
+        "name": f"extract:{ws['name']}",
+        "deps": [],
+        "inputs": None,
+        "run": run,
+        "optional": not required,
+    }
+
+
+def _parse_stage(ws, catalog, deps):
+    raw = partitions.raw_dir(ws["name"])
+    tables = partitions.tables_dir(ws["name"], catalog)
+    scope_where_lookups = len(ws["catalogs"]) > 1
+
+    def inputs(values):
+        return parse_liquid.raw_inputs(catalog, raw) + [parse_liquid.__file__]
+
+    def run(values):
+        parse_liquid.ensure_tables_dir(tables)
+        fields = parse_liquid.parse_catalog_schema(catalog, raw, tables)
+        frames = parse_liquid.parse_assets(
+            fields, catalog, raw, tables, scope_where_lookups, write_derived=False
+        )
+        outputs = [os.path.join(tables, name) for name in PARSED_TABLES]
+        return [p for p in outputs if os.path.exists(p)], frames
+
+    return {
+        "name": f"parse:{ws['name']}/{catalog}",
+        "deps": deps,
+        "inputs": inputs,
+        "run": run,
+        "optional": False,
+    }
+
+
+def _read_parsed_table(path):
+    try:
+        return pd.read_csv(path)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return pd.DataFrame()
+
+
+def _aggregates_stage(workspace, catalog, parse_name):
+    tables = partitions.tables_dir(workspace, catalog)
+    sources = [os.path.join(tables, name) for name in PARSED_TABLES[:3]]
+
+    def inputs(values):
+        return [p for p in sources if os.path.exists(p)] + [parse_liquid.__file__]
+
+    def run(values):
+        frames = values.get(parse_name)
+        if frames is None:
+            # parse was skipped (or found no assets): use what it last wrote.
+            if not os.path.exists(sources[0]):
+                print(f"{workspace}/{catalog}: no asset inventory to aggregate.")
+                return [], None
+            frames = [_read_parsed_table(p) for p in sources]
+        assets_df, blocks_df, refs_df = frames
+        parse_liquid.write_governance_aggregates(assets_df, blocks_df, refs_df, tables)
+        parse_liquid.write_content_index(assets_df, blocks_df, tables)
+        outputs = glob.glob(os.path.join(tables, "agg_*.csv"))
+        outputs.append(os.path.join(tables, parse_liquid.CONTENT_INDEX))
+        return outputs, None
+
+    return {
+        "name": f"aggregates:{workspace}/{catalog}",
+        "deps": [parse_name],
+        "inputs": inputs,
+        "run": run,
+        "optional": False,
+    }
+
+
+def _composition_stage(workspace, catalog, incremental):
+    tables = partitions.tables_dir(workspace, catalog)
+    catalog_dir = partitions.latest_catalog_dir(workspace, catalog)
+
+    def export(values):
+        # An upstream export stage (see refresh_and_publish.py) may hand over
+        # the CSV it produced (a str value); otherwise use the newest cached export.
+        handed_over = [v for v in values.values() if isinstance(v, str)]
+        return handed_over[0] if handed_over else _latest_export(catalog_dir)
+
+    def inputs(values):
+        input_csv = export(values)
+        return [input_csv, COMPOSITION_SCRIPT] if input_csv else [COMPOSITION_SCRIPT]
+
+    def run(values):
+        input_csv = export(values)
+        if input_csv is None:
+            print(f"{workspace}/{catalog}: no catalog export in {catalog_dir}.")
+            return [], None
+        if SCRIPTS_DIR not in sys.path:
+            sys.path.insert(0, SCRIPTS_DIR)
+        from build_catalog_composition import build_catalog_composition
+
+        build_catalog_composition(
+            input_csv=input_csv,
+            output_dir=tables,
+            state_dir=os.path.join(catalog_dir, ".composition_state"),
+            incremental=incremental,
+            cache_dir=os.path.join(catalog_dir, ".columnar"),
+        )
+        return glob.glob(os.path.join(tables, "catalog_composition_*")), None
+
+    return {
+        "name": f"composition:{workspace}/{catalog}",
+        "deps": [],
+        "inputs": inputs,
+        "run": run,
+        "optional": False,
+    }
+
+
+def _publish_stage(workspace, catalog, deps, state):
+    tables = partitions.tables_dir(workspace, catalog)
+    bundle_dir = os.path.join(tables, "static")
+
+    def inputs(values):
+        # Whatever the upstream stages wrote, as recorded after they finished.
+        paths = [overview.__file__]
+        for dep in deps:
+            record = state["stages"].get(dep, {})
+            paths += [os.path.join(BASE_DIR, p) for p in record.get("outputs", {})]
+        return paths
+
+    def run(values):
+        parse_liquid.write_refresh_meta(tables)
+        outputs = [os.path.join(tables, "refresh_meta.json")]
+        if overview.write_static_bundle(tables, bundle_dir) is not None:
+            outputs += glob.glob(os.path.join(bundle_dir, "*.json"))
+        return outputs, None
+
+    return {
+        "name": f"publish:{workspace}/{catalog}",
+        "deps": deps,
+        "inputs": inputs,
+        "run": run,
+        "optional": False,
+    }
+
+
+def _latest_export(catalog_dir):
+    try:
+        exports = [
+            e.path
+            for e in os.scandir(catalog_dir)
+            if e.is_file() and e.name.lower().endswith(".csv")
+        ]
+    except FileNotFoundError:
+        return None
+    return max(exports, key=os.path.getmtime, default=None)
+
+
+def build_stages(
+    state,
+    workspaces=None,
+    extract=True,
+    composition=True,
+    incremental=True,
+    date_suffix=None,
+    concurrency=8,
+    extract_required=False,
+):
+    """The pipeline's stages for `workspaces` (all configured ones by default).
+
+    With extract_required, a failed extract blocks its workspace's stages
+    instead of falling back to the existing raw snapshots.
+    """
+    if workspaces is None:
+        workspaces = partitions.load_workspaces()
+    date_suffix = date_suffix or datetime.now(timezone.utc).strftime("%Y%m%d")
+
+    stages = []
+    for ws in workspaces:
+        extract_deps = []
+        if extract:
+            stages.append(
+                _extract_stage(ws, date_suffix, concurrency, extract_required)
+            )
+            extract_deps = [stages[-1]["name"]]
+        for catalog in ws["catalogs"]:
+            parse = _parse_stage(ws, catalog, extract_deps)
+            aggregates = _aggregates_stage(ws["name"], catalog, parse["name"])
+            stages += [parse, aggregates]
+            publish_deps = [aggregates["name"]]
+
+            if composition:
+                stages.append(_composition_stage(ws["name"], catalog, incremental))
+                publish_deps.append(stages[-1]["name"])
+            stages.append(_publish_stage(ws["name"], catalog, publish_deps, state))
+    return stages
+
+
+def _run_stage(stage, values, state, force):
+    """Run (or skip) one stage; returns (status, value, error)."""
+    cache = state["digests"]
+    record = state["stages"].get(stage["name"])
+    inputs = None
+    if stage["inputs"] is not None:
+        inputs = file_digests(stage["inputs"](values), cache)
+        outputs_intact = record is not None and all(
+            file_digest(os.path.join(BASE_DIR, p), cache) == d
+            for p, d in record["outputs"].items()
+        )
+        # Inputs compare by content: a re-extract under a new date suffix
+        # that returns the same data does not rerun parse.
+        unchanged = record is not None and sorted(
+            record["inputs"].values(), key=str
+        ) == sorted(inputs.values(), key=str)
+        if not force and outputs_intact and unchanged:
+            return "skipped", None, None
+
+    try:
+        outputs, value = stage["run"](values)
+    except Exception as e:
+        state["stages"].pop(stage["name"], None)
+        return "failed", None, f"{type(e).__name__}: {e}"
+
+    state["stages"][stage["name"]] = {
+        "inputs": inputs or {},
+        "outputs": file_digests(outputs, cache),
+        "finished_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    return "ran", value, None
+
+
+def run_pipeline(stages, state, force=False, max_workers=None):
+    """Run `stages` as a DAG; returns one result dict per stage (in finish order).
+
+    Results: stage, status (ran / skipped / failed / blocked), seconds, error,
+    optional. A stage is blocked when a non-optional dependency failed or was blocked.
+    """
+    by_name = {stage["name"]: stage for stage in stages}
+    values, status, results = {}, {}, []
+    pending = list(stages)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while pending or running:
+            for stage in list(pending):
+                deps = stage["deps"]
+                if any(dep not in status for dep in deps):
+                    continue
+                pending.remove(stage)
+                failed = [
+                    dep
+                    for dep in deps
+                    if status[dep] == "blocked"
+                    or (status[dep] == "failed" and not by_name[dep]["optional"])
+                ]
+                if failed:
+                    status[stage["name"]] = "blocked"
+                    results.append(
+                        {
+                            "stage": stage["name"],
+                            "status": "blocked",
+                            "seconds": 0.0,
+                            "error": f"{failed[0]} did not finish",
+                            "optional": stage["optional"],
+                        }
+                    )
+                    continue
+                print(f"--> {stage['name']}")
+                dep_values = {dep: values[dep] for dep in deps if dep in values}
+                fut = ex.submit(_run_stage, stage, dep_values, state, force)
+                running[fut] = (stage["name"], time.perf_counter())
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name, started = running.pop(fut)
+                stage_status, value, error = fut.result()
+                status[name] = stage_status
+                if value is not None:
+                    values[name] = value
+                seconds = time.perf_counter() - started
+                results.append(
+                    {
+                        "stage": name,
+                        "status": stage_status,
+                        "seconds": seconds,
+                        "error": error,
+                        "optional": by_name[name]["optional"],
+                    }
+                )
+                note = f": {error}" if error else ""
+                print(f"<-- {name} {stage_status} ({seconds:.1f}s){note}")
+    return results
+
+
+def format_results(results):
+    """Per-stage status and timing as a plain-text table."""
+    width = max([len(r["stage"]) for r in results] + [5])
+    lines = [f"{'Stage':<{width}}  {'Status':<8}  {'Seconds':>8}"]
+    for r in results:
+        lines.append(f"{r['stage']:<{width}}  {r['status']:<8}  {r['seconds']:>8.1f}")
+    return "\n".join(lines)
+
+
+def pipeline_failed(results):
+    """True when a required stage failed or was blocked."""
+    return any(
+        r["status"] == "blocked" or (r["status"] == "failed" and not r["optional"])
+        for r in results
+    )
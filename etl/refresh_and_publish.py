@@ -0,0 +1,284 @@
+"""Refresh the dashboard data and publish it (commit + push data/tables only).
+
+Cross-platform replacement for refresh_and_publish.bat:
+
+1. extract the Braze snapshots and parse them into data/tables,
+2. export Primary_Locations_Catalog with the external exporter, unless
+   data/latest_catalog already has an export written today (US Pacific date),
+3. build the catalog composition, aggregates and static Overview bundle,
+4. commit (and push) only data/tables, leaving other local changes alone.
+
+Steps 1-3 are etl/pipeline.py stages: the catalog export runs alongside
+extract and parse, unchanged inputs are skipped, and every stage's time is
+reported. Any failure stops the run before the commit.
+
+Usage:
+  python etl/refresh_and_publish.py [--env-file PATH] [--no-push] [--no-commit]
+
+The exporter lives in BRAZE_CATALOG_EXPORTER_DIR (default: a
+braze_catalog_exporter checkout next to this project) and is started with
+export_primary_locations_catalog.bat on Windows or .sh elsewhere; set
+BRAZE_CATALOG_EXPORT_CMD to run something else.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import shlex
+import shutil
+import subprocess
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from partitions import (
+    DEFAULT_CATALOG,
+    DEFAULT_WORKSPACE,
+    latest_catalog_dir,
+    load_workspaces,
+)
+from pipeline import (
+    build_stages,
+    format_results,
+    load_state,
+    pipeline_failed,
+    run_pipeline,
+    save_state,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLISH_DIR = "data/tables"
+EXPORTER_DIR = os.environ.get(
+    "BRAZE_CATALOG_EXPORTER_DIR",
+    os.path.join(os.path.dirname(BASE_DIR), "braze_catalog_exporter"),
+)
+EXPORTER_SCRIPT = "export_primary_locations_catalog" + (
+    ".bat" if os.name == "nt" else ".sh"
+)
+# The exporter may resume a partial fetch younger than this.
+EXPORT_RESUME_MAX_AGE_S = 3600
+# "Today" for the export cache is the Pacific date, as in the Braze dashboard.
+CACHE_TIMEZONE = "America/Los_Angeles"
+
+
+def _cache_tz():
+    try:
+        return ZoneInfo(CACHE_TIMEZONE)
+    except ZoneInfoNotFoundError:
+        # No tz database (e.g. Windows without tzdata): use local time.
+        return None
+
+
+def cached_today_export(catalog_dir, catalog=DEFAULT_CATALOG, now=None):
+    """Newest <catalog>*.csv in `catalog_dir` modified today (Pacific), or None."""
+    tz = _cache_tz()
+    today = (now or datetime.now(timezone.utc)).astimezone(tz).date()
+    exports = [
+        path
+        for path in glob.glob(os.path.join(catalog_dir, f"{catalog}*.csv"))
+        if datetime.fromtimestamp(os.path.getmtime(path), tz).date() == today
+    ]
+    return max(exports, key=os.path.getmtime, default=None)
+
+
+def _newest_exporter_csv(exporter_dir):
+    pattern = os.path.join(exporter_dir, "exports", f"{DEFAULT_CATALOG}_*.csv")
+    return max(glob.glob(pattern), key=os.path.getmtime, default=None)
+
+
+def export_stage(exporter_dir, export_cmd=None):
+    """Pipeline stage producing the default catalog's export CSV.
+
+    Its value is the CSV path, which the composition stage reads.
+    """
+    catalog_dir = latest_catalog_dir(DEFAULT_WORKSPACE, DEFAULT_CATALOG)
+
+    def run(values):
+        cached = cached_today_export(catalog_dir)
+        if cached:
+            print(f"[ok] Cached catalog export from today: {cached}; exporter skipped.")
+            return [cached], cached
+
+        if export_cmd:
+            cmd = shlex.split(export_cmd, posix=os.name != "nt")
+        else:
+            script = os.path.join(exporter_dir, EXPORTER_SCRIPT)
+            if not os.path.exists(script):
+                raise RuntimeError(
+                    f"Exporter not found: {script} (set BRAZE_CATALOG_EXPORTER_DIR "
+                    "or BRAZE_CATALOG_EXPORT_CMD)"
+                )
+            cmd = [script] if os.name == "nt" else ["sh", script]
+        print(f"[info] Running catalog exporter in {exporter_dir}")
+        env = dict(
+            os.environ,
+            BRAZE_CATALOG_EXPORT_RESUME="1",
+            BRAZE_CATALOG_EXPORT_RESUME_MAX_AGE_S=str(EXPORT_RESUME_MAX_AGE_S),
+        )
+        subprocess.run(cmd, cwd=exporter_dir, env=env, check=True)
+
+        export = _newest_exporter_csv(exporter_dir)
+        if export is None:
+            raise RuntimeError(
+                f"Could not find an exported catalog CSV in {exporter_dir}/exports"
+            )
+        # Cache it so later runs today can skip the fetch.
+        try:
+            os.makedirs(catalog_dir, exist_ok=True)
+            export = shutil.copy2(export, catalog_dir)
+        except OSError as e:
+            print(f"[warn] Could not copy the export to {catalog_dir}: {e}")
+        return [export], export
+
+    return {
+        "name": f"export:{DEFAULT_WORKSPACE}/{DEFAULT_CATALOG}",
+        "deps": [],
+        "inputs": None,
+        "run": run,
+        "optional": False,
+    }
+
+
+def _git(*args, check=True, capture=False):
+    return subprocess.run(
+        ["git", *args],
+        cwd=BASE_DIR,
+        check=check,
+        capture_output=capture,
+        text=True,
+    )
+
+
+def publish_tables(commit=True, push=True):
+    """Stage data/tables, then commit only that path and push.
+
+    Returns the commit's short sha, or None when nothing was committed.
+    """
+    _git("add", "-A", PUBLISH_DIR)
+    diff = _git("diff", "--cached", "--quiet", "--", PUBLISH_DIR, check=False)
+    if diff.returncode == 0:
+        print(f"[warn] No changes in {PUBLISH_DIR}; skipping commit/push.")
+        return None
+
+    staged = _git("diff", "--cached", "--name-only", capture=True).stdout.split()
+    if any(not path.startswith(PUBLISH_DIR + "/") for path in staged):
+        print(
+            f"[warn] There are staged changes outside {PUBLISH_DIR}; they are not "
+            "committed and stay staged."
+        )
+    if not commit:
+        print("[warn] Commit disabled (--no-commit). Leaving changes staged.")
+        return None
+
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    _git("commit", "-m", f"Refresh dashboard data ({stamp})", "--", PUBLISH_DIR)
+    sha = _git("rev-parse", "--short", "HEAD", capture=True).stdout.strip()
+    print(f"[ok] Committed ({sha})")
+
+    if not push:
+        print("[warn] Push disabled (--no-push). Commit created locally only.")
+        return sha
+    _git("push")
+    print("[ok] Pushed")
+    return sha
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--env-file", default=None, help="Path to a .env file for the extract"
+    )
+    parser.add_argument(
+        "--no-push", action="store_true", help="Commit locally but do not push"
+    )
+    parser.add_argument(
+        "--no-commit",
+        action="store_true",
+        help="Leave the refreshed data/tables staged (implies --no-push)",
+    )
+    parser.add_argument(
+        "--exporter-dir",
+        default=EXPORTER_DIR,
+        help="braze_catalog_exporter checkout (default %(default)s)",
+    )
+    parser.add_argument(
+        "--skip-catalog-export",
+        action="store_true",
+        help="Never run the exporter; build composition from data/latest_catalog",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun every stage even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Stages run concurrently"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if shutil.which("git") is None:
+        print("[error] Missing required command in PATH: git")
+        return 1
+
+    from extract_braze import _load_env
+
+    workspaces = load_workspaces()
+    _load_env(args.env_file, [ws["api_key_env"] for ws in workspaces])
+
+    # Unlike run_etl.py, a failed extract stops the run: publishing would
+    # only re-commit old data.
+    state = load_state()
+    stages = build_stages(state, workspaces, extract_required=True)
+    composition = f"composition:{DEFAULT_WORKSPACE}/{DEFAULT_CATALOG}"
+    if not args.skip_catalog_export and any(s["name"] == composition for s in stages):
+        export = export_stage(
+            args.exporter_dir, os.environ.get("BRAZE_CATALOG_EXPORT_CMD")
+        )
+        for stage in stages:
+            if stage["name"] == composition:
+                stage["deps"] = stage["deps"] + [export["name"]]
+        stages.insert(0, export)
+
+    try:
+        results = run_pipeline(
+            stages, state, force=args.force, max_workers=args.workers
+        )
+    finally:
+        save_state(state)
+
+    failed = pipeline_failed(results)
+    if not failed:
+        publish_started = time.perf_counter()
+        try:
+            publish_tables(commit=not args.no_commit, push=not args.no_push)
+            status, error = "ran", None
+        except subprocess.CalledProcessError as e:
+            status, error, failed = "failed", f"{' '.join(e.cmd)} failed", True
+        results.append(
+            {
+                "stage": "git:" + PUBLISH_DIR,
+                "status": status,
+                "seconds": time.perf_counter() - publish_started,
+                "error": error,
+                "optional": False,
+            }
+        )
+
+    print()
+    print(format_results(results))
+    for r in results:
+        if r["error"]:
+            print(f"{r['stage']}: {r['error']}")
+    print(f"Total: {time.perf_counter() - started:.1f}s")
+    if failed:
+        print("[error] Stopped. Nothing was pushed unless the git stage ran.")
+        return 1
+    print("All done.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,28 @@
-"""Run the full ETL (extract + parse).
+"""Run the full ETL (extract + parse + composition + aggregates + publish).
+
+Runs etl/pipeline.py's stage DAG in this process; stages whose inputs have not
+changed since the last run are skipped.
 
 Usage:
   python etl/run_etl.py
   python etl/run_etl.py --env-file .env
+  python etl/run_etl.py --skip-extract   # rebuild from the local snapshots
+  python etl/run_etl.py --force          # rerun every stage
 """
 
 from __future__ import annotations
 
 import argparse
-import os
-import subprocess
-import sys
+
+from pipeline import (
+    build_stages,
+    format_results,
+    load_state,
+    pipeline_failed,
+    run_pipeline,
+    save_state,
+)
+from partitions import load_workspaces
 
 
 def main() -> int:
@@ -18,26 +30,66 @@ def main() -> int:
     parser.add_argument(
         "--env-file",
         default=None,
-        help="Path to a .env file (passed through to extract step)",
+        help="Path to a .env file (used by the extract stage)",
+    )
+    parser.add_argument(
+        "--skip-extract",
+        action="store_true",
+        help="Do not call the Braze API; parse the existing raw snapshots",
+    )
+    parser.add_argument(
+        "--workspace",
+        action="append",
+        default=None,
+        help="Only run this workspace from workspaces.toml (repeatable)",
+    )
+    parser.add_argument(
+        "--no-composition",
+        action="store_true",
+        help="Skip the catalog composition stage",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun every stage even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Stages run concurrently"
     )
     args = parser.parse_args()
 
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    extract = os.path.join(base_dir, "etl", "extract_braze.py")
-    parse = os.path.join(base_dir, "etl", "parse_liquid.py")
+    workspaces = load_workspaces()
+    if args.workspace:
+        unknown = set(args.workspace) - {ws["name"] for ws in workspaces}
+        if unknown:
+            parser.error(f"unknown workspace(s): {', '.join(sorted(unknown))}")
+        workspaces = [ws for ws in workspaces if ws["name"] in args.workspace]
+
+    if not args.skip_extract:
+        from extract_braze import _load_env
 
-    extract_cmd = [sys.executable, extract]
-    if args.env_file:
-        extract_cmd.extend(["--env-file", args.env_file])
+        _load_env(args.env_file, [ws["api_key_env"] for ws in workspaces])
 
-    print("=== 1) Extracting raw snapshots from Braze ===")
-    r1 = subprocess.run(extract_cmd, cwd=base_dir)
-    if r1.returncode != 0:
-        print("Extraction failed; continuing to parse using existing local files...")
+    state = load_state()
+    stages = build_stages(
+        state,
+        workspaces,
+        extract=not args.skip_extract,
+        composition=not args.no_composition,
+    )
+    try:
+        results = run_pipeline(
+            stages, state, force=args.force, max_workers=args.workers
+        )
+    finally:
+        save_state(state)
 
-    print("\n=== 2) Parsing snapshots into CSV tables ===")
-    r2 = subprocess.run([sys.executable, parse], cwd=base_dir)
-    return r2.returncode
+    print()
+    print(format_results(results))
+    for r in results:
+        if r["error"]:
+            print(f"{r['stage']}: {r['error']}")
+    return 1 if pipeline_failed(results) else 0
 
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ import os
 import hashlib
 from datetime import datetime, timedelta, timezone
 
+from overview import write_static_bundle
+from parse_liquid import write_content_index, write_governance_aggregates
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TABLES_DIR = os.path.join(BASE_DIR, "data", "tables")
@@ -216,6 +219,11 @@ Manager: {{ catalog_items['Primary_Locations_Catalog'][0].manager_email }}"""
         os.path.join(TABLES_DIR, "field_references.csv"), index=False
     )
 
+    write_governance_aggregates(
+        pd.DataFrame(assets_data), pd.DataFrame(blocks_data), pd.DataFrame(refs_data)
+    )
+    write_content_index(pd.DataFrame(assets_data), pd.DataFrame(blocks_data))
+
     # 5. Dependencies
     deps_data = [
         {
@@ -250,6 +258,8 @@ Manager: {{ catalog_items['Primary_Locations_Catalog'][0].manager_email }}"""
         )
         f.write("\n")
 
+    write_static_bundle()
+
     print("Seed data generated successfully.")
 
 
@@ -1,6 +1,6 @@
 @echo off
 echo ===================================================
-echo 1. Fetching Fresh Data from Braze API...
+echo Refreshing Dashboard Data from the Braze API...
 echo ===================================================
 
 :: Ensure we are in the script's directory
@@ -36,42 +36,26 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
-:: Run the Extraction Script
+:: Run the ETL pipeline (extract, parse, composition, aggregates, static bundle)
 set "ENV_FILE=C:\Toast\.env"
 if exist "%ENV_FILE%" (
     echo Loading configuration from %ENV_FILE% ...
-    uv run etl/extract_braze.py --env-file "%ENV_FILE%"
+    uv run etl/run_etl.py --env-file "%ENV_FILE%"
 ) else (
     echo No %ENV_FILE% found. Using local .env or process environment...
-    uv run etl/extract_braze.py
+    uv run etl/run_etl.py
 )
 
-if %errorlevel% neq 0 (
-    echo.
-    echo Extraction failed. Check your API key or connection.
-    echo Falling back to existing local files...
-) else (
-    echo.
-    echo Extraction complete.
-)
-
-:PARSE
-echo.
-echo ===================================================
-echo 2. Parsing Data into CSV Tables...
-echo ===================================================
-
-:: Run the Parsing Script
-uv run etl/parse_liquid.py
-
 if %errorlevel% equ 0 (
     echo.
     echo Success! Dashboard data updated in data/tables/
 ) else (
     echo.
-    echo Parsing Failed. Please check the error messages above.
+    echo ETL failed. Please check the stage summary above.
 )
 
+:STATUS
+
 :: Show git status for easy commit
 where git >nul 2>nul
 if %errorlevel% equ 0 (
@@ -1,18 +1,81 @@
 import argparse
 import csv
+import io
 import json
 import os
+import re
+import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # Columnar cache disabled; scans parse the CSV.
+    pa = None
+
 
 BRAZE_KIB_PER_ITEM_ESTIMATE = 2.72
 # From prior observed export measurement used in the notebook.
 CSV_KIB_PER_ROW_OBSERVED = 1.422742337211544
 
+DEFAULT_BYTES = {
+    "bool": 1,
+    "int": 8,
+    "float": 8,
+    "datetime": 8,
+    "other": 8,
+}
+
+# Incremental mode: aggregates + per-row hashes of the previous export are kept
+# next to the cached exports (never committed) and a new export is applied as a
+# delta of added/removed/changed items keyed by ID_COLUMN.
+ID_COLUMN = "id"
+STATE_VERSION = 4
+STATE_JSON = "composition_state.json"
+STATE_HASHES = "composition_row_hashes.npz"
+# Without the columnar cache, pandas infers dtypes per chunk and deltas can
+# drift slightly from a full scan; force a full rescan periodically.
+MAX_INCREMENTAL_RUNS = 7
+FILL_RATE_MOVE_THRESHOLD_PCT = 0.1
+
+# Measured storage: each item is sized as the JSON object Braze stores, i.e.
+# {"field": value, ...} with every schema field present and empty cells as null.
+JSON_NULL_BYTES = 4
+_JSON_ESCAPE_RE = re.compile(r'["\\\x00-\x1f]')
+
+# Sample mode: one record per equal-size byte stratum, found by seeking to a
+# random offset. Records are picked proportionally to their byte length, so
+# estimates weight each one by 1/length (Horvitz-Thompson).
+DEFAULT_SAMPLE_ROWS = 5_000
+SAMPLE_LOOKBEHIND_BYTES = 256 * 1024
+CI_Z = 1.96  # 95% confidence intervals
+# Previews go to this subdir of the tables dir so they never replace the
+# published artifacts (etl/partitions.py reserves the name).
+SAMPLE_OUTPUT_SUBDIR = "preview"
+
+# Columnar cache: a typed, zstd-compressed Parquet copy of each export, typed
+# over the whole file (so every chunk sees the same dtypes) and read back
+# memory-mapped. String columns with few distinct values are dictionary-encoded.
+CACHE_FORMAT_VERSION = "1"
+DICTIONARY_MAX_DISTINCT = 1024
+# pandas' read_csv boolean literals (pyarrow's defaults also accept 1/0).
+_BOOL_TRUE = ["True", "TRUE", "true"]
+_BOOL_FALSE = ["False", "FALSE", "false"]
+
+# Duplicate detection: every row's content (all fields except ID_COLUMN) is
+# hashed twice into uint64 arrays, exactly and normalized (whitespace collapsed,
+# case folded, empty/null and int/float spellings unified). Each duplicate
+# group keeps its first item; the others are wasted storage.
+DUPLICATE_GROUPS_MAX = 500
+DUPLICATE_SAMPLE_IDS = 5
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def _latest_csv(input_dir: str) -> str:
     paths = []
@@ -54,106 +117,904 @@ def _is_empty_obj_series(s: pd.Series) -> pd.Series:
     return s2.astype(str).str.strip().eq("")
 
 
+def _read_chunks(path: str, chunk_size: int):
+    # Iterate file in chunks (skip malformed rows).
+    return pd.read_csv(
+        path,
+        chunksize=chunk_size,
+        low_memory=False,
+        on_bad_lines="skip",
+    )
+
+
+def columnar_cache_path(cache_dir: str, input_csv: str) -> str:
+    stem = os.path.splitext(os.path.basename(input_csv))[0]
+    return os.path.join(cache_dir, stem + ".parquet")
+
+
+def _cache_is_fresh(cache_path: str, input_csv: str) -> bool:
+    if not os.path.exists(cache_path):
+        return False
+    meta = pq.read_schema(cache_path).metadata or {}
+    stat = os.stat(input_csv)
+    return (
+        meta.get(b"cache_format_version") == CACHE_FORMAT_VERSION.encode()
+        and meta.get(b"source_size_bytes") == str(stat.st_size).encode()
+        and meta.get(b"source_mtime") == repr(stat.st_mtime).encode()
+    )
+
+
+def _open_csv_batches(input_csv: str, column_types=None):
+    return pa_csv.open_csv(
+        input_csv,
+        read_options=pa_csv.ReadOptions(block_size=16 << 20),
+        # Skip malformed rows, like on_bad_lines="skip" does for pandas.
+        parse_options=pa_csv.ParseOptions(
+            newlines_in_values=True, invalid_row_handler=lambda row: "skip"
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            strings_can_be_null=True,
+            true_values=_BOOL_TRUE,
+            false_values=_BOOL_FALSE,
+        ),
+    )
+
+
+def _castable(arr, typ) -> bool:
+    try:
+        pc.cast(arr, typ)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+    return True
+
+
+def _infer_cache_schema(input_csv: str, cols):
+    """Types each column from every row of the export (pandas-like rules)."""
+    bool_values = pa.array(_BOOL_TRUE + _BOOL_FALSE)
+    stats = {
+        c: {"bool": True, "int": True, "float": True, "non_null": 0, "distinct": set()}
+        for c in cols
+    }
+    as_strings = {c: pa.string() for c in cols}
+    for batch in _open_csv_batches(input_csv, as_strings):
+        for c, arr in zip(batch.schema.names, batch.columns):
+            st = stats[c]
+            valid = pc.drop_null(arr)
+            if len(valid) == 0:
+                continue
+            st["non_null"] += len(valid)
+            if st["bool"]:
+                st["bool"] = pc.all(pc.is_in(valid, value_set=bool_values)).as_py()
+            if st["int"]:
+                st["int"] = _castable(valid, pa.int64())
+            if st["float"] and not st["int"]:
+                st["float"] = _castable(valid, pa.float64())
+            if st["distinct"] is not None:
+                uniques = pc.unique(valid)
+                # A batch alone over the limit settles it without converting
+                # its values; otherwise stop collecting once the union is.
+                if len(uniques) > DICTIONARY_MAX_DISTINCT:
+                    st["distinct"] = None
+                else:
+                    st["distinct"].update(uniques.to_pylist())
+                    if len(st["distinct"]) > DICTIONARY_MAX_DISTINCT:
+                        st["distinct"] = None
+
+    fields = []
+    for c in cols:
+        st = stats[c]
+        if st["non_null"] == 0:
+            typ = pa.float64()  # all-empty columns read as NaN floats
+        elif st["bool"]:
+            typ = pa.bool_()
+        elif st["int"]:
+            typ = pa.int64()
+        elif st["float"]:
+            typ = pa.float64()
+        elif st["distinct"] is not None:
+            typ = pa.dictionary(pa.int32(), pa.string())
+        else:
+            typ = pa.string()
+        fields.append(pa.field(c, typ))
+    return pa.schema(fields)
+
+
+def write_columnar_cache(input_csv: str, cache_path: str) -> str:
+    """Converts an export CSV to the typed Parquet cache; returns its path."""
+    cols = list(pd.read_csv(input_csv, nrows=0).columns)
+    schema = _infer_cache_schema(input_csv, cols)
+    stat = os.stat(input_csv)
+    schema = schema.with_metadata(
+        {
+            "cache_format_version": CACHE_FORMAT_VERSION,
+            "source_file": os.path.basename(input_csv),
+            "source_size_bytes": str(stat.st_size),
+            "source_mtime": repr(stat.st_mtime),
+        }
+    )
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp = cache_path + ".tmp"
+    column_types = {f.name: f.type for f in schema}
+    with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+        for batch in _open_csv_batches(input_csv, column_types):
+            writer.write_batch(batch)
+    os.replace(tmp, cache_path)
+    return cache_path
+
+
+def load_columnar_cache(cache_path: str, columns=None) -> pd.DataFrame:
+    """Reads (a subset of columns of) a catalog cache, memory-mapped.
+
+    Dictionary-encoded columns come back as pandas categoricals.
+    """
+    return pq.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+
+
+def _read_cache_chunks(cache_path: str, chunk_size: int, columns=None):
+    # Dictionary columns stay categoricals; the per-column stats work on their
+    # categories and spread the results over the codes.
+    pf = pq.ParquetFile(cache_path, memory_map=True)
+    for batch in pf.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def _catalog_chunks(
+    input_csv: str, chunk_size: int, cache_dir: str | None, columns=None
+):
+    """Chunks of an export, read from its columnar cache when there is one.
+
+    `columns` limits what the cache reads; a CSV scan always parses every
+    field so malformed rows are skipped the same way in every pass.
+    """
+    if cache_dir is None or pa is None:
+        return _read_chunks(input_csv, chunk_size)
+    cache_path = columnar_cache_path(cache_dir, input_csv)
+    if not _cache_is_fresh(cache_path, input_csv):
+        write_columnar_cache(input_csv, cache_path)
+    return _read_cache_chunks(cache_path, chunk_size, columns)
+
+
+def _chunk_reader(cache_dir: str | None) -> str:
+    return "csv" if cache_dir is None or pa is None else "columnar"
+
+
+def _new_aggregates():
+    return {
+        "good_rows": 0,
+        "empty_counts": defaultdict(int),
+        "non_empty_counts": defaultdict(int),
+        # For string heaviness
+        "str_total_len": defaultdict(int),
+        "str_non_empty": defaultdict(int),
+        # For weight proxy
+        "str_bytes": defaultdict(int),
+        # Measured JSON-serialized bytes (field name + typed value)
+        "json_bytes": defaultdict(int),
+        "col_kind": {},
+    }
+
+
+def _item_overhead_bytes(n_cols: int) -> int:
+    return 2 + max(n_cols - 1, 0)
+
+
+def _json_key_bytes(col: str) -> int:
+    # "field": (quoted name plus the colon)
+    return len(json.dumps(str(col), ensure_ascii=False).encode("utf-8")) + 1
+
+
+def _json_value_bytes(v) -> int:
+    return len(json.dumps(v, ensure_ascii=False).encode("utf-8"))
+
+
+def _json_str_bytes(values: pd.Series, lens: pd.Series) -> pd.Series:
+    """UTF-8 size of each string serialized as a JSON string (quotes included)."""
+    joined = "".join(values)
+    if joined.isascii() and _JSON_ESCAPE_RE.search(joined) is None:
+        return lens + 2
+    return values.map(_json_value_bytes)
+
+
+def _json_bytes_series(s: pd.Series) -> pd.Series:
+    """JSON-serialized size of each (non-empty) value in `s`, typed as parsed."""
+    if s.dtype == "object":
+        inferred = pd.api.types.infer_dtype(s, skipna=True)
+        if inferred == "string":
+            return _json_str_bytes(s, s.str.len())
+        if inferred == "boolean":
+            return s.map({True: 4, False: 5}).astype("int64")
+        return s.map(_json_value_bytes)
+    if s.dtype == "bool":
+        return pd.Series(np.where(s.to_numpy(), 4, 5), index=s.index)
+    if np.issubdtype(s.dtype, np.integer):
+        return s.astype(str).str.len()
+    if np.issubdtype(s.dtype, np.floating):
+        # The export writes whole numbers without a decimal part.
+        return s.astype(str).str.removesuffix(".0").str.len()
+    return _json_str_bytes(s.astype(str), s.astype(str).str.len())
+
+
+def _is_text(s: pd.Series) -> bool:
+    """Object strings from a CSV parse, or a cached dictionary column."""
+    return s.dtype == "object" or isinstance(s.dtype, pd.CategoricalDtype)
+
+
+def _by_category(s: pd.Series, values: np.ndarray, missing) -> np.ndarray:
+    """Per-category `values` of a categorical, spread over its rows."""
+    return np.append(values, missing)[s.cat.codes.to_numpy()]
+
+
+def _infer_kind(s: pd.Series) -> str:
+    if _is_text(s):
+        # Best-effort heuristic; matches the notebook's intent.
+        sample = s.dropna().astype(str).head(200)
+        if len(sample) > 0 and (
+            (sample.str.contains(":").mean() > 0.5)
+            or (sample.str.contains("-").mean() > 0.7)
+        ):
+            return "datetime"
+        return "string"
+    if s.dtype == "bool":
+        return "bool"
+    if np.issubdtype(s.dtype, np.integer):
+        return "int"
+    if np.issubdtype(s.dtype, np.floating):
+        return "float"
+    return "other"
+
+
+def _column_arrays(s: pd.Series, key_bytes: int):
+    """Per-row stats of one column: filled mask, string lengths, JSON bytes."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        filled, str_len, value_bytes = _column_arrays(
+            pd.Series(s.cat.categories.astype(object)), key_bytes
+        )
+        return (
+            _by_category(s, filled, False),
+            _by_category(s, str_len, 0),
+            _by_category(s, value_bytes, JSON_NULL_BYTES + key_bytes),
+        )
+
+    # Object columns: NaN + whitespace-only strings are empty; otherwise NaN.
+    is_obj = s.dtype == "object"
+    empty_mask = _is_empty_obj_series(s) if is_obj else s.isna()
+    filled = ~empty_mask.to_numpy()
+
+    str_len = np.zeros(len(s), np.int64)
+    value_bytes = np.full(len(s), JSON_NULL_BYTES, np.int64)
+    if filled.any():
+        s2 = s[filled]
+        if is_obj:
+            str_len[filled] = s2.astype(str).str.len().to_numpy()
+        value_bytes[filled] = _json_bytes_series(s2).to_numpy()
+    value_bytes += key_bytes
+    return filled, str_len, value_bytes
+
+
+def _accumulate_chunk(aggs, chunk: pd.DataFrame, sign: int = 1) -> np.ndarray:
+    """Adds (sign=1) or subtracts (sign=-1) a chunk's per-column contribution.
+
+    Returns the JSON-serialized size of each row in the chunk.
+    """
+    aggs["good_rows"] += sign * len(chunk)
+    empty_counts = aggs["empty_counts"]
+    non_empty_counts = aggs["non_empty_counts"]
+    str_total_len = aggs["str_total_len"]
+    str_non_empty = aggs["str_non_empty"]
+    str_bytes = aggs["str_bytes"]
+    json_bytes = aggs["json_bytes"]
+    col_kind = aggs["col_kind"]
+
+    # Braces plus the commas between fields.
+    item_bytes = np.full(len(chunk), _item_overhead_bytes(len(chunk.columns)), np.int64)
+
+    for c in chunk.columns:
+        s = chunk[c]
+        filled, str_len, value_bytes = _column_arrays(s, _json_key_bytes(c))
+        nonempty = int(filled.sum())
+        empty_counts[c] += sign * (len(s) - nonempty)
+        non_empty_counts[c] += sign * nonempty
+
+        # Accumulate string lengths for non-empty values.
+        if _is_text(s) and nonempty > 0:
+            total_len = int(str_len.sum())
+            str_total_len[c] += sign * total_len
+            str_non_empty[c] += sign * nonempty
+            str_bytes[c] += sign * total_len
+
+        if c not in col_kind:
+            col_kind[c] = _infer_kind(s)
+
+        json_bytes[c] += sign * int(value_bytes.sum())
+        item_bytes += value_bytes
+
+    return item_bytes
+
+
+def _sample_records(path: str, expected_cols: int, n: int, seed: int):
+    """Stratified byte-offset sample of whole single-line records.
+
+    Returns (header, lines, data_bytes, rejected). Draws landing in a
+    multi-line or malformed record are rejected.
+    """
+    rng = np.random.default_rng(seed)
+    file_bytes = os.path.getsize(path)
+    lines = []
+    rejected = 0
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        data_bytes = file_bytes - data_start
+        if data_bytes <= 0:
+            return header, lines, 0, 0
+
+        bounds = np.linspace(data_start, file_bytes, n + 1)
+        offsets = (bounds[:-1] + rng.random(n) * np.diff(bounds)).astype(np.int64)
+        for off in offsets:
+            # The record containing `off` starts after the last newline before it.
+            back = int(min(SAMPLE_LOOKBEHIND_BYTES, off - data_start))
+            f.seek(off - back)
+            nl = f.read(back).rfind(b"\n")
+            if nl < 0 and back < off - data_start:
+                rejected += 1
+                continue
+            f.seek(off - back + nl + 1)
+            line = f.readline()
+            row = next(csv.reader([line.decode("utf-8", errors="replace")]), [])
+            if len(row) != expected_cols:
+                rejected += 1
+                continue
+            lines.append(line if line.endswith(b"\n") else line + b"\n")
+    return header, lines, data_bytes, rejected
+
+
+def _weighted_quantile(values: np.ndarray, weights: np.ndarray, q: float) -> float:
+    order = np.argsort(values)
+    cum = np.cumsum(weights[order])
+    return float(values[order][np.searchsorted(cum, q * cum[-1])])
+
+
+def _scan_sample(input_csv: str, expected_cols: int, n: int, seed: int):
+    """Estimates the aggregates from a byte-offset sample.
+
+    Returns (aggs, cols, item_bytes, item_weights, ci, info); aggs hold
+    estimated totals, ci holds 95% half-widths. Returns None when fewer than
+    two rows were sampled, too few for a confidence interval.
+    """
+    header, lines, data_bytes, rejected = _sample_records(
+        input_csv, expected_cols, n, seed
+    )
+    if len(lines) < 2:
+        return None
+
+    sample = pd.read_csv(
+        io.StringIO(b"".join([header] + lines).decode("utf-8", errors="replace")),
+        low_memory=False,
+    )
+    cols = list(sample.columns)
+    m = len(sample)
+    if m < 2:
+        return None
+    inv = 1.0 / np.array([len(line) for line in lines], dtype=np.float64)
+    scale = data_bytes / m
+
+    def total(y):
+        return scale * float((y * inv).sum())
+
+    def total_hw(y):
+        return CI_Z * data_bytes * float(np.std(y * inv, ddof=1)) / np.sqrt(m)
+
+    def ratio_hw(y):
+        r = float((y * inv).sum() / inv.sum())
+        z = (y - r) * inv
+        var = m / (m - 1) * float((z**2).sum()) / float(inv.sum()) ** 2
+        return CI_Z * np.sqrt(var)
+
+    aggs = _new_aggregates()
+    ci = {"fill_pct": {}, "non_empty": {}, "str_bytes": {}, "json_bytes": {}}
+    n_hat = total(np.ones(m))
+    good_rows = int(round(n_hat))
+    aggs["good_rows"] = good_rows
+    filled_cells = np.zeros(m)
+    item_bytes = np.full(m, _item_overhead_bytes(len(cols)), np.int64)
+
+    for c in cols:
+        s = sample[c]
+        filled, str_len, value_bytes = _column_arrays(s, _json_key_bytes(c))
+        f = filled.astype(np.float64)
+        nonempty = min(int(round(total(f))), good_rows)
+        aggs["non_empty_counts"][c] = nonempty
+        aggs["empty_counts"][c] = good_rows - nonempty
+        if s.dtype == "object" and filled.any():
+            str_total = int(round(total(str_len)))
+            aggs["str_total_len"][c] = str_total
+            aggs["str_non_empty"][c] = nonempty
+            aggs["str_bytes"][c] = str_total
+        aggs["json_bytes"][c] = int(round(total(value_bytes)))
+        aggs["col_kind"][c] = _infer_kind(s)
+
+        ci["fill_pct"][c] = ratio_hw(f) * 100
+        ci["non_empty"][c] = total_hw(f)
+        ci["str_bytes"][c] = total_hw(str_len)
+        ci["json_bytes"][c] = total_hw(value_bytes)
+        filled_cells += f
+        item_bytes += value_bytes
+
+    ci["overall_filled_pct"] = ratio_hw(filled_cells / len(cols)) * 100
+    ci["serialized_bytes"] = total_hw(item_bytes)
+    info = {
+        "sample_rows": m,
+        "sample_rejected": rejected,
+        "sample_seed": seed,
+        "ci_level": 0.95,
+    }
+    return aggs, cols, item_bytes, inv, ci, info
+
+
+def _id_hashes(chunk: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(
+        chunk[ID_COLUMN].astype(str), index=False
+    ).to_numpy()
+
+
+def _row_hashes(chunk: pd.DataFrame) -> np.ndarray:
+    # Hash numerics as float64 so a value hashes the same whether pandas
+    # inferred int or float for the chunk it landed in.
+    norm = chunk.copy(deep=False)
+    for c in norm.columns:
+        s = norm[c]
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            norm[c] = s.astype("float64")
+    return pd.util.hash_pandas_object(norm, index=False).to_numpy()
+
+
+def _normalized_str(s: pd.Series) -> pd.Series:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        norm = _normalized_str(pd.Series(s.cat.categories.astype(object)))
+        return pd.Series(_by_category(s, norm.to_numpy(), ""), index=s.index)
+    if pd.api.types.is_bool_dtype(s):
+        return s.astype(str).str.lower()
+    if pd.api.types.is_numeric_dtype(s):
+        s = s.astype("float64").astype(str).str.removesuffix(".0")
+        return s.where(s != "nan", "")
+    return (
+        s.astype(str)
+        .where(s.notna(), "")
+        .str.replace(_WHITESPACE_RE, " ", regex=True)
+        .str.strip()
+        .str.casefold()
+    )
+
+
+def _content_hashes(chunk: pd.DataFrame):
+    """Exact and normalized hashes of each row's fields, ignoring ID_COLUMN."""
+    content = chunk.drop(columns=[ID_COLUMN], errors="ignore")
+    exact = _row_hashes(content)
+    norm = pd.DataFrame({c: _normalized_str(content[c]) for c in content.columns})
+    near = pd.util.hash_pandas_object(norm, index=False).to_numpy()
+    return exact, near
+
+
+def _match_rows(prev_ids: pd.Index, prev_rows: np.ndarray, ids, rows):
+    """Positions of `ids` in the previous export plus added/changed masks."""
+    pos = prev_ids.get_indexer(ids)
+    added = pos < 0
+    changed = ~added & (prev_rows[np.where(added, 0, pos)] != rows)
+    return pos, added, changed
+
+
+def _load_state(state_dir: str):
+    """Returns the previous run's aggregates and row hashes, or None."""
+    json_path = os.path.join(state_dir, STATE_JSON)
+    hashes_path = os.path.join(state_dir, STATE_HASHES)
+    if not os.path.exists(json_path) or not os.path.exists(hashes_path):
+        return None
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        return None
+
+    with np.load(hashes_path) as z:
+        state["id_hashes"] = z["id_hashes"]
+        state["row_hashes"] = z["row_hashes"]
+        state["item_bytes"] = z["item_bytes"]
+        state["exact_hashes"] = z["exact_hashes"]
+        state["near_hashes"] = z["near_hashes"]
+    return state
+
+
+def _save_state(
+    state_dir: str,
+    input_csv: str,
+    cols,
+    chunk_size: int,
+    reader: str,
+    aggs,
+    id_hashes: np.ndarray,
+    row_hashes: np.ndarray,
+    item_bytes: np.ndarray,
+    exact_hashes: np.ndarray,
+    near_hashes: np.ndarray,
+    incremental_runs: int,
+) -> None:
+    os.makedirs(state_dir, exist_ok=True)
+
+    hashes_path = os.path.join(state_dir, STATE_HASHES)
+    with open(hashes_path + ".tmp", "wb") as f:
+        np.savez(
+            f,
+            id_hashes=id_hashes,
+            row_hashes=row_hashes,
+            item_bytes=item_bytes,
+            exact_hashes=exact_hashes,
+            near_hashes=near_hashes,
+        )
+    os.replace(hashes_path + ".tmp", hashes_path)
+
+    stat = os.stat(input_csv)
+    state = {
+        "version": STATE_VERSION,
+        "input_path": os.path.abspath(input_csv),
+        "input_size_bytes": stat.st_size,
+        "input_mtime": stat.st_mtime,
+        "columns": list(cols),
+        "chunk_size": int(chunk_size),
+        "reader": reader,
+        "incremental_runs": int(incremental_runs),
+        "good_rows": int(aggs["good_rows"]),
+        "empty_counts": dict(aggs["empty_counts"]),
+        "non_empty_counts": dict(aggs["non_empty_counts"]),
+        "str_total_len": dict(aggs["str_total_len"]),
+        "str_non_empty": dict(aggs["str_non_empty"]),
+        "str_bytes": dict(aggs["str_bytes"]),
+        "json_bytes": dict(aggs["json_bytes"]),
+        "col_kind": dict(aggs["col_kind"]),
+    }
+    json_path = os.path.join(state_dir, STATE_JSON)
+    with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(json_path + ".tmp", json_path)
+
+
+def _aggregates_from_state(state):
+    aggs = _new_aggregates()
+    aggs["good_rows"] = int(state["good_rows"])
+    for key in (
+        "empty_counts",
+        "non_empty_counts",
+        "str_total_len",
+        "str_non_empty",
+        "str_bytes",
+        "json_bytes",
+    ):
+        aggs[key].update(state[key])
+    aggs["col_kind"].update(state["col_kind"])
+    return aggs
+
+
+def _incremental_blocker(state, cols, chunk_size: int, reader: str):
+    """Returns why the previous state can't be used as a baseline, or None."""
+    if state is None:
+        return "no previous state"
+    if state["columns"] != list(cols):
+        return "columns changed"
+    if state["reader"] != reader:
+        return f"previous run used the {state['reader']} reader"
+    if reader == "csv" and state["chunk_size"] != chunk_size:
+        return "chunk size changed"
+    if state["incremental_runs"] >= MAX_INCREMENTAL_RUNS:
+        return f"periodic full rescan after {MAX_INCREMENTAL_RUNS} incremental runs"
+
+    prev_path = state["input_path"]
+    if not os.path.exists(prev_path):
+        return f"previous export missing: {prev_path}"
+    stat = os.stat(prev_path)
+    if (
+        stat.st_size != state["input_size_bytes"]
+        or stat.st_mtime != state["input_mtime"]
+    ):
+        return f"previous export was modified: {prev_path}"
+    return None
+
+
+def _concat(parts, dtype) -> np.ndarray:
+    return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+def _scan_full(
+    input_csv: str, chunk_size: int, with_hashes: bool, cache_dir: str | None
+):
+    aggs = _new_aggregates()
+    cols = None
+    id_parts = []
+    row_parts = []
+    size_parts = []
+    exact_parts = []
+    near_parts = []
+
+    for chunk in _catalog_chunks(input_csv, chunk_size, cache_dir):
+        if cols is None:
+            cols = list(chunk.columns)
+        size_parts.append(_accumulate_chunk(aggs, chunk))
+        exact, near = _content_hashes(chunk)
+        exact_parts.append(exact)
+        near_parts.append(near)
+        if with_hashes:
+            id_parts.append(_id_hashes(chunk))
+            row_parts.append(_row_hashes(chunk))
+
+    item_bytes = _concat(size_parts, np.int64)
+    content = (_concat(exact_parts, np.uint64), _concat(near_parts, np.uint64))
+    if not with_hashes:
+        return aggs, cols, None, None, item_bytes, content
+    id_hashes = _concat(id_parts, np.uint64)
+    row_hashes = _concat(row_parts, np.uint64)
+    return aggs, cols, id_hashes, row_hashes, item_bytes, content
+
+
+def _scan_incremental(input_csv: str, chunk_size: int, state, cache_dir: str | None):
+    """Applies the delta between the previous export and `input_csv`.
+
+    Only added/changed rows of the new export and removed/changed rows of the
+    previous export go through the per-column aggregation.
+    """
+    aggs = _aggregates_from_state(state)
+    prev_ids = pd.Index(state["id_hashes"])
+    prev_rows = state["row_hashes"]
+    prev_sizes = state["item_bytes"]
+    prev_exact = state["exact_hashes"]
+    prev_near = state["near_hashes"]
+    seen = np.zeros(len(prev_ids), dtype=bool)
+    stale = np.zeros(len(prev_ids), dtype=bool)
+
+    cols = None
+    id_parts = []
+    row_parts = []
+    size_parts = []
+    exact_parts = []
+    near_parts = []
+    added_total = 0
+    changed_total = 0
+
+    for chunk in _catalog_chunks(input_csv, chunk_size, cache_dir):
+        if cols is None:
+            cols = list(chunk.columns)
+        ids = _id_hashes(chunk)
+        rows = _row_hashes(chunk)
+        id_parts.append(ids)
+        row_parts.append(rows)
+
+        pos, added, changed = _match_rows(prev_ids, prev_rows, ids, rows)
+        seen[pos[~added]] = True
+        stale[pos[changed]] = True
+        added_total += int(added.sum())
+        changed_total += int(changed.sum())
+
+        dirty = added | changed
+        sizes = np.empty(len(chunk), dtype=np.int64)
+        exact = np.empty(len(chunk), dtype=np.uint64)
+        near = np.empty(len(chunk), dtype=np.uint64)
+        sizes[~dirty] = prev_sizes[pos[~dirty]]
+        exact[~dirty] = prev_exact[pos[~dirty]]
+        near[~dirty] = prev_near[pos[~dirty]]
+        if dirty.any():
+            sizes[dirty] = _accumulate_chunk(aggs, chunk[dirty])
+            exact[dirty], near[dirty] = _content_hashes(chunk[dirty])
+        size_parts.append(sizes)
+        exact_parts.append(exact)
+        near_parts.append(near)
+
+    removed = ~seen
+    stale |= removed
+    if stale.any():
+        stale_ids = prev_ids[stale]
+        for chunk in _catalog_chunks(state["input_path"], chunk_size, cache_dir):
+            mask = pd.Index(_id_hashes(chunk)).isin(stale_ids)
+            if mask.any():
+                _accumulate_chunk(aggs, chunk[mask], sign=-1)
+
+    id_hashes = _concat(id_parts, np.uint64)
+    row_hashes = _concat(row_parts, np.uint64)
+    item_bytes = _concat(size_parts, np.int64)
+    content = (_concat(exact_parts, np.uint64), _concat(near_parts, np.uint64))
+    delta = {
+        "rows_added": added_total,
+        "rows_removed": int(removed.sum()),
+        "rows_changed": changed_total,
+    }
+    return aggs, cols, id_hashes, row_hashes, item_bytes, content, delta
+
+
+def _diff_counts(state, id_hashes: np.ndarray, row_hashes: np.ndarray):
+    prev_ids = pd.Index(state["id_hashes"])
+    pos, added, changed = _match_rows(
+        prev_ids, state["row_hashes"], id_hashes, row_hashes
+    )
+    seen = np.zeros(len(prev_ids), dtype=bool)
+    seen[pos[~added]] = True
+    return {
+        "rows_added": int(added.sum()),
+        "rows_removed": int((~seen).sum()),
+        "rows_changed": int(changed.sum()),
+    }
+
+
+def _fill_rate_moves(state, aggs, cols):
+    prev_rows = int(state["good_rows"])
+    good_rows = int(aggs["good_rows"])
+    prev_non_empty = state["non_empty_counts"]
+
+    moves = []
+    for c in cols:
+        if c not in prev_non_empty:
+            continue
+        prev_fr = (int(prev_non_empty[c]) / prev_rows * 100) if prev_rows else 0.0
+        fr = (
+            (int(aggs["non_empty_counts"].get(c, 0)) / good_rows * 100)
+            if good_rows
+            else 0.0
+        )
+        if abs(fr - prev_fr) >= FILL_RATE_MOVE_THRESHOLD_PCT:
+            moves.append(
+                {
+                    "field_name": c,
+                    "previous_fill_rate_pct": round(prev_fr, 2),
+                    "fill_rate_pct": round(fr, 2),
+                    "delta_pct": round(fr - prev_fr, 2),
+                }
+            )
+    moves.sort(key=lambda m: (-abs(m["delta_pct"]), m["field_name"]))
+    return moves
+
+
+def _duplicate_report(exact: np.ndarray, near: np.ndarray, item_bytes: np.ndarray):
+    """Duplicate totals plus the groups wasting the most bytes.
+
+    Groups are (match, sample row positions, items, wasted bytes). Near groups
+    are only listed when their items are not all exact copies of each other.
+    """
+    summary = {}
+    groups = []
+    for match, hashes in (("exact", exact), ("near", near)):
+        order = np.argsort(hashes, kind="stable")
+        h = hashes[order]
+        starts = np.flatnonzero(np.r_[True, h[1:] != h[:-1]])
+        sizes = np.diff(np.r_[starts, len(h)])
+        sorted_bytes = item_bytes[order]
+        wasted = np.add.reduceat(sorted_bytes, starts) - sorted_bytes[starts]
+        dup = sizes > 1
+        summary[f"duplicate_groups_{match}"] = int(dup.sum())
+        summary[f"duplicate_items_{match}"] = int((sizes[dup] - 1).sum())
+        summary[f"duplicate_wasted_bytes_{match}"] = int(wasted[dup].sum())
+
+        if match == "near":
+            e = exact[order]
+            dup &= np.minimum.reduceat(e, starts) != np.maximum.reduceat(e, starts)
+        idx = np.flatnonzero(dup)
+        idx = idx[np.argsort(-wasted[idx], kind="stable")[:DUPLICATE_GROUPS_MAX]]
+        for i in idx:
+            start = starts[i]
+            n_sample = min(int(sizes[i]), DUPLICATE_SAMPLE_IDS)
+            groups.append(
+                (match, order[start : start + n_sample], int(sizes[i]), int(wasted[i]))
+            )
+
+    groups.sort(key=lambda g: -g[3])
+    return summary, groups[:DUPLICATE_GROUPS_MAX]
+
+
+def _ids_at(input_csv: str, positions, chunk_size: int, cache_dir: str | None):
+    """Item ids of the rows at `positions` (0-based, in scan order)."""
+    wanted = np.unique(np.asarray(positions, dtype=np.int64))
+    ids = {}
+    offset = 0
+    for chunk in _catalog_chunks(input_csv, chunk_size, cache_dir, [ID_COLUMN]):
+        lo, hi = np.searchsorted(wanted, [offset, offset + len(chunk)])
+        if hi > lo:
+            sel = wanted[lo:hi]
+            vals = chunk[ID_COLUMN].iloc[sel - offset].astype(str)
+            ids.update(zip(sel.tolist(), vals))
+        offset += len(chunk)
+        if hi == len(wanted):
+            break
+    return ids
+
+
 def build_catalog_composition(
     input_csv: str,
     output_dir: str,
     chunk_size: int = 50_000,
     top_n: int = 15,
+    state_dir: str | None = None,
+    incremental: bool = False,
+    cache_dir: str | None = None,
+    sample_rows: int | None = None,
+    seed: int = 0,
 ):
     os.makedirs(output_dir, exist_ok=True)
 
     # Header / expected col count
     header_df = pd.read_csv(input_csv, nrows=1, low_memory=False)
     expected_cols = len(header_df.columns)
-    rows_by_linecount = _count_rows_fast(input_csv)
-    bad_lines = _find_bad_lines(input_csv, expected_cols, max_find=10)
+    preview = bool(sample_rows)
+    sampled = None
+    if preview:
+        sampled = _scan_sample(input_csv, expected_cols, sample_rows, seed)
+        if sampled is None:
+            print("Sampled fewer than 2 rows; running a full scan instead.")
+            sample_rows = None
+
+    # Both read the whole file; a sample preview skips them.
+    rows_by_linecount = None if sample_rows else _count_rows_fast(input_csv)
+    bad_lines = (
+        [] if sample_rows else _find_bad_lines(input_csv, expected_cols, max_find=10)
+    )
 
     file_bytes = os.path.getsize(input_csv)
     file_mib = file_bytes / (1024**2)
 
-    empty_counts = defaultdict(int)
-    non_empty_counts = defaultdict(int)
-
-    # For string heaviness
-    str_total_len = defaultdict(int)
-    str_non_empty = defaultdict(int)
-
-    # For weight proxy
-    str_bytes = defaultdict(int)
-    col_kind = {}
-
-    DEFAULT_BYTES = {
-        "bool": 1,
-        "int": 8,
-        "float": 8,
-        "datetime": 8,
-        "other": 8,
-    }
-
-    good_rows = 0
-    cols = None
-
-    # Iterate file in chunks (skip malformed rows).
-    for chunk in pd.read_csv(
-        input_csv,
-        chunksize=chunk_size,
-        low_memory=False,
-        on_bad_lines="skip",
-    ):
-        good_rows += len(chunk)
-        if cols is None:
-            cols = list(chunk.columns)
+    # Row hashes keyed by item id drive the day-over-day diff. A preview never
+    # touches the state, even when it fell back to a full scan.
+    with_hashes = (
+        not preview and state_dir is not None and ID_COLUMN in header_df.columns
+    )
+    state = _load_state(state_dir) if with_hashes else None
 
-        for c in chunk.columns:
-            s = chunk[c]
-
-            if s.dtype == "object":
-                empty_mask = _is_empty_obj_series(s)
-                empties = int(empty_mask.sum())
-                nonempty = int(len(s) - empties)
-                empty_counts[c] += empties
-                non_empty_counts[c] += nonempty
-
-                # Accumulate string lengths for non-empty values.
-                s2 = s[~empty_mask]
-                if len(s2) > 0:
-                    lens = s2.astype(str).str.len()
-                    total_len = int(lens.sum())
-                    n = int(len(lens))
-                    str_total_len[c] += total_len
-                    str_non_empty[c] += n
-                    str_bytes[c] += total_len
-
-                # Infer kind (best-effort heuristic; matches the notebook's intent).
-                if c not in col_kind:
-                    sample = s.dropna().astype(str).head(200)
-                    if len(sample) > 0 and (
-                        (sample.str.contains(":").mean() > 0.5)
-                        or (sample.str.contains("-").mean() > 0.7)
-                    ):
-                        col_kind[c] = "datetime"
-                    else:
-                        col_kind[c] = "string"
-            else:
-                # Non-object: empty is NaN.
-                empties = int(s.isna().sum())
-                nonempty = int(len(s) - empties)
-                empty_counts[c] += empties
-                non_empty_counts[c] += nonempty
-
-                if c not in col_kind:
-                    if s.dtype == "bool":
-                        col_kind[c] = "bool"
-                    elif np.issubdtype(s.dtype, np.integer):
-                        col_kind[c] = "int"
-                    elif np.issubdtype(s.dtype, np.floating):
-                        col_kind[c] = "float"
-                    else:
-                        col_kind[c] = "other"
+    reader = "sample" if sample_rows else _chunk_reader(cache_dir)
+    build_mode = "full"
+    delta = None
+    ci = None
+    item_weights = None
+    sample_info = {}
+    content = None
+    blocker = _incremental_blocker(state, header_df.columns, chunk_size, reader)
+    if sampled is not None:
+        aggs, cols, item_bytes, item_weights, ci, sample_info = sampled
+        build_mode = "sample"
+    elif incremental and with_hashes and blocker is None:
+        (
+            aggs,
+            cols,
+            id_hashes,
+            row_hashes,
+            item_bytes,
+            content,
+            delta,
+        ) = _scan_incremental(input_csv, chunk_size, state, cache_dir)
+        build_mode = "incremental"
+    else:
+        if incremental:
+            reason = blocker if with_hashes else f"no '{ID_COLUMN}' column"
+            print(f"Incremental build unavailable ({reason}); running a full scan.")
+        aggs, cols, id_hashes, row_hashes, item_bytes, content = _scan_full(
+            input_csv, chunk_size, with_hashes, cache_dir
+        )
 
     if cols is None:
         raise RuntimeError("No rows found while reading CSV")
 
+    if with_hashes and len(np.unique(id_hashes)) != len(id_hashes):
+        # Duplicate ids make the keyed diff ambiguous; keep the old baseline.
+        print(f"Duplicate '{ID_COLUMN}' values found; incremental state not updated.")
+        if build_mode == "incremental":
+            aggs, cols, _, _, item_bytes, content = _scan_full(
+                input_csv, chunk_size, False, cache_dir
+            )
+            build_mode = "full"
+            delta = None
+        with_hashes = False
+
+    good_rows = aggs["good_rows"]
+    empty_counts = aggs["empty_counts"]
+    non_empty_counts = aggs["non_empty_counts"]
+    str_total_len = aggs["str_total_len"]
+    str_non_empty = aggs["str_non_empty"]
+    str_bytes = aggs["str_bytes"]
+    col_kind = aggs["col_kind"]
+
     total_cells = good_rows * len(cols)
     non_empty_cells = sum(int(v) for v in non_empty_counts.values())
     overall_filled_pct = (non_empty_cells / total_cells * 100) if total_cells else 0.0
@@ -164,14 +1025,15 @@ def build_catalog_composition(
         ne = int(non_empty_counts.get(c, 0))
         em = int(empty_counts.get(c, 0))
         fr = (ne / good_rows * 100) if good_rows else 0.0
-        fill_rows.append(
-            {
-                "field_name": c,
-                "fill_rate_pct": round(fr, 2),
-                "non_empty_count": ne,
-                "empty_count": em,
-            }
-        )
+        row = {
+            "field_name": c,
+            "fill_rate_pct": round(fr, 2),
+            "non_empty_count": ne,
+            "empty_count": em,
+        }
+        if ci is not None:
+            row["fill_rate_ci_pct"] = round(ci["fill_pct"][c], 2)
+        fill_rows.append(row)
     fill_df = pd.DataFrame(fill_rows).sort_values(
         ["fill_rate_pct", "field_name"], ascending=[True, True], kind="mergesort"
     )
@@ -199,15 +1061,19 @@ def build_catalog_composition(
 
     # Weight proxy
     est_bytes = {}
+    est_bytes_ci = {}
     for c in cols:
         # If we observed string bytes, use those.
         if str_bytes.get(c, 0) > 0 or col_kind.get(c) == "string":
             est_bytes[c] = int(str_bytes.get(c, 0))
+            if ci is not None:
+                est_bytes_ci[c] = ci["str_bytes"][c]
         else:
             kind = col_kind.get(c, "other")
-            est_bytes[c] = int(non_empty_counts.get(c, 0)) * int(
-                DEFAULT_BYTES.get(kind, DEFAULT_BYTES["other"])
-            )
+            per_value = int(DEFAULT_BYTES.get(kind, DEFAULT_BYTES["other"]))
+            est_bytes[c] = int(non_empty_counts.get(c, 0)) * per_value
+            if ci is not None:
+                est_bytes_ci[c] = ci["non_empty"][c] * per_value
 
     total_est = int(sum(est_bytes.values()))
     ranked = sorted(est_bytes.items(), key=lambda x: x[1], reverse=True)
@@ -218,17 +1084,48 @@ def build_catalog_composition(
     weights_rows = []
     for c, b in top25:
         pct = (b / total_est * 100) if total_est else 0.0
-        weights_rows.append(
-            {
-                "field_name": c,
-                "est_mib": round(b / 1024 / 1024, 2),
-                "pct_total": round(pct, 2),
-                "kind": col_kind.get(c, "unknown"),
-                "non_empty_count": int(non_empty_counts.get(c, 0)),
-            }
-        )
+        row = {
+            "field_name": c,
+            "est_mib": round(b / 1024 / 1024, 2),
+            "pct_total": round(pct, 2),
+            "kind": col_kind.get(c, "unknown"),
+            "non_empty_count": int(non_empty_counts.get(c, 0)),
+        }
+        if ci is not None:
+            row["est_mib_ci"] = round(est_bytes_ci[c] / 1024 / 1024, 2)
+        weights_rows.append(row)
     weights_df = pd.DataFrame(weights_rows)
 
+    # Measured Braze storage (JSON-serialized items)
+    json_bytes = aggs["json_bytes"]
+    item_overhead_bytes = good_rows * _item_overhead_bytes(len(cols))
+    serialized_total = (
+        int(sum(json_bytes.get(c, 0) for c in cols)) + item_overhead_bytes
+    )
+    field_bytes_rows = []
+    for c in cols:
+        b = int(json_bytes.get(c, 0))
+        row = {
+            "field_name": c,
+            "serialized_mib": round(b / 1024 / 1024, 3),
+            "pct_total": round((b / serialized_total * 100), 2)
+            if serialized_total
+            else 0.0,
+            "avg_bytes_per_item": round(b / good_rows, 1) if good_rows else 0.0,
+            "non_empty_count": int(non_empty_counts.get(c, 0)),
+        }
+        if ci is not None:
+            row["serialized_mib_ci"] = round(ci["json_bytes"][c] / 1024 / 1024, 3)
+        field_bytes_rows.append(row)
+    field_bytes_df = (
+        pd.DataFrame(field_bytes_rows)
+        .sort_values(
+            ["serialized_mib", "field_name"], ascending=[False, True], kind="mergesort"
+        )
+        .reset_index(drop=True)
+    )
+    serialized_mib = serialized_total / 1024 / 1024
+
     # Braze size proxy (estimate)
     csv_kib_per_good_row = (file_mib * 1024) / max(good_rows, 1)
     overhead_mult = BRAZE_KIB_PER_ITEM_ESTIMATE / CSV_KIB_PER_ROW_OBSERVED
@@ -243,7 +1140,9 @@ def build_catalog_composition(
         "input_file": os.path.basename(input_csv),
         "file_size_bytes": file_bytes,
         "file_size_mib": round(file_mib, 2),
-        "rows_linecount": int(rows_by_linecount),
+        "rows_linecount": int(rows_by_linecount)
+        if rows_by_linecount is not None
+        else None,
         "good_rows": int(good_rows),
         "columns": int(len(cols)),
         "first_bad_rows": bad_lines,
@@ -258,7 +1157,94 @@ def build_catalog_composition(
         "est_braze_mb_method_b": round(float(mib_to_mb_decimal(est_braze_mib_B)), 2),
         "weight_proxy_total_mib": round(float(total_est / 1024 / 1024), 2),
         "top10_weight_proxy_pct": round(float(top10_pct), 2),
+        "braze_serialized_bytes": serialized_total,
+        "braze_serialized_mib": round(float(serialized_mib), 2),
+        "braze_serialized_mb": round(float(mib_to_mb_decimal(serialized_mib)), 2),
+        "braze_item_bytes_avg": round(
+            float(np.average(item_bytes, weights=item_weights)), 1
+        )
+        if len(item_bytes)
+        else 0.0,
+        "braze_item_bytes_p95": int(
+            _weighted_quantile(item_bytes, item_weights, 0.95)
+            if item_weights is not None
+            else np.percentile(item_bytes, 95)
+        )
+        if len(item_bytes)
+        else 0,
+        "braze_item_bytes_max": int(item_bytes.max()) if len(item_bytes) else 0,
+        "build_mode": build_mode,
+        "reader": reader,
+        "estimated": ci is not None,
     }
+    if ci is not None:
+        overview.update(sample_info)
+        overview["overall_filled_pct_ci"] = round(float(ci["overall_filled_pct"]), 2)
+        overview["braze_serialized_mib_ci"] = round(
+            float(ci["serialized_bytes"] / 1024 / 1024), 2
+        )
+
+    # Duplicate items (a sample can't see them; leave the totals unset).
+    duplicate_rows = []
+    if content is None:
+        for match in ("exact", "near"):
+            overview[f"duplicate_groups_{match}"] = None
+            overview[f"duplicate_items_{match}"] = None
+            overview[f"duplicate_wasted_bytes_{match}"] = None
+        overview["duplicate_wasted_mib_near"] = None
+    else:
+        dup_summary, dup_groups = _duplicate_report(*content, item_bytes)
+        overview.update(dup_summary)
+        overview["duplicate_wasted_mib_near"] = round(
+            dup_summary["duplicate_wasted_bytes_near"] / 1024 / 1024, 2
+        )
+        if dup_groups and ID_COLUMN in cols:
+            ids = _ids_at(
+                input_csv,
+                np.concatenate([g[1] for g in dup_groups]),
+                chunk_size,
+                cache_dir,
+            )
+        else:
+            ids = {}
+        for match, positions, items, wasted in dup_groups:
+            duplicate_rows.append(
+                {
+                    "match": match,
+                    "items": items,
+                    "wasted_bytes": wasted,
+                    "sample_ids": " | ".join(
+                        ids.get(p, f"row {p + 1}") for p in positions.tolist()
+                    ),
+                }
+            )
+    duplicates_df = pd.DataFrame(
+        duplicate_rows, columns=["match", "items", "wasted_bytes", "sample_ids"]
+    )
+
+    # Day-over-day changes against the previous export (when there is one).
+    # Hashes are only comparable when both runs typed rows the same way.
+    if (
+        delta is None
+        and with_hashes
+        and state is not None
+        and state["reader"] == reader
+    ):
+        delta = _diff_counts(state, id_hashes, row_hashes)
+    changes = {
+        "generated_at": overview["generated_at"],
+        "build_mode": build_mode,
+        "input_file": overview["input_file"],
+        "previous_input_file": None,
+        "rows_added": None,
+        "rows_removed": None,
+        "rows_changed": None,
+        "fill_rate_moves": [],
+    }
+    if delta is not None:
+        changes.update(delta)
+        changes["previous_input_file"] = os.path.basename(state["input_path"])
+        changes["fill_rate_moves"] = _fill_rate_moves(state, aggs, cols)
 
     # Write outputs
     with open(
@@ -289,8 +1275,175 @@ def build_catalog_composition(
     weights_df.to_csv(
         os.path.join(output_dir, "catalog_composition_top_weights_25.csv"), index=False
     )
+    field_bytes_df.to_csv(
+        os.path.join(output_dir, "catalog_composition_field_bytes.csv"), index=False
+    )
+    duplicates_df.to_csv(
+        os.path.join(output_dir, "catalog_composition_duplicates.csv"), index=False
+    )
+    with open(
+        os.path.join(output_dir, "catalog_composition_changes.json"),
+        "w",
+        encoding="utf-8",
+    ) as f:
+        json.dump(changes, f, indent=2)
+
+    if with_hashes:
+        incremental_runs = (
+            state["incremental_runs"] + 1 if build_mode == "incremental" else 0
+        )
+        _save_state(
+            state_dir,
+            input_csv,
+            cols,
+            chunk_size,
+            reader,
+            aggs,
+            id_hashes,
+            row_hashes,
+            item_bytes,
+            *content,
+            incremental_runs,
+        )
+
+    return overview, changes
+
+
+def _partitions():
+    """etl.partitions, imported from the project root."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if base_dir not in sys.path:
+        sys.path.insert(0, base_dir)
+    import etl.partitions
+
+    return etl.partitions
+
+
+def _output_dir(tables_dir, args):
+    """--output-dir, else tables_dir (its preview/ subdir for --sample)."""
+    if args.output_dir:
+        return args.output_dir
+    if args.sample:
+        return os.path.join(tables_dir, SAMPLE_OUTPUT_SUBDIR)
+    return tables_dir
+
+
+def _build(input_csv, catalog_dir, output_dir, args):
+    """build_catalog_composition() with state/cache defaulting under catalog_dir."""
+    return build_catalog_composition(
+        input_csv=input_csv,
+        output_dir=output_dir,
+        chunk_size=args.chunk_size,
+        state_dir=args.state_dir or os.path.join(catalog_dir, ".composition_state"),
+        incremental=args.incremental,
+        cache_dir=(
+            None
+            if args.no_cache
+            else args.cache_dir or os.path.join(catalog_dir, ".columnar")
+        ),
+        sample_rows=args.sample,
+        seed=args.seed,
+    )
+
 
-    return overview
+def _build_partition(workspace, catalog, input_csv, args):
+    partitions = _partitions()
+    output_dir = _output_dir(partitions.tables_dir(workspace, catalog), args)
+    catalog_dir = partitions.latest_catalog_dir(workspace, catalog)
+    overview, changes = _build(input_csv, catalog_dir, output_dir, args)
+    return output_dir, input_csv, overview, changes
+
+
+def _build_all_partitions(args) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+
+    partitions = _partitions()
+    jobs = []
+    for workspace, catalog in partitions.configured_partitions():
+        input_dir = partitions.latest_catalog_dir(workspace, catalog)
+        try:
+            jobs.append((workspace, catalog, _latest_csv(input_dir)))
+        except FileNotFoundError:
+            label = partitions.partition_label(workspace, catalog)
+            print("No export for", label, "- skipped")
+    if (args.state_dir or args.cache_dir) and len(jobs) > 1:
+        print("Error: --state-dir/--cache-dir cannot be shared by several partitions")
+        return 1
+    if not jobs:
+        print("No partition has a catalog export")
+        return 1
+
+    # Each partition has its own export, state and output dir; build them in
+    # separate processes since the scans are CPU-bound.
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+        futures = [
+            ex.submit(_build_partition, workspace, catalog, input_csv, args)
+            for workspace, catalog, input_csv in jobs
+        ]
+        for (workspace, catalog, _), fut in zip(jobs, futures):
+            print("==", partitions.partition_label(workspace, catalog))
+            _print_summary(*fut.result())
+    return 0
+
+
+def _print_summary(output_dir, input_csv, overview, changes) -> None:
+    print("Wrote catalog composition artifacts to", output_dir)
+    print("Input:", input_csv)
+    print(
+        "Filled %:",
+        overview["overall_filled_pct"],
+        "Good rows:",
+        f"{overview['good_rows']:,}",
+        "Columns:",
+        overview["columns"],
+    )
+    print(
+        "Braze size est (Method A):",
+        f"{overview['est_braze_mib_method_a']:,.1f} MiB",
+        f"(~{overview['est_braze_mb_method_a']:,.1f} MB)",
+    )
+    print(
+        "Braze size (measured):",
+        f"{overview['braze_serialized_mib']:,.1f} MiB",
+        f"(~{overview['braze_serialized_mb']:,.1f} MB)",
+        f"avg item {overview['braze_item_bytes_avg']:,.0f} B,",
+        f"max {overview['braze_item_bytes_max']:,} B",
+    )
+    print("Build mode:", overview["build_mode"])
+    if overview["estimated"]:
+        print(
+            "Estimated from",
+            f"{overview['sample_rows']:,} sampled rows",
+            f"({overview['sample_rejected']:,} draws rejected);",
+            f"filled % ±{overview['overall_filled_pct_ci']},",
+            f"size ±{overview['braze_serialized_mib_ci']:,.1f} MiB (95% CI)",
+        )
+    if overview["duplicate_items_near"] is not None:
+        print(
+            "Duplicates:",
+            f"{overview['duplicate_items_exact']:,} exact,",
+            f"{overview['duplicate_items_near']:,} incl. near",
+            f"({overview['duplicate_wasted_mib_near']:,.1f} MiB wasted)",
+        )
+    if changes["previous_input_file"] is not None:
+        print(
+            "Changes vs",
+            changes["previous_input_file"] + ":",
+            f"+{changes['rows_added']:,}",
+            f"-{changes['rows_removed']:,}",
+            f"~{changes['rows_changed']:,}",
+            "Fill-rate moves:",
+            len(changes["fill_rate_moves"]),
+        )
+
+
+def _sample_size(value):
+    rows = int(value)
+    if rows < 2:
+        raise argparse.ArgumentTypeError(
+            "needs at least 2 rows for a confidence interval"
+        )
+    return rows
 
 
 def main() -> int:
@@ -304,13 +1457,30 @@ def main() -> int:
     )
     parser.add_argument(
         "--input-dir",
-        default=os.path.join("data", "latest_catalog"),
-        help="Directory to search for newest CSV when --input is not provided",
+        default=None,
+        help=(
+            "Directory to search for newest CSV when --input is not provided "
+            "(default data/latest_catalog, or the partition's subdir)"
+        ),
     )
     parser.add_argument(
         "--output-dir",
-        default=os.path.join("data", "tables"),
-        help="Where to write summary artifacts",
+        default=None,
+        help=(
+            "Where to write summary artifacts (default data/tables, or the "
+            f"partition's; --sample writes to its {SAMPLE_OUTPUT_SUBDIR}/ subdir)"
+        ),
+    )
+    parser.add_argument(
+        "--partition",
+        default=None,
+        metavar="WORKSPACE/CATALOG",
+        help="Build a workspaces.toml partition (sets the default dirs)",
+    )
+    parser.add_argument(
+        "--all-partitions",
+        action="store_true",
+        help="Build every configured partition that has an export, in parallel",
     )
     parser.add_argument(
         "--chunk-size",
@@ -318,32 +1488,69 @@ def main() -> int:
         default=50_000,
         help="Pandas chunk size",
     )
+    parser.add_argument(
+        "--state-dir",
+        default=None,
+        help=(
+            "Where to keep aggregates + per-row hashes of the previous export "
+            "(default <input dir>/.composition_state)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Apply only added/removed/changed rows on top of the previous state",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Where to keep typed Parquet copies of exports (needs pyarrow; "
+            "default <input dir>/.columnar)"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the CSV directly instead of using/writing the columnar cache",
+    )
+    parser.add_argument(
+        "--sample",
+        nargs="?",
+        type=_sample_size,
+        const=DEFAULT_SAMPLE_ROWS,
+        default=None,
+        metavar="ROWS",
+        help=(
+            "Quick preview from a byte-offset sample of rows "
+            f"(default {DEFAULT_SAMPLE_ROWS:,}); artifacts are marked estimated"
+        ),
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --sample")
     args = parser.parse_args()
 
+    if args.all_partitions:
+        if args.partition or args.input or args.input_dir or args.output_dir:
+            parser.error("--all-partitions picks each partition's own directories")
+        return _build_all_partitions(args)
+
+    catalog_dir = os.path.join("data", "latest_catalog")
+    tables_dir = os.path.join("data", "tables")
+    if args.partition:
+        workspace, sep, catalog = args.partition.partition("/")
+        if not sep or not workspace or not catalog:
+            parser.error("--partition must look like WORKSPACE/CATALOG")
+        partitions = _partitions()
+        catalog_dir = partitions.latest_catalog_dir(workspace, catalog)
+        tables_dir = partitions.tables_dir(workspace, catalog)
+    output_dir = _output_dir(tables_dir, args)
+
     input_csv = args.input
     if input_csv is None:
-        input_csv = _latest_csv(args.input_dir)
+        input_csv = _latest_csv(args.input_dir or catalog_dir)
 
-    overview = build_catalog_composition(
-        input_csv=input_csv,
-        output_dir=args.output_dir,
-        chunk_size=args.chunk_size,
-    )
-    print("Wrote catalog composition artifacts to", args.output_dir)
-    print("Input:", input_csv)
-    print(
-        "Filled %:",
-        overview["overall_filled_pct"],
-        "Good rows:",
-        f"{overview['good_rows']:,}",
-        "Columns:",
-        overview["columns"],
-    )
-    print(
-        "Braze size est (Method A):",
-        f"{overview['est_braze_mib_method_a']:,.1f} MiB",
-        f"(~{overview['est_braze_mb_method_a']:,.1f} MB)",
-    )
+    overview, changes = _build(input_csv, catalog_dir, output_dir, args)
+    _print_summary(output_dir, input_csv, overview, changes)
     return 0
 
 
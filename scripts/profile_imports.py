@@ -0,0 +1,225 @@
+"""Profile the dashboard's import cost with `python -X importtime`.
+
+Measures the imports dashboard/app.py runs at startup (module level) and, on
+top of those, each import it defers into a function or page. First-party
+modules it imports (etl.*) are followed too, so an import moved into one of
+them still shows up where it is deferred. Every measurement runs in a fresh
+interpreter; the best of --repeat runs is reported.
+
+Usage:
+  python scripts/profile_imports.py
+  python scripts/profile_imports.py --write   # update benchmarks/import_time.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(BASE_DIR, "dashboard", "app.py")
+REPORT_PATH = os.path.join(BASE_DIR, "benchmarks", "import_time.md")
+TOP_N = 15
+
+
+def _is_main_guard(node) -> bool:
+    return isinstance(node, ast.If) and ast.unparse(node.test) in (
+        "__name__ == '__main__'",
+        "'__main__' == __name__",
+    )
+
+
+def _module_imports(path: str):
+    """(startup, deferred) import nodes of `path`, minus its __main__ block."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    top_level, script_only = set(), set()
+    for node in tree.body:
+        if _is_main_guard(node):
+            script_only.update(id(n) for n in ast.walk(node))
+        body = node.body if isinstance(node, ast.Try) else [node]
+        top_level.update(id(n) for n in body)
+
+    startup, deferred = [], []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        if isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            continue
+        if id(node) in script_only:
+            continue
+        (startup if id(node) in top_level else deferred).append(node)
+    return startup, deferred
+
+
+def _first_party_paths(node):
+    """Source files under BASE_DIR that an import node loads."""
+    if isinstance(node, ast.Import):
+        modules = [alias.name for alias in node.names]
+    elif node.level:
+        return []
+    else:
+        modules = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+    paths = []
+    for module in modules:
+        path = os.path.join(BASE_DIR, *module.split(".")) + ".py"
+        if os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+def _app_imports(path: str):
+    """(startup, deferred) import statements of `path` and its first-party modules.
+
+    Startup statements are `path`'s own module-level imports (a first-party
+    module's module-level imports are inside its cumulative time). Deferred
+    maps each function-level import, here or in a followed module, to the
+    file it is in.
+    """
+    startup, deferred = [], {}
+    todo, seen = [path], {path}
+    while todo:
+        current = todo.pop(0)
+        nodes_startup, nodes_deferred = _module_imports(current)
+        origin = os.path.relpath(current, BASE_DIR).replace(os.sep, "/")
+        for node in nodes_startup + nodes_deferred:
+            line = ast.unparse(node)
+            if current == path and node in nodes_startup:
+                if line not in startup:
+                    startup.append(line)
+            elif node in nodes_deferred:
+                deferred.setdefault(line, origin)
+            for module_path in _first_party_paths(node):
+                if module_path not in seen:
+                    seen.add(module_path)
+                    todo.append(module_path)
+    return startup, deferred
+
+
+def _failed_statement(statements, stderr: str) -> str:
+    """'<statement>: <error>' for the statement a failed child run stopped at."""
+    errors = [line for line in stderr.strip().splitlines() if line.strip()]
+    error = errors[-1] if errors else "no error output"
+    # The traceback names a line of the -c code; line 1 is the sys.path setup.
+    lines = re.findall(r'File "<string>", line (\d+)', stderr)
+    index = int(lines[-1]) - 2 if lines else -1
+    if 0 <= index < len(statements):
+        return f"{statements[index]}: {error}"
+    return error
+
+
+def _importtime(statements) -> list[tuple[int, int, str]]:
+    """(self us, cumulative us, module) rows for running `statements` in a fresh python."""
+    code = f"import sys; sys.path.insert(0, {BASE_DIR!r})\n" + "\n".join(statements)
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(_failed_statement(statements, e.stderr)) from None
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def _top_level(rows, baseline=frozenset()):
+    """Rows for modules imported directly by the statements (not their children)."""
+    return [
+        (c, m.strip())
+        for _, c, m in rows
+        if not m.startswith("  ") and m.strip() not in baseline
+    ]
+
+
+def _best_of(repeat: int, statements, baseline):
+    runs = [_top_level(_importtime(statements), baseline) for _ in range(repeat)]
+    return min(runs, key=lambda rows: sum(c for c, _ in rows))
+
+
+def profile(repeat: int = 3):
+    startup, deferred = _app_imports(APP_PATH)
+    # Modules the interpreter loads on its own (site, encodings, ...).
+    baseline = frozenset(m for _, m in _top_level(_importtime([])))
+    startup_rows = _best_of(repeat, startup, baseline)
+    startup_ms = sum(c for c, _ in startup_rows) / 1000
+
+    # A deferred import costs the modules it adds on top of the startup ones,
+    # timed in the same run (differences between runs are mostly noise).
+    loaded = baseline | {m for _, m in startup_rows}
+    deferred_ms = {}
+    for statement, origin in deferred.items():
+        rows = _best_of(repeat, startup + [statement], loaded)
+        deferred_ms[statement] = (origin, sum(c for c, _ in rows) / 1000)
+
+    return startup, startup_rows, startup_ms, deferred_ms
+
+
+def render_report(startup, startup_rows, startup_ms, deferred_ms) -> str:
+    lines = [
+        "# Dashboard import time",
+        "",
+        "Generated by `python scripts/profile_imports.py --write` "
+        f"on {datetime.now(timezone.utc):%Y-%m-%d} "
+        f"(Python {platform.python_version()}, {platform.system()}).",
+        "",
+        f"Startup imports ({len(startup)} statements in dashboard/app.py): "
+        f"**{startup_ms:,.0f} ms**",
+        "",
+        "| Module | Cumulative ms |",
+        "| --- | ---: |",
+    ]
+    for cumulative, module in sorted(startup_rows, reverse=True)[:TOP_N]:
+        lines.append(f"| `{module}` | {cumulative / 1000:,.1f} |")
+    lines += [
+        "",
+        "Deferred imports (cost on first use, on top of startup):",
+        "",
+        "| Import | In | ms |",
+        "| --- | --- | ---: |",
+    ]
+    for statement, (origin, ms) in sorted(
+        deferred_ms.items(), key=lambda kv: -kv[1][1]
+    ):
+        lines.append(f"| `{statement}` | {origin} | {ms:,.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--write", action="store_true", help=f"Write the report to {REPORT_PATH}"
+    )
+    args = parser.parse_args()
+
+    try:
+        report = render_report(*profile(args.repeat))
+    except RuntimeError as e:
+        print(f"[error] Import failed, nothing was timed: {e}", file=sys.stderr)
+        return 1
+    print(report)
+    if args.write:
+        os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8", newline="\n") as f:
+            f.write(report)
+        print(f"Wrote {REPORT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())